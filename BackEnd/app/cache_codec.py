@@ -0,0 +1,164 @@
+"""
+Pluggable serialization for cached payloads.
+
+Every encoded payload starts with a 3-byte header:
+    b"\\x00" + codec id + compression id
+so the reader never has to guess how a value was written. Values written
+before the header existed (plain JSON text) are still readable.
+"""
+from decimal import Decimal
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"\x00"
+NO_COMPRESSION = b"0"
+ZSTD = b"z"
+
+# msgpack extension type carrying a Decimal as its exact string form
+DECIMAL_EXT_TYPE = 1
+# JSON-based codecs tag Decimals as {"__decimal__": "12.34"}
+DECIMAL_TAG = "__decimal__"
+
+
+def _tag_decimal(obj):
+    if isinstance(obj, Decimal):
+        return {DECIMAL_TAG: str(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not cache-serializable")
+
+
+def _untag_decimal(obj: dict):
+    if len(obj) == 1 and DECIMAL_TAG in obj:
+        return Decimal(obj[DECIMAL_TAG])
+    return obj
+
+
+def _untag_tree(value):
+    """orjson has no object_hook, so Decimal tags are restored with a walk"""
+    if isinstance(value, dict):
+        value = {k: _untag_tree(v) for k, v in value.items()}
+        return _untag_decimal(value)
+    if isinstance(value, list):
+        return [_untag_tree(v) for v in value]
+    return value
+
+
+class JsonCodec:
+    codec_id = b"j"
+    name = "json"
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return json.dumps(value, default=_tag_decimal, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def loads(data: bytes):
+        return json.loads(data, object_hook=_untag_decimal)
+
+
+class OrjsonCodec:
+    codec_id = b"o"
+    name = "orjson"
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return orjson.dumps(value, default=_tag_decimal)
+
+    @staticmethod
+    def loads(data: bytes):
+        return _untag_tree(orjson.loads(data))
+
+
+class MsgpackCodec:
+    codec_id = b"m"
+    name = "msgpack"
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, Decimal):
+            return msgpack.ExtType(DECIMAL_EXT_TYPE, str(obj).encode("ascii"))
+        raise TypeError(f"Object of type {type(obj).__name__} is not cache-serializable")
+
+    @staticmethod
+    def _ext_hook(code, data):
+        if code == DECIMAL_EXT_TYPE:
+            return Decimal(data.decode("ascii"))
+        return msgpack.ExtType(code, data)
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return msgpack.packb(value, default=MsgpackCodec._default, use_bin_type=True)
+
+    @staticmethod
+    def loads(data: bytes):
+        return msgpack.unpackb(data, ext_hook=MsgpackCodec._ext_hook, raw=False, strict_map_key=False)
+
+
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+_CODECS_BY_ID = {codec.codec_id: codec for codec in CODECS.values()}
+_AVAILABLE = {"json": True, "orjson": orjson is not None, "msgpack": msgpack is not None}
+
+
+class CacheCodec:
+    """Encodes cache values with the configured codec, zstd-compressing large payloads"""
+
+    def __init__(self, codec_name: str = "json", compress_threshold: int = 0, compress_level: int = 3):
+        if codec_name not in CODECS:
+            raise ValueError(f"Unknown cache codec '{codec_name}'. Choose from {sorted(CODECS)}")
+        if not _AVAILABLE[codec_name]:
+            logger.warning(f"Cache codec '{codec_name}' is not installed, falling back to json")
+            codec_name = "json"
+        self.codec = CODECS[codec_name]
+
+        if compress_threshold and zstandard is None:
+            logger.warning("zstandard is not installed, cached payloads will not be compressed")
+            compress_threshold = 0
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+
+    def encode(self, value) -> bytes:
+        body = self.codec.dumps(value)
+        if self.compress_threshold and len(body) >= self.compress_threshold:
+            # Compressor objects are not thread-safe, so one is created per call
+            compressed = zstandard.ZstdCompressor(level=self.compress_level).compress(body)
+            if len(compressed) < len(body):
+                return MAGIC + self.codec.codec_id + ZSTD + compressed
+        return MAGIC + self.codec.codec_id + NO_COMPRESSION + body
+
+    @staticmethod
+    def decode(payload):
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        if not payload.startswith(MAGIC):
+            # Legacy value written as plain JSON text
+            return JsonCodec.loads(payload)
+
+        codec = _CODECS_BY_ID[payload[1:2]]
+        body = payload[3:]
+        if payload[2:3] == ZSTD:
+            body = zstandard.ZstdDecompressor().decompress(body)
+        return codec.loads(body)
+
+    @staticmethod
+    def is_compressed(payload: bytes) -> bool:
+        return payload[:1] == MAGIC and payload[2:3] == ZSTD
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Database Settings
@@ -9,11 +9,25 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
     # DATABASE_URL: str
+
+    # Read replica (optional). Read-only endpoints fall back to the primary when unset.
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[int] = None
+    # Stop reading from the replica once it is this far behind the primary
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: int = 5
+    # After a write, keep the caller's reads on the primary for this long (read-your-writes)
+    PRIMARY_PIN_SECONDS: int = 10
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # Cached user_id/role/tenant/active/region used by the game routers instead of a User query
+    PRINCIPAL_CACHE_TTL: int = 30
+    # Argon2 runs off the event loop: pool threads, and how many more callers may wait before a 503
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
     
     # SMTP
     SMTP_HOST: str
@@ -34,6 +48,19 @@ class Settings(BaseSettings):
 
     # Redis Configuration
     REDIS_URL: str
+    REDIS_MAX_CONNECTIONS: int = 50
+
+    # In-process cache tier (sits in front of Redis)
+    LOCAL_CACHE_MAX_ENTRIES: int = 2048
+    LOCAL_CACHE_TTL: int = 30
+
+    # Per-tenant lobby catalog; dropped on game/provider/catalog changes, so the TTL is only a backstop
+    LOBBY_CACHE_TTL: int = 600
+
+    # Cached payload serialization: json | orjson | msgpack
+    CACHE_CODEC: str = "msgpack"
+    # zstd-compress payloads at or above this many bytes (0 disables compression)
+    CACHE_COMPRESS_THRESHOLD: int = 4096
 
     # Celery Configuration
     CELERY_BROKER_URL: str
@@ -47,6 +74,34 @@ class Settings(BaseSettings):
     # Background Task Settings
     SCORE_UPDATE_INTERVAL:int
 
+    # Analytics rollups: how often to refresh, and how far back each refresh rebuilds
+    # (covers rounds that settle after the session started, e.g. blackjack/crash/mines)
+    ANALYTICS_REFRESH_INTERVAL: int = 60
+    ANALYTICS_SWEEP_HOURS: int = 3
+
+    # Monthly partitions of game_session/game_round/bet
+    PARTITION_MONTHS_AHEAD: int = 3
+    # Months kept attached; older ones are detached into PARTITION_ARCHIVE_SCHEMA
+    PARTITION_RETENTION_MONTHS: int = 13
+    PARTITION_ARCHIVE_SCHEMA: str = "archive"
+
+    # Wallet ledger: how often pending credits are folded into wallet.balance, and how many per pass
+    WALLET_PROJECTION_INTERVAL: int = 2
+    WALLET_PROJECTION_BATCH: int = 5000
+
+    # Jackpot contributions: shard rows per pool, and how often shards are folded into the pool
+    JACKPOT_SHARDS: int = 16
+    JACKPOT_FOLD_INTERVAL: int = 5
+    # Live jackpot amounts are published per tenant at this cadence (seconds)
+    JACKPOT_TICKER_INTERVAL: int = 2
+
+    # Shared-wheel roulette: one spin per tenant table every this many seconds
+    ROULETTE_TABLE_ROUND_SECONDS: int = 30
+    # Most rounds one slots/dice autoplay request may play
+    AUTOPLAY_MAX_ROUNDS: int = 500
+    # Off until the slots paytable pays below 100% (slots_math reports about 520% engine RTP today)
+    SLOTS_AUTOPLAY_ENABLED: bool = False
+
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
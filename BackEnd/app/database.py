@@ -1,9 +1,15 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+import logging
+import threading
+import time
 import urllib.parse
 
+logger = logging.getLogger(__name__)
+
 password = urllib.parse.quote_plus(settings.DB_PASSWORD)
 
 SQLALCHEMY_DATABASE_URL = (
@@ -11,16 +17,50 @@ SQLALCHEMY_DATABASE_URL = (
     f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?sslmode=require"
 )
 
+# asyncpg takes `ssl` instead of libpq's `sslmode`
+ASYNC_SQLALCHEMY_DATABASE_URL = (
+    f"postgresql+asyncpg://{settings.DB_USER}:{password}@"
+    f"{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?ssl=require"
+)
+
+REPLICA_SQLALCHEMY_DATABASE_URL = (
+    f"postgresql+psycopg2://{settings.DB_USER}:{password}@"
+    f"{settings.DB_REPLICA_HOST}:{settings.DB_REPLICA_PORT or settings.DB_PORT}/{settings.DB_NAME}?sslmode=require"
+) if settings.DB_REPLICA_HOST else None
+
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
+    SQLALCHEMY_DATABASE_URL,
     # settings.DATABASE_URL,
     pool_pre_ping=True,
-    pool_size=25, 
+    pool_size=25,
     max_overflow=29
 )
 
+# Non-blocking engine for `async def` handlers on the bet hot path
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=25,
+    max_overflow=29
+)
+
+# Read replica for dashboards, history and leaderboards; None when no replica is configured
+replica_engine = create_engine(
+    REPLICA_SQLALCHEMY_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=10,
+    max_overflow=10
+) if REPLICA_SQLALCHEMY_DATABASE_URL else None
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ReplicaSessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=replica_engine
+) if replica_engine is not None else None
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -29,4 +69,79 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Dependency for async database sessions"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# --- Replication lag ---
+
+# Zero when the replica has replayed everything it received; otherwise the age of the last replayed commit
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+replication_status = {
+    "lag_seconds": None,
+    "checked_at": None,
+    "error": None,
+}
+
+def measure_replica_lag():
+    """Query the replica for its replay lag and record it in replication_status"""
+    if replica_engine is None:
+        return None
+    try:
+        with replica_engine.connect() as conn:
+            lag = conn.execute(REPLICA_LAG_SQL).scalar()
+        replication_status["lag_seconds"] = float(lag) if lag is not None else None
+        replication_status["error"] = None
+    except Exception as e:
+        replication_status["lag_seconds"] = None
+        replication_status["error"] = str(e)
+        logger.warning(f"Replica lag check failed: {e}")
+    replication_status["checked_at"] = time.time()
+    return replication_status["lag_seconds"]
+
+def start_replica_lag_monitor():
+    """Poll replica lag on a daemon thread so request handlers only read the last measurement"""
+    if replica_engine is None:
+        return None
+
+    def poll():
+        while True:
+            measure_replica_lag()
+            time.sleep(settings.REPLICA_LAG_CHECK_INTERVAL)
+
+    thread = threading.Thread(target=poll, name="replica-lag-monitor", daemon=True)
+    thread.start()
+    return thread
+
+def replica_available() -> bool:
+    """True when a replica is configured, reachable, recently checked and within the lag budget"""
+    if replica_engine is None:
+        return False
+    lag, checked_at = replication_status["lag_seconds"], replication_status["checked_at"]
+    if lag is None or checked_at is None:
+        return False
+    # A stalled monitor must not keep routing to a replica whose lag is unknown
+    if time.time() - checked_at > settings.REPLICA_LAG_CHECK_INTERVAL * 3:
+        return False
+    return lag <= settings.REPLICA_MAX_LAG_SECONDS
+
+def is_replica_session(db) -> bool:
+    """True for a session bound to the read replica (see utils.dependencies.get_read_db)"""
+    return replica_engine is not None and db.get_bind() is replica_engine
+
+def get_replication_status() -> dict:
+    return {
+        "replica_configured": replica_engine is not None,
+        "replica_in_use": replica_available(),
+        "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+        **replication_status,
+    }
@@ -1,7 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from .config import settings
-from .database import engine, Base
+from .database import engine, Base, start_replica_lag_monitor, get_replication_status, replica_available
+from .redis_client import CacheManager
+from .utils.dependencies import pin_to_primary, user_id_from_token_or_none
+from .utils.security import password_hash_stats
+from .services.roulette_table import roulette_tables
 
 # Import routers
 from .routers import auth, admin, wallet, user, lobby, responsible_gaming,stats, jackpot, teams, leaderboard
@@ -37,6 +41,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Read-your-writes: after a successful write, the caller's reads skip the replica for a while.
+# Only needed while reads can go to the replica; otherwise every bet would pay a Redis write for nothing.
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    response = await call_next(request)
+    if not replica_available():
+        return response
+    if request.method in WRITE_METHODS and response.status_code < 400:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        user_id = user_id_from_token_or_none(token if scheme.lower() == "bearer" else None)
+        if user_id is not None:
+            await pin_to_primary(user_id)
+    return response
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(admin.router)
@@ -59,6 +79,26 @@ app.include_router(teams.router)
 app.include_router(leaderboard.router)
 app.include_router(real_fantasy.router)
 
+@app.on_event("startup")
+async def start_cache_invalidation():
+    """Keep this worker's in-process cache tier in sync with the others"""
+    CacheManager.start_invalidation_listener()
+
+@app.on_event("startup")
+async def start_replica_monitor():
+    """Track replica lag so read-only endpoints know whether the replica is usable"""
+    start_replica_lag_monitor()
+
+@app.on_event("startup")
+async def start_roulette_tables():
+    """Close, spin and settle shared roulette rounds as they end"""
+    roulette_tables.start()
+
+@app.on_event("shutdown")
+async def stop_roulette_tables():
+    """Stop polling; slips are in the database and open rounds are settled after they close"""
+    await roulette_tables.stop()
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -86,6 +126,21 @@ async def health_check():
         "environment": settings.ENVIRONMENT
     }
 
+@app.get("/health/cache")
+async def cache_health():
+    """Cache hit/miss counters per key namespace"""
+    return CacheManager.stats()
+
+@app.get("/health/auth")
+async def auth_health():
+    """Password hash pool load and queue times"""
+    return password_hash_stats()
+
+@app.get("/health/db")
+async def db_health():
+    """Replica routing state and replication lag"""
+    return get_replication_status()
+
 @app.get("/games")
 async def list_games():
     """List all available games"""
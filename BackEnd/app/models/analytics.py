@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, Date, TIMESTAMP, Numeric, ForeignKey
+from sqlalchemy.sql import func
+from ..database import Base
+
+# Rollup tables behind the owner/tenant dashboards (see services/analytics_service.py).
+# Rows are derived data: they can always be rebuilt from bet/game_round/game_session.
+
+class AnalyticsHourly(Base):
+    """Per-tenant, per-game totals for bets in sessions started within one hour"""
+    __tablename__ = "analytics_hourly"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"), primary_key=True)
+    game_id = Column(Integer, ForeignKey("game.game_id"), primary_key=True)
+    bucket_start = Column(TIMESTAMP(timezone=True), primary_key=True)
+
+    total_wagered = Column(Numeric(18, 2), default=0)
+    total_payout = Column(Numeric(18, 2), default=0)
+    bet_count = Column(Integer, default=0)
+    session_count = Column(Integer, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+class AnalyticsDaily(Base):
+    """Per-tenant, per-game totals for one closed (UTC) day, folded from analytics_hourly"""
+    __tablename__ = "analytics_daily"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"), primary_key=True)
+    game_id = Column(Integer, ForeignKey("game.game_id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    total_wagered = Column(Numeric(18, 2), default=0)
+    total_payout = Column(Numeric(18, 2), default=0)
+    bet_count = Column(Integer, default=0)
+    session_count = Column(Integer, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+class AnalyticsUserDaily(Base):
+    """Per-player wager per tenant per day: distinct active users and top-player lists"""
+    __tablename__ = "analytics_user_daily"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.user_id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    total_wagered = Column(Numeric(18, 2), default=0)
+    total_payout = Column(Numeric(18, 2), default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, Numeric, ForeignKey, Enum, JSON, Table
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, Numeric, ForeignKey, Enum, JSON, Table, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -79,6 +79,11 @@ class FantasyUserTeam(Base):
     rank = Column(Integer, nullable=True)
     prize_won = Column(Numeric(18, 2), default=0)
     
+    __table_args__ = (
+        # Match leaderboard and settlement ordering
+        Index("idx_fantasy_user_teams_match_points", "match_id", total_points.desc()),
+    )
+    
     # Relationships
     match = relationship("FantasyMatch", back_populates="user_teams")
     # This automatically fetches the 11 players
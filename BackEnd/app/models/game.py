@@ -1,6 +1,8 @@
-from sqlalchemy import Boolean, Column, Integer, String, Numeric, TIMESTAMP, ForeignKey, Enum
+from sqlalchemy import BigInteger, Boolean, Column, Integer, SmallInteger, String, Numeric, TIMESTAMP, ForeignKey, ForeignKeyConstraint, Index, Enum
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func, text
+from datetime import datetime, timezone
 import enum
 from ..database import Base
 
@@ -27,15 +29,33 @@ class Game(Base):
     sessions = relationship("GameSession", back_populates="game")
     provider_variants = relationship("ProviderGame", back_populates="game")
 
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+# game_session, game_round and bet are range-partitioned by month on started_at
+# (see sql/casino_db.sql). Rounds and bets carry a copy of their session's started_at,
+# so the database key of each table is (id, started_at) and foreign keys are composite.
+# The ORM keeps the id alone as identity; ids are still unique across partitions.
+
 class GameSession(Base):
     __tablename__ = "game_session"
     
     session_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"))
     game_id = Column(Integer, ForeignKey("game.game_id"))
-    started_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    # Set client-side so the value is known after flush and can be copied to rounds and bets
+    started_at = Column(TIMESTAMP(timezone=True), nullable=False, default=_utcnow, server_default=func.now())
     ended_at = Column(TIMESTAMP(timezone=True))
     
+    __table_args__ = (
+        # Limit checks, history and active sessions: one user's sessions in a time range
+        Index("idx_game_session_user_started", "user_id", "started_at"),
+        # Dashboards and rollup refreshes: every session in a time range
+        Index("idx_game_session_started", "started_at"),
+        # Shared roulette settlement: open sessions of a game
+        Index("idx_game_session_open", "game_id", "started_at", postgresql_where=text("ended_at IS NULL")),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="game_sessions")
     game = relationship("Game", back_populates="sessions")
@@ -46,7 +66,20 @@ class GameRound(Base):
     __tablename__ = "game_round"
     
     round_id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(Integer, ForeignKey("game_session.session_id"))
+    session_id = Column(Integer)
+    # Partition key: copy of game_session.started_at
+    started_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    round_number = Column(Integer)
+    # What the engine produced (grid, roll, seeds), kept so the round can be verified later
+    outcome = Column(JSONB)
+    
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["session_id", "started_at"],
+            ["game_session.session_id", "game_session.started_at"]
+        ),
+        Index("idx_game_round_session", "session_id", "started_at"),
+    )
     
     # Relationships
     session = relationship("GameSession", back_populates="rounds")
@@ -57,16 +90,44 @@ class Bet(Base):
     __tablename__ = "bet"
     
     bet_id = Column(Integer, primary_key=True, index=True)
-    round_id = Column(Integer, ForeignKey("game_round.round_id"))
+    round_id = Column(Integer)
+    # Partition key: copy of game_session.started_at (via the round)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    # Denormalized from the session/wallet at insert time, so aggregates filter on bet alone
+    user_id = Column(Integer, ForeignKey("users.user_id"))
+    tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"))
+    game_id = Column(Integer, ForeignKey("game.game_id"))
+    placed_at = Column(TIMESTAMP(timezone=True), default=_utcnow, server_default=func.now())
     wallet_id = Column(Integer, ForeignKey("wallet.wallet_id"))
     bet_amount = Column(Numeric(18, 2))
     payout_amount = Column(Numeric(18, 2))
     bet_status = Column(Enum(BetStatus, name="bet_statuses", create_type=False, native_enum=True), default=BetStatus.placed)
     
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["round_id", "started_at"],
+            ["game_round.round_id", "game_round.started_at"]
+        ),
+        Index("idx_bet_round", "round_id", "started_at"),
+        # Limit checks and per-player stats
+        Index("idx_bet_user_started", "user_id", "started_at"),
+        # Tenant dashboards and rollups
+        Index("idx_bet_tenant_started", "tenant_id", "started_at"),
+    )
+    
     # Relationships
     round = relationship("GameRound", back_populates="bets")
     wallet = relationship("Wallet", back_populates="bets")
 
+class RouletteTableSpin(Base):
+    """Winning number of one shared roulette table round, stored by the first batch settled for it"""
+    __tablename__ = "roulette_table_spin"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"), primary_key=True)
+    round_no = Column(BigInteger, primary_key=True) # wall clock // ROULETTE_TABLE_ROUND_SECONDS
+    winning_number = Column(SmallInteger, nullable=False)
+    spun_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
 class GameProvider(Base):
     __tablename__ = "game_provider"
     
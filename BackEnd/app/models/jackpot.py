@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, TIMESTAMP, Numeric, ForeignKey, SmallInteger
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
@@ -26,4 +26,16 @@ class JackpotWin(Base):
     jackpot_id = Column(Integer, ForeignKey("jackpots.jackpot_id"))
     user_id = Column(Integer, ForeignKey("users.user_id"))
     amount_won = Column(Numeric(18, 2))
-    won_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
\ No newline at end of file
+    won_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+
+class JackpotContributionShard(Base):
+    """
+    Contributions not yet folded into Jackpot.current_amount. Each bet adds to one random shard,
+    so concurrent players spread over JACKPOT_SHARDS rows instead of queueing on the jackpot row.
+    The live pool is current_amount + SUM(pending_amount).
+    """
+    __tablename__ = "jackpot_contribution_shards"
+
+    jackpot_id = Column(Integer, ForeignKey("jackpots.jackpot_id"), primary_key=True)
+    shard_no = Column(SmallInteger, primary_key=True)
+    pending_amount = Column(Numeric(18, 6), nullable=False, default=0) # unrounded; folded in whole cents
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, TIMESTAMP, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Enum, Numeric, TIMESTAMP, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -37,6 +37,11 @@ class FantasyTeam(Base):
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Leaderboard: a match's teams by points, highest first
+        Index("idx_fantasy_teams_match_points", "match_id", total_points.desc()),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="fantasy_teams")
     match = relationship("Match", back_populates="fantasy_teams")
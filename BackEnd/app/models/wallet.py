@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, Numeric, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Enum, Index, TIMESTAMP
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 import enum
 from ..database import Base
 
@@ -8,6 +9,16 @@ class WalletType(str, enum.Enum):
     bonus = "bonus"
     points = "points"
 
+class LedgerEntryType(str, enum.Enum):
+    opening = "opening"             # balance carried in when the ledger was introduced / wallet created
+    bet_stake = "bet_stake"
+    points_earned = "points_earned"
+    payout = "payout"
+    jackpot_win = "jackpot_win"
+    deposit = "deposit"
+    withdrawal = "withdrawal"
+    refund = "refund"
+
 
 class Wallet(Base):
     __tablename__ = "wallet"
@@ -17,8 +28,36 @@ class Wallet(Base):
     tenant_id = Column(Integer, ForeignKey("tenants.tenant_id"), index=True)
     balance = Column(Numeric(18, 2), default=0.0)
     type_of_wallet = Column(Enum(WalletType, name="wallet_type", create_type=False, native_enum=True), default=WalletType.cash)
-    UniqueConstraint('user_id', 'tenant_id', 'type_of_wallet', name='unique_user_tenant_wallet'),
+    
+    __table_args__ = (
+        # One wallet per user, tenant and type; every bet loads the player's wallets for one tenant
+        Index("uq_wallet_user_tenant_type", "user_id", "tenant_id", "type_of_wallet", unique=True),
+    )
     
     # Relationships
     user = relationship("User", back_populates="wallets")
     bets = relationship("Bet", back_populates="wallet")
+
+class WalletLedger(Base):
+    """
+    Append-only wallet ledger: wallet.balance is a projection of SUM(amount) per wallet.
+    Debits are projected in the same transaction; credits are appended with projected_at NULL
+    and folded into wallet.balance by services/ledger_service.py.
+    """
+    __tablename__ = "wallet_ledger"
+
+    ledger_id = Column(Integer, primary_key=True)
+    wallet_id = Column(Integer, ForeignKey("wallet.wallet_id"), nullable=False)
+    amount = Column(Numeric(18, 2), nullable=False) # signed: credits > 0, debits < 0
+    before_balance = Column(Numeric(18, 2))         # set once the entry is projected
+    after_balance = Column(Numeric(18, 2))
+    reference_type = Column(Enum(LedgerEntryType, native_enum=False, create_constraint=False, length=32)) # TEXT column
+    reference_id = Column(Integer)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
+    projected_at = Column(TIMESTAMP(timezone=True))
+
+    __table_args__ = (
+        # Projector and pending-credit reads only touch unprojected rows
+        Index("idx_wallet_ledger_pending", "wallet_id", "ledger_id", postgresql_where=projected_at.is_(None)),
+        Index("idx_wallet_ledger_wallet", "wallet_id", "ledger_id"),
+    )
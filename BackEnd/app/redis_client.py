@@ -1,16 +1,28 @@
 import redis
+import redis.asyncio as aioredis
 from .config import settings
+from .cache_codec import CacheCodec
+from collections import OrderedDict, defaultdict
 import json
 import logging
+import threading
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Channel used to tell every worker to drop its in-process copy of a key
+INVALIDATION_CHANNEL = "cache_invalidation"
+# Identifies this process so it can ignore its own invalidation messages
+WORKER_ID = uuid.uuid4().hex
+
 try:
     redis_client = redis.from_url(
         settings.REDIS_URL,
-        decode_responses=True,
+        # Cached values are binary (see cache_codec), so responses stay as bytes
+        decode_responses=False,
         # Mandatory for Upstash SSL
-        ssl_cert_reqs=None, 
+        ssl_cert_reqs=None,
         # Sends a PING every 30s to keep connection alive
         health_check_interval=30,
         # Timeouts to prevent hanging
@@ -24,103 +36,308 @@ except Exception as e:
     logger.warning(f"Redis connection failed on startup: {e}")
     redis_client = None
 
+# Async client for use inside `async def` handlers and the WebSocket manager.
+# Connections are opened lazily from a bounded pool, so there is no startup ping here.
+try:
+    async_redis_pool = aioredis.ConnectionPool.from_url(
+        settings.REDIS_URL,
+        decode_responses=False,
+        ssl_cert_reqs=None,
+        health_check_interval=30,
+        socket_timeout=5,
+        socket_connect_timeout=5,
+        retry_on_timeout=True,
+        max_connections=settings.REDIS_MAX_CONNECTIONS
+    )
+    async_redis_client = aioredis.Redis(connection_pool=async_redis_pool)
+except Exception as e:
+    logger.warning(f"Async Redis client could not be created: {e}")
+    async_redis_client = None
+
+
+class LocalCache:
+    """
+    Size-bounded in-process LRU with per-entry TTL.
+    First cache tier: answers repeat reads without a network round trip to Redis.
+    Values are stored encoded (see cache_codec) so callers never share mutable objects.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, payload)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload, ttl: int = None):
+        # Never keep a local copy longer than the local TTL, so cross-worker staleness stays bounded
+        ttl = min(ttl or self.default_ttl, self.default_ttl)
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, payload)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+local_cache = LocalCache(settings.LOCAL_CACHE_MAX_ENTRIES, settings.LOCAL_CACHE_TTL)
+
+# Hit/miss counters per key namespace (the part of the key before the first ':')
+_cache_stats = defaultdict(lambda: {"local_hits": 0, "redis_hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+
+def _namespace(key: str) -> str:
+    return key.split(":", 1)[0]
+
+
+def _record(key: str, outcome: str):
+    with _stats_lock:
+        _cache_stats[_namespace(key)][outcome] += 1
+
+
+codec = CacheCodec(settings.CACHE_CODEC, settings.CACHE_COMPRESS_THRESHOLD)
+
+# Encoded payload sizes per key namespace, to spot the keys worth slimming down
+_size_stats = defaultdict(lambda: {"writes": 0, "bytes_written": 0, "max_bytes": 0, "compressed_writes": 0})
+
+
+def _encode(key: str, value) -> bytes:
+    payload = codec.encode(value)
+    size = len(payload)
+    with _stats_lock:
+        sizes = _size_stats[_namespace(key)]
+        sizes["writes"] += 1
+        sizes["bytes_written"] += size
+        sizes["max_bytes"] = max(sizes["max_bytes"], size)
+        if CacheCodec.is_compressed(payload):
+            sizes["compressed_writes"] += 1
+    return payload
+
+
+def _decode(payload):
+    return codec.decode(payload)
+
+
 class CacheManager:
-    """Redis cache manager with Fault Tolerance"""
-    
+    """Two-tier cache manager (in-process LRU + Redis) with Fault Tolerance"""
+
     @staticmethod
     def _is_redis_up():
         return redis_client is not None
 
     @staticmethod
     def get(key: str):
-        """Generic get for any key"""
-        if not CacheManager._is_redis_up(): return None
+        """Generic get for any key (local tier first, then Redis)"""
+        payload = local_cache.get(key)
+        if payload is not None:
+            _record(key, "local_hits")
+            return _decode(payload)
+
+        if not CacheManager._is_redis_up():
+            _record(key, "misses")
+            return None
         try:
-            data = redis_client.get(key)
-            return json.loads(data) if data else None
+            # GET + TTL in one round trip so the local copy never outlives the Redis one
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.ttl(key)
+            data, ttl = pipe.execute()
+            if not data:
+                _record(key, "misses")
+                return None
+            _record(key, "redis_hits")
+            local_cache.set(key, data, ttl if ttl and ttl > 0 else None)
+            return _decode(data)
         except Exception as e:
             logger.error(f"Redis GET Error (key: {key}): {e}")
             return None
 
+    @staticmethod
+    def mget(keys: list) -> dict:
+        """Batch get: local tier first, remaining keys fetched from Redis in one MGET"""
+        result = {}
+        missing = []
+        for key in keys:
+            payload = local_cache.get(key)
+            if payload is not None:
+                _record(key, "local_hits")
+                result[key] = _decode(payload)
+            else:
+                missing.append(key)
+
+        if not missing:
+            return result
+        if not CacheManager._is_redis_up():
+            for key in missing:
+                _record(key, "misses")
+            return result
+        try:
+            for key, data in zip(missing, redis_client.mget(missing)):
+                if data:
+                    _record(key, "redis_hits")
+                    local_cache.set(key, data)
+                    result[key] = _decode(data)
+                else:
+                    _record(key, "misses")
+        except Exception as e:
+            logger.error(f"Redis MGET Error ({len(missing)} keys): {e}")
+        return result
+
     @staticmethod
     def set(key: str, value: any, ttl: int = 3600):
         """Generic set for any value with TTL"""
+        payload = _encode(key, value)
+        local_cache.set(key, payload, ttl)
         if not CacheManager._is_redis_up(): return
         try:
-            # We convert everything to JSON before storing
-            redis_client.setex(key, ttl, json.dumps(value))
+            redis_client.setex(key, ttl, payload)
+            CacheManager._broadcast_invalidation(key)
         except Exception as e:
             logger.error(f"Redis SET Error (key: {key}): {e}")
 
     @staticmethod
-    def get_leaderboard(match_id: int):
-        if not CacheManager._is_redis_up(): return None
+    def set_many(items: dict, ttl: int = 3600):
+        """Pipelined multi-set: every SETEX plus the invalidations cost one round trip"""
+        if not items: return
+        payloads = {key: _encode(key, value) for key, value in items.items()}
+        for key, payload in payloads.items():
+            local_cache.set(key, payload, ttl)
+        if not CacheManager._is_redis_up(): return
         try:
-            key = f"leaderboard:{match_id}"
-            data = redis_client.get(key)
-            return json.loads(data) if data else None
+            pipe = redis_client.pipeline(transaction=False)
+            for key, payload in payloads.items():
+                pipe.setex(key, ttl, payload)
+                pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+            pipe.execute()
         except Exception as e:
-            logger.error(f"Redis Error (get_leaderboard): {e}")
-            return None
-    
+            logger.error(f"Redis Pipeline SET Error ({len(payloads)} keys): {e}")
+
     @staticmethod
-    def set_leaderboard(match_id: int, leaderboard: list, ttl: int = 1800):
+    def delete(key: str):
+        """Drop a key from both tiers and from every other worker's local tier"""
+        local_cache.delete(key)
         if not CacheManager._is_redis_up(): return
         try:
-            key = f"leaderboard:{match_id}"
-            redis_client.setex(key, ttl, json.dumps(leaderboard))
+            redis_client.delete(key)
+            CacheManager._broadcast_invalidation(key)
         except Exception as e:
-            logger.error(f"Redis Error (set_leaderboard): {e}")
-    
+            logger.error(f"Redis DELETE Error (key: {key}): {e}")
+
     @staticmethod
-    def invalidate_leaderboard(match_id: int):
-        if not CacheManager._is_redis_up(): return
+    def _broadcast_invalidation(key: str):
+        """Tell other workers their local copy of `key` is stale"""
         try:
-            key = f"leaderboard:{match_id}"
-            redis_client.delete(key)
+            redis_client.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
         except Exception as e:
-            logger.error(f"Redis Error (invalidate_leaderboard): {e}")
-    
+            logger.error(f"Redis Invalidation Publish Error (key: {key}): {e}")
+
     @staticmethod
-    def get_match_data(match_id: str):
+    def start_invalidation_listener():
+        """
+        Subscribe this worker to cross-worker invalidations.
+        Runs in a daemon thread; returns the thread (or None if Redis is down).
+        """
         if not CacheManager._is_redis_up(): return None
         try:
-            key = f"match:{match_id}"
-            data = redis_client.get(key)
-            return json.loads(data) if data else None
+            def _handle(message):
+                origin, _, key = (message.get("data") or b"").decode("utf-8").partition("|")
+                if key and origin != WORKER_ID:
+                    local_cache.delete(key)
+
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: _handle})
+            return pubsub.run_in_thread(sleep_time=1.0, daemon=True)
         except Exception as e:
-            logger.error(f"Redis Error (get_match_data): {e}")
+            logger.error(f"Redis Invalidation Listener Error: {e}")
             return None
-    
+
+    @staticmethod
+    def stats() -> dict:
+        """Hit/miss counters and payload sizes per key namespace plus local tier occupancy"""
+        with _stats_lock:
+            namespaces = {ns: dict(counts) for ns, counts in _cache_stats.items()}
+            sizes = {ns: dict(s) for ns, s in _size_stats.items()}
+        for counts in namespaces.values():
+            lookups = counts["local_hits"] + counts["redis_hits"] + counts["misses"]
+            counts["hit_ratio"] = round((counts["local_hits"] + counts["redis_hits"]) / lookups, 4) if lookups else 0.0
+        for ns, s in sizes.items():
+            s["avg_bytes"] = round(s["bytes_written"] / s["writes"]) if s["writes"] else 0
+            namespaces.setdefault(ns, {})["payload"] = s
+        return {
+            "codec": codec.codec.name,
+            "compress_threshold": codec.compress_threshold,
+            "local_entries": len(local_cache),
+            "local_max_entries": local_cache.max_entries,
+            "namespaces": namespaces
+        }
+
+    @staticmethod
+    def get_leaderboard(match_id: int):
+        return CacheManager.get(f"leaderboard:{match_id}")
+
+    @staticmethod
+    def set_leaderboard(match_id: int, leaderboard: list, ttl: int = 1800):
+        CacheManager.set(f"leaderboard:{match_id}", leaderboard, ttl)
+
+    @staticmethod
+    def invalidate_leaderboard(match_id: int):
+        CacheManager.delete(f"leaderboard:{match_id}")
+
+    @staticmethod
+    def get_match_data(match_id: str):
+        return CacheManager.get(f"match:{match_id}")
+
     @staticmethod
     def set_match_data(match_id: str, data: dict, ttl: int = 1800):
-        if not CacheManager._is_redis_up(): return
-        try:
-            key = f"match:{match_id}"
-            redis_client.setex(key, ttl, json.dumps(data))
-        except Exception as e:
-            logger.error(f"Redis Error (set_match_data): {e}")
-    
+        CacheManager.set(f"match:{match_id}", data, ttl)
+
+    @staticmethod
+    def get_match_list():
+        return CacheManager.get("matches:list")
+
+    @staticmethod
+    def set_match_list(matches: list, ttl: int = 300):
+        CacheManager.set("matches:list", matches, ttl)
+
+    @staticmethod
+    def invalidate_match_list():
+        CacheManager.delete("matches:list")
+
     @staticmethod
     def get_player_stats(match_id: str, player_id: str):
-        if not CacheManager._is_redis_up(): return None
-        try:
-            key = f"player:{match_id}:{player_id}"
-            data = redis_client.get(key)
-            return json.loads(data) if data else None
-        except Exception as e:
-            logger.error(f"Redis Error (get_player_stats): {e}")
-            return None
-    
+        return CacheManager.get(f"player:{match_id}:{player_id}")
+
     @staticmethod
     def set_player_stats(match_id: str, player_id: str, stats: dict, ttl: int = 1800):
-        if not CacheManager._is_redis_up(): return
-        try:
-            key = f"player:{match_id}:{player_id}"
-            redis_client.setex(key, ttl, json.dumps(stats))
-        except Exception as e:
-            logger.error(f"Redis Error (set_player_stats): {e}")
-    
+        CacheManager.set(f"player:{match_id}:{player_id}", stats, ttl)
+
     @staticmethod
     def publish_match_update(match_id: int, message_dict: dict):
         """Publish a message to a specific match channel"""
@@ -129,4 +346,139 @@ class CacheManager:
             channel = f"match_channel_{match_id}"
             redis_client.publish(channel, json.dumps(message_dict))
         except Exception as e:
-            logger.error(f"Redis Publish Error: {e}")
\ No newline at end of file
+            logger.error(f"Redis Publish Error: {e}")
+
+    @staticmethod
+    def publish_many(messages: list):
+        """Pipelined publish of (channel, message_dict) pairs"""
+        if redis_client is None or not messages: return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for channel, message_dict in messages:
+                pipe.publish(channel, json.dumps(message_dict))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis Pipeline Publish Error: {e}")
+
+
+class AsyncCacheManager:
+    """
+    Non-blocking counterpart of CacheManager for `async def` handlers.
+    Shares the in-process tier and the hit/miss counters with CacheManager.
+    """
+
+    @staticmethod
+    def _is_redis_up():
+        return async_redis_client is not None
+
+    @staticmethod
+    async def get(key: str):
+        payload = local_cache.get(key)
+        if payload is not None:
+            _record(key, "local_hits")
+            return _decode(payload)
+
+        if not AsyncCacheManager._is_redis_up():
+            _record(key, "misses")
+            return None
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.ttl(key)
+                data, ttl = await pipe.execute()
+            if not data:
+                _record(key, "misses")
+                return None
+            _record(key, "redis_hits")
+            local_cache.set(key, data, ttl if ttl and ttl > 0 else None)
+            return _decode(data)
+        except Exception as e:
+            logger.error(f"Async Redis GET Error (key: {key}): {e}")
+            return None
+
+    @staticmethod
+    async def mget(keys: list) -> dict:
+        result = {}
+        missing = []
+        for key in keys:
+            payload = local_cache.get(key)
+            if payload is not None:
+                _record(key, "local_hits")
+                result[key] = _decode(payload)
+            else:
+                missing.append(key)
+
+        if not missing:
+            return result
+        if not AsyncCacheManager._is_redis_up():
+            for key in missing:
+                _record(key, "misses")
+            return result
+        try:
+            for key, data in zip(missing, await async_redis_client.mget(missing)):
+                if data:
+                    _record(key, "redis_hits")
+                    local_cache.set(key, data)
+                    result[key] = _decode(data)
+                else:
+                    _record(key, "misses")
+        except Exception as e:
+            logger.error(f"Async Redis MGET Error ({len(missing)} keys): {e}")
+        return result
+
+    @staticmethod
+    async def set(key: str, value: any, ttl: int = 3600, broadcast: bool = True):
+        await AsyncCacheManager.set_many({key: value}, ttl, broadcast)
+
+    @staticmethod
+    async def set_many(items: dict, ttl: int = 3600, broadcast: bool = True):
+        """broadcast=False skips the invalidation publish, for keys no other worker can hold stale"""
+        if not items: return
+        payloads = {key: _encode(key, value) for key, value in items.items()}
+        for key, payload in payloads.items():
+            local_cache.set(key, payload, ttl)
+        if not AsyncCacheManager._is_redis_up(): return
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                for key, payload in payloads.items():
+                    pipe.setex(key, ttl, payload)
+                    if broadcast:
+                        pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Async Redis Pipeline SET Error ({len(payloads)} keys): {e}")
+
+    @staticmethod
+    async def delete(*keys: str):
+        if not keys: return
+        for key in keys:
+            local_cache.delete(key)
+        if not AsyncCacheManager._is_redis_up(): return
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                pipe.delete(*keys)
+                for key in keys:
+                    pipe.publish(INVALIDATION_CHANNEL, f"{WORKER_ID}|{key}")
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Async Redis DELETE Error ({len(keys)} keys): {e}")
+
+    @staticmethod
+    async def publish(channel: str, message_dict: dict):
+        if not AsyncCacheManager._is_redis_up(): return
+        try:
+            await async_redis_client.publish(channel, json.dumps(message_dict))
+        except Exception as e:
+            logger.error(f"Async Redis Publish Error: {e}")
+
+    @staticmethod
+    async def publish_many(messages: list):
+        """Pipelined publish of (channel, message_dict) pairs"""
+        if not AsyncCacheManager._is_redis_up() or not messages: return
+        try:
+            async with async_redis_client.pipeline(transaction=False) as pipe:
+                for channel, message_dict in messages:
+                    pipe.publish(channel, json.dumps(message_dict))
+                await pipe.execute()
+        except Exception as e:
+            logger.error(f"Async Redis Pipeline Publish Error: {e}")
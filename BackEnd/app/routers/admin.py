@@ -5,13 +5,13 @@ from datetime import datetime, timezone
 from ..models.player import PlayerRoles
 from ..services.rapid_api import RapidAPICricketService
 from ..services.cricket_api import CricketAPIService
-from ..utils.security import get_password_hash
+from ..utils.security import get_password_hash_async
 from ..database import get_db
 from ..models.user import User, UserKYC, UserType
 from ..models.tenant import Tenant, TenantRegion
 from ..schemas.tenant import RegionUpdate, TenantCreate, TenantResponse, RegionCreate, RegionResponse
 from ..schemas.user import TenantAdminCreate, UserResponse
-from ..utils.dependencies import require_casino_owner, require_tenant_admin
+from ..utils.dependencies import require_casino_owner, require_tenant_admin, invalidate_principal
 from ..services.email_service import email_service
 from ..models.game import Game, GameProvider, ProviderGame, TenantGame
 from ..schemas.game import GameProviderCreate, GameProviderResponse, MarketplaceItemResponse, ProviderGameCreate, TenantGameToggle
@@ -21,6 +21,8 @@ from ..models.points import ScoringRule
 from decimal import Decimal
 import logging
 from ..services.kyc_service import KYCService
+from ..services.lobby_service import LobbyService
+from ..redis_client import CacheManager
 
 logger = logging.getLogger(__name__)
 
@@ -234,6 +236,7 @@ async def approve_kyc(
     kyc.verified_at = datetime.now(timezone.utc)
     
     db.commit()
+    await invalidate_principal(kyc.user_id)
     
     # Get user
     user = db.query(User).filter(User.user_id == kyc.user_id).first()
@@ -304,6 +307,7 @@ async def activate_user(
     # Activate user
     user.is_active = True
     db.commit()
+    await invalidate_principal(user.user_id)
     
     # Send activation email
     await email_service.send_activation_email(
@@ -330,6 +334,7 @@ async def deactivate_user(
     
     user.is_active = False
     db.commit()
+    await invalidate_principal(user.user_id)
     
     return {"message": "User deactivated successfully"}
 
@@ -387,6 +392,7 @@ async def toggle_provider_status(
     
     provider.is_active = is_active
     db.commit()
+    LobbyService.invalidate_provider(db, provider_id)
     return {"message": f"Provider {'enabled' if is_active else 'disabled'}"}
 
 # Create Admin User for Tenant
@@ -416,7 +422,7 @@ async def create_admin_user_for_tenant(
         )
     
     # 3. Hash password
-    hashed_password = get_password_hash(admin_data.password)
+    hashed_password = await get_password_hash_async(admin_data.password)
 
     # 4. Create User
     new_admin = User(
@@ -476,6 +482,7 @@ async def update_tenant_admin_status(
     
     admin_user.is_active = is_active
     db.commit()
+    await invalidate_principal(admin_user.user_id)
     db.refresh(admin_user)
     
     return {"message": f"Admin status updated to {'Active' if is_active else 'Inactive'}"}
@@ -505,6 +512,7 @@ async def add_game_to_provider(
     )
     db.add(new_link)
     db.commit()
+    LobbyService.invalidate_provider(db, item.provider_id)
     return {"message": "Game added to provider catalog"}
 
 # Helper to ensure base games exist (Run once or via script)
@@ -572,6 +580,7 @@ async def toggle_tenant_game(
             db.add(tenant_game)
     
     db.commit()
+    LobbyService.invalidate_tenant(admin.tenant_id)
     return {"message": "Game updated successfully"}
 
 
@@ -674,6 +683,7 @@ def fetch_upcoming_matches(db: Session = Depends(get_db)):
             created_count += 1
 
         db.commit()
+        CacheManager.invalidate_match_list()
 
         return {
             "message": f"Fetched {len(upcoming_matches_data)} matches, created {created_count}",
@@ -730,6 +740,7 @@ def activate_match(match_id: int, db: Session = Depends(get_db)):
     create_default_scoring_rules(db, match.match_id)
     match.is_active = True
     db.commit()
+    CacheManager.invalidate_match_list()
     
     return {
         "message": f"Match activated with {players_created} players",
@@ -785,6 +796,7 @@ def lock_team_creation(match_id: int, db: Session = Depends(get_db)):
     if not match: raise HTTPException(status_code=404, detail="Match not found")
     match.teams_locked = True
     db.commit()
+    CacheManager.invalidate_match_list()
     return {"message": "Team creation locked"}
 
 @router.post("/matches/{match_id}/start")
@@ -793,6 +805,7 @@ def start_match(match_id: int, db: Session = Depends(get_db)):
     if not match: raise HTTPException(status_code=404, detail="Match not found")
     match.status = MatchStatuses.LIVE
     db.commit()
+    CacheManager.invalidate_match_list()
     return {"message": "Match started"}
 
 @router.put("/matches/{match_id}/scoring-rules")
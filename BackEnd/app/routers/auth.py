@@ -5,8 +5,8 @@ from ..database import get_db
 from ..models.user import User, UserType
 from ..schemas.user import UserSignup, UserLogin, UserResponse, UserRegionSelect, KYCSubmit
 from ..schemas.auth import Token
-from ..utils.security import get_password_hash, verify_password, create_access_token
-from ..utils.dependencies import get_current_user
+from ..utils.security import get_password_hash_async, verify_password_async, create_access_token
+from ..utils.dependencies import get_current_user, invalidate_principal
 from ..services.wallet_service import wallet_service
 from ..config import settings
 from ..models.tenant import Tenant, TenantRegion
@@ -32,7 +32,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
         )
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     # Create user (Active by default to allow onboarding steps, but gated by KYC on Login)
     new_user = User(
@@ -97,6 +97,7 @@ async def select_region(
     wallet_service.create_wallets_for_user(db, current_user.user_id, tenant.tenant_id)
     
     db.commit()
+    await invalidate_principal(current_user.user_id)
     db.refresh(current_user)
     
     return current_user
@@ -179,6 +180,7 @@ async def switch_tenant(
     wallet_service.create_wallets_for_user(db, current_user.user_id, tenant_id)
 
     db.commit()
+    await invalidate_principal(current_user.user_id)
 
     # 4. Generate a NEW token because the tenant_id inside the token payload has changed
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -230,7 +232,7 @@ async def login(login_data: UserLogin, db: Session = Depends(get_db)):
     # Find user by email
     user = db.query(User).filter(User.email == login_data.email).first()
     
-    if not user or not verify_password(login_data.password, user.password):
+    if not user or not await verify_password_async(login_data.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -327,7 +329,7 @@ async def reset_password(
         )
     
     # Hash new password
-    hashed_password = get_password_hash(request.new_password)
+    hashed_password = await get_password_hash_async(request.new_password)
     
     # Update User
     user.password = hashed_password
@@ -1,26 +1,27 @@
 from datetime import timezone, datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from typing import Dict
-from ...database import get_db
-from ...models.user import User
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import get_current_active_user, require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.blackjack_engine import BlackjackEngine
 
 router = APIRouter(prefix="/games/blackjack", tags=["Blackjack"])
 
 # Store active game sessions in memory (in production => Redis)
-active_games: Dict[int, BlackjackEngine] = {}
+# Values are BlackjackEngine.to_bytes() (~20 bytes a game), so they can move to Redis as they are
+active_games: Dict[int, bytes] = {}
 
 @router.post("/start")
 async def start_blackjack_game(
     bet_amount: Decimal,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a new blackjack game"""
     # 1. Check for active session
@@ -40,12 +41,11 @@ async def start_blackjack_game(
     #     )
     
     # Get or create blackjack game entry
-    game = db.query(Game).filter(Game.game_name == "Blackjack").first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Blackjack"))).scalars().first()
     if not game:
         game = Game(game_name="Blackjack", rtp_percent=Decimal("99.5"))
         db.add(game)
-        db.commit()
-        db.refresh(game)
+        await db.commit()
     
     # Get user's cash wallet
     # wallet = wallet_service.get_wallet(db, current_user.user_id, WalletType.cash)
@@ -57,7 +57,7 @@ async def start_blackjack_game(
     
     # # Debit bet amount
     # wallet_service.debit_wallet(db, wallet.wallet_id, bet_amount)
-    txn_details = wallet_service.process_game_bet(db, current_user.user_id, current_user.tenant_id, bet_amount)
+    txn_details = await wallet_service.process_game_bet_async(db, current_user.user_id, current_user.tenant_id, bet_amount)
     
     # Create game session
     session = GameSession(
@@ -65,18 +65,20 @@ async def start_blackjack_game(
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
     # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
     # Create bet record
     bet = Bet(
         round_id=round_obj.round_id,
+        started_at=round_obj.started_at,
+        user_id=current_user.user_id,
+        tenant_id=current_user.tenant_id,
+        game_id=game.game_id,
         # wallet_id=wallet.wallet_id,
         wallet_id=txn_details["primary_wallet_id"],
         bet_amount=bet_amount,
@@ -84,15 +86,14 @@ async def start_blackjack_game(
         bet_status=BetStatus.placed
     )
     db.add(bet)
-    db.commit()
-    db.refresh(bet)
+    await db.commit()
     
     # Initialize game engine
     engine = BlackjackEngine()
     game_state = engine.start_game()
     
     # Store in memory
-    active_games[session.session_id] = engine
+    active_games[session.session_id] = engine.to_bytes()
     
     return {
         "session_id": session.session_id,
@@ -104,16 +105,16 @@ async def start_blackjack_game(
 @router.post("/{session_id}/hit")
 async def hit(
     session_id: int,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Hit - draw another card"""
     
     # Verify session belongs to user
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -128,10 +129,11 @@ async def hit(
             detail="Game session expired"
         )
     
-    engine = active_games[session_id]
+    engine = BlackjackEngine.from_bytes(active_games[session_id])
     
     try:
         game_state = engine.hit()
+        active_games[session_id] = engine.to_bytes()
         
         # If game over, settle
         if game_state["game_over"]:
@@ -148,15 +150,15 @@ async def hit(
 @router.post("/{session_id}/stand")
 async def stand(
     session_id: int,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Stand - end turn and let dealer play"""
     
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -170,10 +172,11 @@ async def stand(
             detail="Game session expired"
         )
     
-    engine = active_games[session_id]
+    engine = BlackjackEngine.from_bytes(active_games[session_id])
     
     try:
         game_state = engine.stand()
+        active_games[session_id] = engine.to_bytes()
         await _settle_blackjack_game(session_id, engine, current_user.user_id, current_user.tenant_id, db)
         
         return {"game_state": game_state}
@@ -187,15 +190,15 @@ async def stand(
 @router.post("/{session_id}/double")
 async def double_down(
     session_id: int,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Double down - double bet and hit once"""
     
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -209,48 +212,49 @@ async def double_down(
             detail="Game session expired"
         )
     
-    engine = active_games[session_id]
+    engine = BlackjackEngine.from_bytes(active_games[session_id])
     
     # Get original bet
-    round_obj = db.query(GameRound).filter(
-        GameRound.session_id == session_id
-    ).first()
+    round_obj = (await db.execute(
+        select(GameRound).where(GameRound.session_id == session_id)
+    )).scalars().first()
     
-    bet = db.query(Bet).filter(Bet.round_id == round_obj.round_id).first()
+    bet = (await db.execute(select(Bet).where(Bet.round_id == round_obj.round_id))).scalars().first()
     original_amount = bet.bet_amount
     
     # Get wallet and debit additional amount
-    wallet = wallet_service.get_wallet(db, current_user.user_id,current_user.tenant_id, WalletType.cash)
-    wallet_service.debit_wallet(db, wallet.wallet_id, original_amount)
+    wallet = await wallet_service.get_wallet_async(db, current_user.user_id,current_user.tenant_id, WalletType.cash)
+    await wallet_service.debit_wallet_async(db, wallet.wallet_id, original_amount)
     
     # Update bet amount
     bet.bet_amount = original_amount * 2
-    db.commit()
+    await db.commit()
     
     try:
         game_state = engine.double_down()
+        active_games[session_id] = engine.to_bytes()
         await _settle_blackjack_game(session_id, engine, current_user.user_id, current_user.tenant_id, db)
         
         return {"game_state": game_state}
     
     except Exception as e:
         # Refund the additional bet
-        wallet_service.credit_wallet(db, wallet.wallet_id, original_amount)
+        await wallet_service.credit_wallet_async(db, wallet.wallet_id, original_amount)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-async def _settle_blackjack_game(session_id: int, engine: BlackjackEngine,user_id:int, tenant_id: int, db: Session):
+async def _settle_blackjack_game(session_id: int, engine: BlackjackEngine,user_id:int, tenant_id: int, db: AsyncSession):
     """Settle blackjack game and update wallet"""
     
     # Get bet
-    round_obj = db.query(GameRound).filter(
-        GameRound.session_id == session_id
-    ).first()
+    round_obj = (await db.execute(
+        select(GameRound).where(GameRound.session_id == session_id)
+    )).scalars().first()
     
-    game = db.query(Game).filter(Game.game_name == "Blackjack").first()
-    bet = db.query(Bet).filter(Bet.round_id == round_obj.round_id).first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Blackjack"))).scalars().first()
+    bet = (await db.execute(select(Bet).where(Bet.round_id == round_obj.round_id))).scalars().first()
     
     # Calculate payout
     payout = engine.calculate_payout(bet.bet_amount)
@@ -262,18 +266,16 @@ async def _settle_blackjack_game(session_id: int, engine: BlackjackEngine,user_i
     else:
         bet.bet_status = BetStatus.lost
     
-    db.commit()
+    await db.commit()
     
     # Credit payout to wallet
     if payout > 0:
-        wallet_service.credit_winnings(db, user_id, payout, game.game_id, tenant_id, bet.bet_id)
+        await wallet_service.credit_winnings_async(db, user_id, payout, game.game_id, tenant_id, bet.bet_id)
     
     # Close session
-    session = db.query(GameSession).filter(
-        GameSession.session_id == session_id
-    ).first()
+    session = await db.get(GameSession, session_id)
     session.ended_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     # Remove from active games
     if session_id in active_games:
@@ -1,15 +1,15 @@
 from datetime import timezone, datetime
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from typing import Dict, Optional
 from pydantic import BaseModel
 import secrets
-from ...database import get_db
-from ...models.user import User
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.crash_engine import CrashGame
 
@@ -26,8 +26,8 @@ class CrashBetInput(BaseModel):
 @router.post("/join")
 async def join_crash_game(
     bet_data: CrashBetInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Join the current crash game before it starts"""
     global current_game_id
@@ -40,12 +40,11 @@ async def join_crash_game(
         )
     
     # Get or create crash game entry
-    game = db.query(Game).filter(Game.game_name == "Crash").first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Crash"))).scalars().first()
     if not game:
         game = Game(game_name="Crash", rtp_percent=Decimal("99.0"))
         db.add(game)
-        db.commit()
-        db.refresh(game)
+        await db.commit()
     
     # Create or get current game
     if not current_game_id or current_game_id not in active_crash_games:
@@ -65,7 +64,7 @@ async def join_crash_game(
         )
     
     # Process Entry Fee (Hybrid Betting: Cash + Bonus + Points)
-    txn_details = wallet_service.process_game_bet(
+    txn_details = await wallet_service.process_game_bet_async(
             db, 
             current_user.user_id,
             current_user.tenant_id,
@@ -77,26 +76,27 @@ async def join_crash_game(
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
     # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
     # Create bet record
     bet_record = Bet(
         round_id=round_obj.round_id,
+        started_at=round_obj.started_at,
+        user_id=current_user.user_id,
+        tenant_id=current_user.tenant_id,
+        game_id=game.game_id,
         wallet_id=txn_details["primary_wallet_id"],
         bet_amount=bet_data.bet_amount,
         payout_amount=Decimal("0"),
         bet_status=BetStatus.placed
     )
     db.add(bet_record)
-    db.commit()
-    db.refresh(bet_record)
+    await db.commit()
     
     # Add player to crash game
     success = crash_game.add_player_bet(
@@ -107,7 +107,7 @@ async def join_crash_game(
     
     if not success:
         # Refund
-        wallet_service.credit_winnings(db, current_user.user_id, bet_data.bet_amount, game.game_id, current_user.tenant_id, bet_record.bet_id)
+        await wallet_service.credit_winnings_async(db, current_user.user_id, bet_data.bet_amount, game.game_id, current_user.tenant_id, bet_record.bet_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to join game"
@@ -126,8 +126,8 @@ async def join_crash_game(
 @router.post("/{game_id}/cashout")
 async def cashout_crash(
     game_id: str,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cash out from current crash game"""
     
@@ -161,29 +161,29 @@ async def cashout_crash(
         )
     
     # Get user's session and bet
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.user_id == current_user.user_id,
         GameSession.ended_at == None
-    ).order_by(GameSession.session_id.desc()).first()
+    ).order_by(GameSession.session_id.desc()))).scalars().first()
     
     if session:
-        round_obj = db.query(GameRound).filter(
-            GameRound.session_id == session.session_id
-        ).first()
+        round_obj = (await db.execute(
+            select(GameRound).where(GameRound.session_id == session.session_id)
+        )).scalars().first()
         
-        bet = db.query(Bet).filter(Bet.round_id == round_obj.round_id).first()
+        bet = (await db.execute(select(Bet).where(Bet.round_id == round_obj.round_id))).scalars().first()
         
         # Update bet
         bet.payout_amount = result["payout"]
         bet.bet_status = BetStatus.won
-        db.commit()
+        await db.commit()
         
         # Credit payout
-        wallet_service.credit_winnings(db, current_user.user_id, result["payout"], game_id, current_user.tenant_id, bet.bet_id)
+        await wallet_service.credit_winnings_async(db, current_user.user_id, result["payout"], session.game_id, current_user.tenant_id, bet.bet_id)
         
         # Close session
         session.ended_at = datetime.now(timezone.utc)
-        db.commit()
+        await db.commit()
     
     return {
         "game_id": game_id,
@@ -1,15 +1,18 @@
 from datetime import timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from pydantic import BaseModel
-from ...database import get_db
-from ...models.user import User
+from ...config import settings
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import get_current_active_user, require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.dice_engine import DiceEngine
+from ...services.autoplay_service import AutoplayService
+from ...schemas.game import AutoplayStopRules
 
 router = APIRouter(prefix="/games/dice", tags=["Dice"])
 
@@ -20,17 +23,35 @@ class DiceRollInput(BaseModel):
     client_seed: str
     nonce: int
 
+class DiceAutoplayInput(BaseModel):
+    bet_amount: Decimal
+    rounds: int
+    target: float
+    roll_over: bool = True
+    client_seed: str
+    nonce: int  # first round's nonce; each following round adds one
+    stop: AutoplayStopRules = AutoplayStopRules()
+
 class DiceVerifyInput(BaseModel):
     server_seed: str
     client_seed: str
     nonce: int
     claimed_result: float
 
+async def _dice_game(db: AsyncSession) -> Game:
+    """Get or create dice game entry"""
+    game = (await db.execute(select(Game).where(Game.game_name == "Dice"))).scalars().first()
+    if not game:
+        game = Game(game_name="Dice", rtp_percent=Decimal("99.0"))
+        db.add(game)
+        await db.commit()
+    return game
+
 @router.post("/roll")
 async def roll_dice(
     roll_data: DiceRollInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Roll the dice with provably fair mechanism"""
     
@@ -41,36 +62,27 @@ async def roll_dice(
             detail="Target must be between 0 and 99.99"
         )
     
-    # Get or create dice game entry
-    game = db.query(Game).filter(Game.game_name == "Dice").first()
-    if not game:
-        game = Game(game_name="Dice", rtp_percent=Decimal("99.0"))
-        db.add(game)
-        db.commit()
-        db.refresh(game)
+    game = await _dice_game(db)
     
     # Process the bet using hybrid wallet system (Cash + Bonus + Points)
-    txn_details = wallet_service.process_game_bet(
+    txn_details = await wallet_service.process_game_bet_async(
         db, 
         current_user.user_id,
         current_user.tenant_id,
         roll_data.bet_amount
     )
     
-    # Create game session
+    # Create game session and round (flush assigns ids; one commit below)
     session = GameSession(
         user_id=current_user.user_id,
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
-    # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
     # Play dice round
     engine = DiceEngine()
@@ -85,21 +97,25 @@ async def roll_dice(
     # Create bet record
     bet_record = Bet(
         round_id=round_obj.round_id,
+        started_at=round_obj.started_at,
+        user_id=current_user.user_id,
+        tenant_id=current_user.tenant_id,
+        game_id=game.game_id,
         wallet_id=txn_details["primary_wallet_id"],
         bet_amount=roll_data.bet_amount,
         payout_amount=result["payout"],
         bet_status=BetStatus.won if result["won"] else BetStatus.lost
     )
     db.add(bet_record)
-    db.commit()
+    await db.commit()
     
     # Credit payout if won
     if result["payout"] > 0:
-         wallet_service.credit_winnings(db, current_user.user_id, result["payout"], game.game_id, current_user.tenant_id, bet_record.bet_id)
+         await wallet_service.credit_winnings_async(db, current_user.user_id, result["payout"], game.game_id, current_user.tenant_id, bet_record.bet_id)
     # Close session
     from datetime import datetime
     session.ended_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     return {
         "session_id": session.session_id,
@@ -122,6 +138,68 @@ async def roll_dice(
         }
     }
 
+@router.post("/autoplay")
+async def autoplay_dice(
+    autoplay_data: DiceAutoplayInput,
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Roll up to `rounds` times in one request, stopping early on the given rules.
+    One server seed covers the run (nonces nonce, nonce+1, ...); every round can be checked with /verify.
+    """
+    if autoplay_data.target < 0 or autoplay_data.target > 99.99:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Target must be between 0 and 99.99"
+        )
+    if autoplay_data.bet_amount <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bet amount must be positive")
+    if not 1 <= autoplay_data.rounds <= settings.AUTOPLAY_MAX_ROUNDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Rounds must be between 1 and {settings.AUTOPLAY_MAX_ROUNDS}"
+        )
+    
+    game = await _dice_game(db)
+    
+    engine = DiceEngine()
+    server_seed = engine.generate_server_seed()
+    server_seed_hash = engine.hash_server_seed(server_seed)
+    multiplier = engine.calculate_multiplier(autoplay_data.target, autoplay_data.roll_over)
+    
+    gross_payouts, outcomes = [], []
+    for i in range(autoplay_data.rounds):
+        nonce = autoplay_data.nonce + i
+        roll_result = engine.roll_dice(server_seed, autoplay_data.client_seed, nonce)
+        won = engine.check_win(roll_result, autoplay_data.target, autoplay_data.roll_over)
+        gross_payouts.append(autoplay_data.bet_amount * multiplier if won else Decimal("0"))
+        outcomes.append({
+            "roll_result": roll_result,
+            "target": autoplay_data.target,
+            "roll_over": autoplay_data.roll_over,
+            "won": won,
+            "multiplier": float(multiplier) if won else 0.0,
+            "server_seed": server_seed,
+            "server_seed_hash": server_seed_hash,
+            "client_seed": autoplay_data.client_seed,
+            "nonce": nonce
+        })
+    
+    return await AutoplayService.settle_async(
+        db, current_user, game, autoplay_data.bet_amount, gross_payouts, outcomes, autoplay_data.stop
+    )
+
+@router.get("/autoplay/{session_id}")
+async def get_dice_autoplay(
+    session_id: int,
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Every round of a dice autoplay session, with its seeds for verification"""
+    game = await _dice_game(db)
+    return await AutoplayService.session_rounds_async(db, current_user.user_id, session_id, game.game_id)
+
 @router.post("/verify")
 async def verify_dice_roll(verify_data: DiceVerifyInput):
     """Verify a dice roll result"""
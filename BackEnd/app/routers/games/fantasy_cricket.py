@@ -9,9 +9,10 @@ from ...database import get_db
 from ...models.user import User
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.fantasy import FantasyMatch, FantasyPlayer, FantasyUserTeam, MatchStatus, PlayerRole
-from ...utils.dependencies import require_tenant, require_tenant_admin
+from ...utils.dependencies import require_tenant, require_tenant_admin, get_read_db
 from ...services.wallet_service import wallet_service
 from ...services.fantasy_service import fantasy_service
+from ...services.analytics_service import AnalyticsService
 
 router = APIRouter(prefix="/games/fantasy-cricket", tags=["Fantasy Cricket"])
 
@@ -136,6 +137,7 @@ async def settle_match(match_code: str, current_user: User = Depends(require_ten
     
     # 6. Assign Ranks, Distribute Prizes, and Update Bets
     total_pool = match.prize_pool
+    settled_session_starts = []
     
     for rank, team in enumerate(user_teams, 1):
         team.rank = rank
@@ -179,12 +181,16 @@ async def settle_match(match_code: str, current_user: User = Depends(require_ten
             # (Navigating SQLAlchemy relationships: Bet -> Round -> Session)
             if associated_bet.round and associated_bet.round.session:
                 associated_bet.round.session.ended_at = datetime.now(timezone.utc)
+                settled_session_starts.append(associated_bet.round.session.started_at)
 
     # 7. Finalize Match
     match.status = MatchStatus.completed
     match.end_time = datetime.now(timezone.utc)
     
     db.commit()
+
+    # Entry bets were placed when teams were created, usually outside the rollup sweep window
+    AnalyticsService.mark_dirty(settled_session_starts)
     
     # 8. Return leaderboard
     leaderboard = []
@@ -281,11 +287,15 @@ async def create_team(
         sess = GameSession(user_id=current_user.user_id, game_id=game.game_id)
         db.add(sess)
         db.commit()
-        rnd = GameRound(session_id=sess.session_id)
+        rnd = GameRound(session_id=sess.session_id, started_at=sess.started_at)
         db.add(rnd)
         db.commit()
         bet = Bet(
             round_id=rnd.round_id,
+            started_at=rnd.started_at,
+            user_id=current_user.user_id,
+            tenant_id=current_user.tenant_id,
+            game_id=game.game_id,
             wallet_id=txn["primary_wallet_id"],
             bet_amount=match.entry_fee,
             payout_amount=0,
@@ -297,7 +307,7 @@ async def create_team(
     return {"message": "Team created successfully", "team_id": user_team.id}
 
 @router.get("/matches/{match_code}/leaderboard")
-async def get_leaderboard(match_code: str, db: Session = Depends(get_db)):
+async def get_leaderboard(match_code: str, db: Session = Depends(get_read_db)):
     match = db.query(FantasyMatch).filter(FantasyMatch.match_code == match_code).first()
     if not match: raise HTTPException(status_code=404)
     
@@ -1,14 +1,14 @@
 from datetime import timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from typing import Dict
 from pydantic import BaseModel
-from ...database import get_db
-from ...models.user import User
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import get_current_active_user, require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.mines_engine import MinesEngine
 
@@ -27,8 +27,8 @@ class MinesRevealInput(BaseModel):
 @router.post("/start")
 async def start_mines_game(
     game_data: MinesStartInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Start a new mines game"""
     
@@ -40,15 +40,14 @@ async def start_mines_game(
         )
     
     # Get or create mines game entry
-    game = db.query(Game).filter(Game.game_name == "Mines").first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Mines"))).scalars().first()
     if not game:
         game = Game(game_name="Mines", rtp_percent=Decimal("98.0"))
         db.add(game)
-        db.commit()
-        db.refresh(game)
+        await db.commit()
     
     # Process the bet using hybrid wallet system (Cash + Bonus + Points)
-    txn_details = wallet_service.process_game_bet(
+    txn_details = await wallet_service.process_game_bet_async(
         db, 
         current_user.user_id,
         current_user.tenant_id,
@@ -61,26 +60,27 @@ async def start_mines_game(
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
     # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
     # Create bet record (payout updated on cashout)
     bet_record = Bet(
         round_id=round_obj.round_id,
+        started_at=round_obj.started_at,
+        user_id=current_user.user_id,
+        tenant_id=current_user.tenant_id,
+        game_id=game.game_id,
         wallet_id=txn_details["primary_wallet_id"],
         bet_amount=game_data.bet_amount,
         payout_amount=Decimal("0"),
         bet_status=BetStatus.placed
     )
     db.add(bet_record)
-    db.commit()
-    db.refresh(bet_record)
+    await db.commit()
     
     # Initialize mines engine
     engine = MinesEngine(grid_size=25, num_mines=game_data.num_mines)
@@ -100,16 +100,16 @@ async def start_mines_game(
 async def reveal_tile(
     session_id: int,
     reveal_data: MinesRevealInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reveal a tile"""
     
     # Verify session belongs to user
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -147,16 +147,16 @@ async def reveal_tile(
 @router.post("/{session_id}/cashout")
 async def cashout_mines(
     session_id: int,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Cash out current game"""
     
     # Verify session belongs to user
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -191,16 +191,16 @@ async def cashout_mines(
 @router.get("/{session_id}/state")
 async def get_game_state(
     session_id: int,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current game state"""
     
     # Verify session belongs to user
-    session = db.query(GameSession).filter(
+    session = (await db.execute(select(GameSession).where(
         GameSession.session_id == session_id,
         GameSession.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not session:
         raise HTTPException(
@@ -222,15 +222,15 @@ async def get_game_state(
         "game_state": engine.get_game_state(hide_mines=not engine.game_over)
     }
 
-async def _settle_mines_game(session_id: int, engine: MinesEngine,user_id: int, tenant_id: int, db: Session):
+async def _settle_mines_game(session_id: int, engine: MinesEngine,user_id: int, tenant_id: int, db: AsyncSession):
     """Settle mines game and update wallet"""
     
     # Get bet
-    round_obj = db.query(GameRound).filter(
-        GameRound.session_id == session_id
-    ).first()
-    game = db.query(Game).filter(Game.game_name == "Mines").first()
-    bet = db.query(Bet).filter(Bet.round_id == round_obj.round_id).first()
+    round_obj = (await db.execute(
+        select(GameRound).where(GameRound.session_id == session_id)
+    )).scalars().first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Mines"))).scalars().first()
+    bet = (await db.execute(select(Bet).where(Bet.round_id == round_obj.round_id))).scalars().first()
     
     # Calculate payout
     payout = engine.calculate_payout(bet.bet_amount)
@@ -238,19 +238,17 @@ async def _settle_mines_game(session_id: int, engine: MinesEngine,user_id: int,
     # Update bet
     bet.payout_amount = payout
     bet.bet_status = BetStatus.won if engine.game_won else BetStatus.lost
-    db.commit()
+    await db.commit()
     
     # Credit payout to wallet
     if payout > 0:
-        wallet_service.credit_winnings(db, user_id, payout, game.game_id, tenant_id, bet.bet_id)
+        await wallet_service.credit_winnings_async(db, user_id, payout, game.game_id, tenant_id, bet.bet_id)
     
     # Close session
     from datetime import datetime
-    session = db.query(GameSession).filter(
-        GameSession.session_id == session_id
-    ).first()
+    session = await db.get(GameSession, session_id)
     session.ended_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     # Remove from active games
     if session_id in active_mines_games:
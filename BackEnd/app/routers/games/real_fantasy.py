@@ -2,8 +2,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from ...database import get_db
+from ...utils.dependencies import get_read_db
 from ...models.match import Match, MatchStatuses
 from ...models.player import Player
+from ...redis_client import CacheManager
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -35,12 +37,20 @@ class RealPlayerResponse(BaseModel):
         from_attributes = True
 
 @router.get("/matches", response_model=List[RealMatchResponse])
-def get_real_matches(db: Session = Depends(get_db)):
+def get_real_matches(db: Session = Depends(get_read_db)):
     """Fetch matches synced from RapidAPI/Cricbuzz"""
-    return db.query(Match).filter(
+    cached = CacheManager.get_match_list()
+    if cached is not None:
+        return cached
+
+    matches = db.query(Match).filter(
         Match.status != MatchStatuses.CANCELLED
     ).order_by(Match.match_date.asc()).all()
 
+    result = [RealMatchResponse.model_validate(m).model_dump(mode="json") for m in matches]
+    CacheManager.set_match_list(result)
+    return result
+
 @router.get("/matches/{match_id}/players", response_model=List[RealPlayerResponse])
 def get_match_players(match_id: int, db: Session = Depends(get_db)):
     """Fetch players for a specific real match"""
@@ -1,16 +1,22 @@
 from datetime import timezone, datetime
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from typing import List, Any, Optional
 from pydantic import BaseModel
-from ...database import get_db
-from ...models.user import User
+import logging
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.roulette_engine import RouletteEngine
+from ...services.roulette_table import roulette_tables
+from ...utils.security import decode_access_token
+from ...websocket.manager import roulette_manager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/games/roulette", tags=["Roulette"])
 
@@ -25,8 +31,8 @@ class RouletteSpinInput(BaseModel):
 @router.post("/spin")
 async def spin_roulette(
     spin_data: RouletteSpinInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Place bets and spin the roulette wheel"""
     
@@ -37,16 +43,32 @@ async def spin_roulette(
             detail="At least one bet is required"
         )
     
+    # Reject malformed bets before any money moves
+    engine = RouletteEngine()
+    bets_data = [
+        {
+            "bet_type": bet.bet_type,
+            "bet_value": bet.bet_value,
+            "bet_amount": bet.bet_amount
+        }
+        for bet in spin_data.bets
+    ]
+    try:
+        compiled = engine.compile_slip(bets_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if any(bet.bet_amount <= 0 for bet in spin_data.bets):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bet amounts must be positive")
+    
     # Get or create roulette game entry
-    game = db.query(Game).filter(Game.game_name == "Roulette").first()
+    game = (await db.execute(select(Game).where(Game.game_name == "Roulette"))).scalars().first()
     if not game:
         game = Game(game_name="Roulette", rtp_percent=Decimal("97.3"))
         db.add(game)
-        db.commit()
-        db.refresh(game)
+        await db.commit()
     
     # Get user's cash wallet
-    wallet = wallet_service.get_wallet(db, current_user.user_id, current_user.tenant_id, WalletType.cash)
+    wallet = await wallet_service.get_wallet_async(db, current_user.user_id, current_user.tenant_id, WalletType.cash)
     if not wallet:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -57,41 +79,37 @@ async def spin_roulette(
     total_bet_amount = sum(bet.bet_amount for bet in spin_data.bets)
 
     # Debit using hybrid logic
-    txn_details = wallet_service.process_game_bet(db, current_user.user_id, current_user.tenant_id, total_bet_amount)
+    txn_details = await wallet_service.process_game_bet_async(db, current_user.user_id, current_user.tenant_id, total_bet_amount)
     
-    # Create game session
+    # Create game session and round (flush assigns ids; one commit below)
     session = GameSession(
         user_id=current_user.user_id,
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
-    # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
-    # Initialize roulette engine and play
-    engine = RouletteEngine()
-    bets_data = [
-        {
-            "bet_type": bet.bet_type,
-            "bet_value": bet.bet_value,
-            "bet_amount": bet.bet_amount
-        }
-        for bet in spin_data.bets
-    ]
-    
-    result = engine.play_round(bets_data)
+    # Spin and settle the whole slip with one mask lookup per bet
+    winning_number = engine.spin()
+    result = {
+        "winning_number": winning_number,
+        "color": engine.get_color(winning_number),
+        **engine.resolve_slip(bets_data, compiled, winning_number)
+    }
     
     # Create bet records for each bet
     bet_records = []
     for bet_data, bet_result in zip(spin_data.bets, result["bet_results"]):
         bet_record = Bet(
             round_id=round_obj.round_id,
+            started_at=round_obj.started_at,
+            user_id=current_user.user_id,
+            tenant_id=current_user.tenant_id,
+            game_id=game.game_id,
             wallet_id=txn_details["primary_wallet_id"],
             bet_amount=bet_data.bet_amount,
             payout_amount=bet_result["payout"],
@@ -100,15 +118,15 @@ async def spin_roulette(
         db.add(bet_record)
         bet_records.append(bet_record)
     
-    db.commit()
+    await db.commit()
     
     # Credit total payout to wallet if any wins
     if result["total_payout"] > 0:
-        wallet_service.credit_winnings(db, current_user.user_id, result["total_payout"],game.game_id, current_user.tenant_id, bet_record.bet_id)
+        await wallet_service.credit_winnings_async(db, current_user.user_id, result["total_payout"],game.game_id, current_user.tenant_id, bet_record.bet_id)
     
     # Close session
     session.ended_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     return {
         "session_id": session.session_id,
@@ -120,6 +138,106 @@ async def spin_roulette(
         "net_result": result["total_payout"] - total_bet_amount
     }
 
+@router.post("/table/bet")
+async def place_table_bet(
+    spin_data: RouletteSpinInput,
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Place bets on the tenant's shared wheel. The stake is taken now; the slip is settled with
+    everyone else's when the round closes and the result is pushed on /games/roulette/table/ws.
+    """
+    if not spin_data.bets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one bet is required"
+        )
+    
+    bets_data = [
+        {
+            "bet_type": bet.bet_type,
+            "bet_value": bet.bet_value,
+            "bet_amount": bet.bet_amount
+        }
+        for bet in spin_data.bets
+    ]
+    try:
+        roulette_tables.engine.compile_slip(bets_data)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if any(bet.bet_amount <= 0 for bet in spin_data.bets):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bet amounts must be positive")
+    
+    total_bet_amount = sum(bet.bet_amount for bet in spin_data.bets)
+    placed = await roulette_tables.place_slip(
+        db, current_user.user_id, current_user.tenant_id, bets_data, total_bet_amount
+    )
+    
+    return {
+        "round": placed["round"],
+        "closes_at": placed["closes_at"],
+        "total_bet": total_bet_amount,
+        "bet_breakdown": {
+            "cash": placed["deducted_cash"],
+            "bonus": placed["deducted_bonus"],
+            "points": placed["deducted_points"]
+        },
+        "jackpot_result": placed["jackpot_result"]
+    }
+
+@router.get("/table")
+async def get_table_state(
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Open round of the shared wheel and the caller's unsettled slips"""
+    round_no, closes_at = roulette_tables.current_round()
+    return {
+        "round": round_no,
+        "closes_at": closes_at,
+        "round_seconds": roulette_tables.round_seconds(),
+        "pending": await roulette_tables.pending_for(db, current_user.tenant_id, current_user.user_id)
+    }
+
+@router.websocket("/table/ws")
+async def roulette_table_feed(websocket: WebSocket, token: str = None):
+    """
+    Live shared-wheel results for the token's tenant.
+
+    Usage:
+    - Connect: ws://localhost:8000/games/roulette/table/ws?token=<access token>
+    - Receive: {"type": "roulette_round", ...} on connect,
+      {"type": "roulette_spin", "round", "winning_number", "color"} once per round,
+      {"type": "roulette_settled", "round", "results": [{"user_id", "total_bet", "total_payout"}]}
+      for each batch of slips settled for the round
+    """
+    payload = decode_access_token(token) if token else None
+    tenant_id = payload.get("tenant_id") if payload else None
+    if tenant_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await roulette_manager.connect(websocket, tenant_id)
+    try:
+        round_no, closes_at = roulette_tables.current_round()
+        await roulette_manager.send_personal_message({
+            "type": "roulette_round",
+            "tenant_id": tenant_id,
+            "round": round_no,
+            "closes_at": closes_at.isoformat(),
+            "round_seconds": roulette_tables.round_seconds()
+        }, websocket)
+
+        # Keep connection alive; clients only send heartbeats
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        roulette_manager.disconnect(websocket, tenant_id)
+    except Exception as e:
+        logger.error(f"Roulette table WebSocket error: {str(e)}")
+        roulette_manager.disconnect(websocket, tenant_id)
+
 @router.get("/table-info")
 async def get_table_info():
     """Get roulette table information"""
@@ -131,12 +249,12 @@ async def get_table_info():
         "black_numbers": engine.BLACK_NUMBERS,
         "bet_types": {
             "straight": {"description": "Single number", "payout": "35:1"},
-            "split": {"description": "Two adjacent numbers", "payout": "17:1"},
-            "street": {"description": "Row of three numbers", "payout": "11:1"},
-            "corner": {"description": "Four numbers", "payout": "8:1"},
-            "line": {"description": "Two streets (6 numbers)", "payout": "5:1"},
-            "dozen": {"description": "12 numbers", "payout": "2:1"},
-            "column": {"description": "Column of 12 numbers", "payout": "2:1"},
+            "split": {"description": "Two adjacent numbers, e.g. [8, 11] or [0, 2]", "payout": "17:1"},
+            "street": {"description": "Row of three numbers, e.g. [7, 8, 9], or the trios [0, 1, 2] / [0, 2, 3]", "payout": "11:1"},
+            "corner": {"description": "Four numbers meeting at a corner, e.g. [1, 2, 4, 5], or [0, 1, 2, 3]", "payout": "8:1"},
+            "line": {"description": "Two adjacent streets (6 numbers), e.g. [1, 2, 3, 4, 5, 6]", "payout": "5:1"},
+            "dozen": {"description": "12 numbers (bet_value 1-3, or dozen1-dozen3)", "payout": "2:1"},
+            "column": {"description": "Column of 12 numbers (bet_value 1-3, or column1-column3)", "payout": "2:1"},
             "even_money": {"description": "Red/Black, Even/Odd, Low/High", "payout": "1:1"}
         }
     }
\ No newline at end of file
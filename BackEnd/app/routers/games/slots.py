@@ -1,58 +1,67 @@
 from datetime import timezone
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from decimal import Decimal
 from pydantic import BaseModel
-from ...database import get_db
-from ...models.user import User
+import secrets
+from ...config import settings
+from ...database import get_async_db
 from ...models.game import Game, GameSession, GameRound, Bet, BetStatus
 from ...models.wallet import WalletType
-from ...utils.dependencies import get_current_active_user, require_tenant
+from ...utils.dependencies import require_tenant_async, Principal
 from ...services.wallet_service import wallet_service
 from ...services.game_engines.slots_engine import SlotsEngine
+from ...services.autoplay_service import AutoplayService
+from ...schemas.game import AutoplayStopRules
 
 router = APIRouter(prefix="/games/slots", tags=["Slots"])
 
 class SlotsSpinInput(BaseModel):
     bet_amount: Decimal
 
+class SlotsAutoplayInput(BaseModel):
+    bet_amount: Decimal
+    rounds: int
+    stop: AutoplayStopRules = AutoplayStopRules()
+
+async def _slots_game(db: AsyncSession) -> Game:
+    """Get or create slots game entry"""
+    game = (await db.execute(select(Game).where(Game.game_name == "Slots"))).scalars().first()
+    if not game:
+        game = Game(game_name="Slots", rtp_percent=Decimal("96.0"))
+        db.add(game)
+        await db.commit()
+    return game
+
 @router.post("/spin")
 async def spin_slots(
     spin_data: SlotsSpinInput,
-    current_user: User = Depends(require_tenant),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Spin the slot machine"""
     
-    # Get or create slots game entry
-    game = db.query(Game).filter(Game.game_name == "Slots").first()
-    if not game:
-        game = Game(game_name="Slots", rtp_percent=Decimal("96.0"))
-        db.add(game)
-        db.commit()
-        db.refresh(game)
+    game = await _slots_game(db)
     # Process the bet using hybrid wallet system (Cash + Bonus + Points)
-    txn_details = wallet_service.process_game_bet(
+    txn_details = await wallet_service.process_game_bet_async(
         db, 
         current_user.user_id,
         current_user.tenant_id,
         spin_data.bet_amount
     )
     
-    # Create game session
+    # Create game session and round (flush assigns ids; one commit below)
     session = GameSession(
         user_id=current_user.user_id,
         game_id=game.game_id
     )
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.flush()
     
-    # Create game round
-    round_obj = GameRound(session_id=session.session_id)
+    round_obj = GameRound(session_id=session.session_id, started_at=session.started_at)
     db.add(round_obj)
-    db.commit()
-    db.refresh(round_obj)
+    await db.flush()
     
     # Play slots round
     engine = SlotsEngine()
@@ -61,22 +70,26 @@ async def spin_slots(
     # Create bet record
     bet_record = Bet(
         round_id=round_obj.round_id,
+        started_at=round_obj.started_at,
+        user_id=current_user.user_id,
+        tenant_id=current_user.tenant_id,
+        game_id=game.game_id,
         wallet_id=txn_details["primary_wallet_id"],
         bet_amount=spin_data.bet_amount,
         payout_amount=result["payout"],
         bet_status=BetStatus.won if result["payout"] > 0 else BetStatus.lost
     )
     db.add(bet_record)
-    db.commit()
+    await db.commit()
     
     # Credit payout if won
     if result["payout"] > 0:
-        wallet_service.credit_winnings(db, current_user.user_id, result["payout"], game.game_id, current_user.tenant_id, bet_record.bet_id)
+        await wallet_service.credit_winnings_async(db, current_user.user_id, result["payout"], game.game_id, current_user.tenant_id, bet_record.bet_id)
     
     # Close session
     from datetime import datetime
     session.ended_at = datetime.now(timezone.utc)
-    db.commit()
+    await db.commit()
     
     return {
         "session_id": session.session_id,
@@ -89,6 +102,49 @@ async def spin_slots(
         "net_result": result["payout"] - result["bet_amount"]
     }
 
+@router.post("/autoplay")
+async def autoplay_slots(
+    autoplay_data: SlotsAutoplayInput,
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Spin up to `rounds` times in one request, stopping early on the given rules"""
+    if not settings.SLOTS_AUTOPLAY_ENABLED:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Slots autoplay is disabled")
+    if autoplay_data.bet_amount <= 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bet amount must be positive")
+    if not 1 <= autoplay_data.rounds <= settings.AUTOPLAY_MAX_ROUNDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Rounds must be between 1 and {settings.AUTOPLAY_MAX_ROUNDS}"
+        )
+    
+    game = await _slots_game(db)
+    
+    # Every round is spun up front; only the rounds before a stop rule fires are charged
+    engine = SlotsEngine()
+    seed = secrets.randbits(64)
+    batch = engine.spin_batch(autoplay_data.rounds, seed=seed)
+    gross_payouts = [autoplay_data.bet_amount * Decimal(str(m)) for m in batch["multipliers"].tolist()]
+    outcomes = [
+        {"grid": engine.grid_symbols(grid), "total_multiplier": m, "seed": seed, "index": i}
+        for i, (grid, m) in enumerate(zip(batch["grids"], batch["multipliers"].tolist()))
+    ]
+    
+    return await AutoplayService.settle_async(
+        db, current_user, game, autoplay_data.bet_amount, gross_payouts, outcomes, autoplay_data.stop
+    )
+
+@router.get("/autoplay/{session_id}")
+async def get_slots_autoplay(
+    session_id: int,
+    current_user: Principal = Depends(require_tenant_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Every round of a slots autoplay session, with its grid"""
+    game = await _slots_game(db)
+    return await AutoplayService.session_rounds_async(db, current_user.user_id, session_id, game.game_id)
+
 @router.get("/symbols")
 async def get_symbols():
     """Get slot symbols and their payouts"""
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 from sqlalchemy.orm import Session
 from typing import List
+import logging
 from ..database import get_db
 from ..models.user import User
 from ..schemas.jackpot import JackpotResponse
 from ..services.jackpot_service import jackpot_service
+from ..redis_client import AsyncCacheManager
 from ..utils.dependencies import require_tenant
+from ..utils.security import decode_access_token
+from ..websocket.manager import jackpot_manager
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jackpot", tags=["Jackpot"])
 
@@ -15,4 +21,48 @@ async def get_current_jackpots(
     current_user: User = Depends(require_tenant)
 ):
     """Get live jackpot amounts for the user's tenant"""
-    return jackpot_service.get_jackpots(db, current_user.tenant_id)
\ No newline at end of file
+    cache_key = f"jackpots:{current_user.tenant_id}"
+    cached = await AsyncCacheManager.get(cache_key)
+    if cached is not None:
+        return cached
+
+    jackpots = jackpot_service.get_jackpots(db, current_user.tenant_id)
+    result = [JackpotResponse.model_validate(j).model_dump(mode="json") for j in jackpots]
+    # Amounts move with every qualifying bet, so only a few seconds of staleness is acceptable
+    await AsyncCacheManager.set(cache_key, result, ttl=5)
+    return result
+
+@router.websocket("/ws")
+async def jackpot_ticker(websocket: WebSocket, token: str = None):
+    """
+    Live jackpot amounts for the token's tenant, pushed by the jackpot ticker worker.
+
+    Usage:
+    - Connect: ws://localhost:8000/jackpot/ws?token=<access token>
+    - Receive: {"type": "jackpot_update", "tenant_id": .., "jackpots": [...]} whenever amounts move
+    No database access per connection: the tenant comes from the token, the snapshot from the cache.
+    """
+    payload = decode_access_token(token) if token else None
+    tenant_id = payload.get("tenant_id") if payload else None
+    if tenant_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await jackpot_manager.connect(websocket, tenant_id)
+    try:
+        cached = await AsyncCacheManager.get(f"jackpots:{tenant_id}")
+        if cached is not None:
+            await jackpot_manager.send_personal_message({
+                "type": "jackpot_update",
+                "tenant_id": tenant_id,
+                "jackpots": cached
+            }, websocket)
+
+        # Keep connection alive; clients only send heartbeats
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        jackpot_manager.disconnect(websocket, tenant_id)
+    except Exception as e:
+        logger.error(f"Jackpot WebSocket error: {str(e)}")
+        jackpot_manager.disconnect(websocket, tenant_id)
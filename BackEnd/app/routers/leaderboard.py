@@ -1,6 +1,7 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 from ..database import get_db
+from ..utils.dependencies import get_read_db
 from ..services.leaderboard_service import LeaderboardService
 from ..websocket.manager import manager
 import logging
@@ -13,7 +14,7 @@ router = APIRouter(prefix="/leaderboard", tags=["Leaderboard"])
 def get_match_leaderboard(
     match_id: int,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get leaderboard for a match
@@ -36,7 +37,7 @@ def get_match_leaderboard(
 def get_user_rank(
     match_id: int,
     user_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get user's rank and stats for a match"""
     return LeaderboardService.get_user_rank(db, match_id, user_id)
@@ -46,7 +47,7 @@ def get_user_rank(
 def get_top_performers(
     match_id: int,
     limit: int = 10,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get top performing players in match"""
     return LeaderboardService.get_top_performers(db, match_id, limit)
@@ -1,40 +1,17 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from ..database import get_db
-from ..models.user import User
-from ..models.game import TenantGame, ProviderGame, Game, GameProvider
+from ..database import get_async_db
 from ..schemas.game import PlayerGameResponse
-from ..utils.dependencies import require_tenant
+from ..services.lobby_service import LobbyService
+from ..utils.dependencies import require_tenant_async, Principal
 
 router = APIRouter(prefix="/lobby", tags=["Player Lobby"])
 
 @router.get("/games", response_model=List[PlayerGameResponse])
 async def get_my_tenant_games(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_tenant)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(require_tenant_async)
 ):
-    """Fetch only games enabled by the tenant admin"""
-    
-    # Join TenantGame -> ProviderGame -> Game & Provider
-    active_games = db.query(TenantGame)\
-        .join(ProviderGame, TenantGame.provider_game_id == ProviderGame.id)\
-        .join(Game, ProviderGame.game_id == Game.game_id)\
-        .join(GameProvider, ProviderGame.provider_id == GameProvider.provider_id)\
-        .filter(
-            TenantGame.tenant_id == current_user.tenant_id,
-            TenantGame.is_active == True,
-            GameProvider.is_active == True
-        ).all()
-        
-    result = []
-    for tg in active_games:
-        pg = tg.provider_game
-        result.append({
-            "game_id": pg.game.game_id,
-            "game_name": pg.game.game_name,
-            "provider_name": pg.provider.provider_name,
-            "rtp_percent": float(pg.game.rtp_percent)
-        })
-        
-    return result
\ No newline at end of file
+    """Fetch only games enabled by the tenant admin (cached per tenant, see LobbyService)"""
+    return await LobbyService.tenant_catalog_async(db, current_user.tenant_id)
@@ -1,95 +1,80 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, cast, Date
-from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, desc
+from datetime import datetime, date, timedelta, timezone
 from typing import List
 
 from ..models.tenant import Tenant
 from ..models.wallet import Wallet, WalletType
 from ..database import get_db
 from ..models.user import User
-from ..models.game import Bet, GameSession, GameRound, Game, BetStatus
+from ..models.game import GameSession, Game, Bet
+from ..services.analytics_service import AnalyticsService
 from ..schemas.stats import OwnerDashboardResponse, TenantDashboardResponse
-from ..utils.dependencies import require_casino_owner, require_tenant_admin
+from ..utils.dependencies import require_casino_owner, require_tenant_admin, get_read_db
 
 router = APIRouter(prefix="/stats", tags=["Tenant Stats"])
 
 @router.get("/tenant-profile", response_model=TenantDashboardResponse)
 async def get_tenant_profile(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(require_tenant_admin)
 ):
     tid = admin.tenant_id
     now = datetime.now(timezone.utc)
     seven_days_ago = now - timedelta(days=7)
 
+    # Lifetime totals per game for this tenant (rollups: closed days + today's hours)
+    rollup = AnalyticsService.totals(date.min, tid)
+
+    # Bets in the widest activity window; both active-user counts are FILTERs over it
+    recent_sessions = db.query(Bet.user_id, Bet.started_at)\
+        .filter(
+            Bet.tenant_id == tid,
+            Bet.started_at >= now - timedelta(days=30)
+        ).cte("recent_sessions")
+
+    # 1-3. Headline KPIs in a single round trip
+    kpis = db.query(
+        db.query(func.sum(rollup.c.wagered - rollup.c.payout)).scalar_subquery().label("ngr"),
+        db.query(func.sum(rollup.c.wagered)).scalar_subquery().label("total_wagered"),
+        db.query(func.count(User.user_id))
+            .filter(User.tenant_id == tid, User.role == "player")
+            .scalar_subquery().label("total_players"),
+        db.query(func.count(func.distinct(recent_sessions.c.user_id))
+                 .filter(recent_sessions.c.started_at >= now - timedelta(days=1)))
+            .scalar_subquery().label("active_24h"),
+        db.query(func.count(func.distinct(recent_sessions.c.user_id)))
+            .scalar_subquery().label("active_30d"),
+    ).one()
+
     # 1. NGR (Total Bets - Total Payouts)
-    ngr_query = db.query(
-        func.sum(Bet.bet_amount - Bet.payout_amount)
-    ).select_from(Bet).join(GameRound).join(GameSession).join(User).filter(
-        User.tenant_id == tid,
-        Bet.bet_status != BetStatus.cancelled
-    ).scalar() or 0
+    ngr_query = kpis.ngr or 0
 
     # 2. Player Lifetime Spent Value (LTV)
     # Total wagered by all players in tenant / number of players
-    total_wagered = db.query(func.sum(Bet.bet_amount))\
-        .select_from(Bet).join(GameRound).join(GameSession).join(User)\
-        .filter(User.tenant_id == tid).scalar() or 0
-    
-    total_players = db.query(func.count(User.user_id))\
-        .filter(User.tenant_id == tid, User.role == "player").scalar() or 1
-    
-    avg_ltv = total_wagered / total_players
-
-    # 3. Active Users Helper
-    def get_active_count(days: int):
-        start_date = now - timedelta(days=days)
-        return db.query(func.count(func.distinct(GameSession.user_id)))\
-            .join(User).filter(
-                User.tenant_id == tid,
-                GameSession.started_at >= start_date
-            ).scalar() or 0
-
-    # 4. Top 5 Users Weekly
-    top_users = db.query(
-        User.email,
-        func.sum(Bet.bet_amount).label("total_wagered")
-    ).select_from(User).join(GameSession).join(GameRound).join(Bet)\
-     .filter(User.tenant_id == tid, GameSession.started_at >= seven_days_ago)\
-     .group_by(User.email)\
-     .order_by(desc("total_wagered"))\
-     .limit(5).all()
-    
-    # 4.1 Get User Name for the top 5 users
-    def get_user_name(email:str):
-        user = db.query(User).filter(User.email == email).first()
-        return user.first_name
+    avg_ltv = (kpis.total_wagered or 0) / (kpis.total_players or 1)
+
+    # 4. Top 5 Users Weekly (names joined in, not looked up per row)
+    top_users = AnalyticsService.top_players(db, tid, seven_days_ago.date(), limit=5)
     
     # 5. Game Popularity
     popularity = db.query(
         Game.game_name,
-        func.count(GameSession.session_id).label("play_count")
-    ).select_from(Game).join(GameSession).join(User)\
-     .filter(User.tenant_id == tid)\
+        func.sum(rollup.c.sessions).label("play_count")
+    ).select_from(rollup).join(Game, Game.game_id == rollup.c.game_id)\
      .group_by(Game.game_name)\
      .order_by(desc("play_count")).all()
 
     # 6. Revenue Per Day
-    daily_rev_results = db.query(
-        cast(GameSession.started_at, Date).label("date"),
-        func.sum(Bet.bet_amount - Bet.payout_amount).label("revenue")
-    ).select_from(GameSession).join(GameRound).join(Bet).join(User)\
-     .filter(User.tenant_id == tid, GameSession.started_at >= seven_days_ago.date())\
-     .group_by(cast(GameSession.started_at, Date))\
-     .order_by("date").all()
+    daily_rev_results = AnalyticsService.daily_revenue(db, tid, seven_days_ago.date())
 
     return {
         "ngr": ngr_query,
         "avg_ltv": avg_ltv,
-        "active_users_24h": get_active_count(1),
-        "active_users_30d": get_active_count(30),
-        "top_5_users_weekly": [{"email": u[0], "name":get_user_name(u[0]), "total_wagered": u[1]} for u in top_users],
+        "active_users_24h": kpis.active_24h or 0,
+        "active_users_30d": kpis.active_30d or 0,
+        "top_5_users_weekly": [{"email": u.email, "name": u.first_name, "total_wagered": u.total_wagered} for u in top_users],
         "game_popularity": [{"game_name": g[0], "play_count": g[1]} for g in popularity],
         "revenue_7d": [{"date": str(r[0]), "revenue": r[1]} for r in daily_rev_results]
     }
@@ -97,18 +82,19 @@ async def get_tenant_profile(
 
 @router.get("/owner-profile", response_model=OwnerDashboardResponse)
 async def get_owner_profile(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     owner: User = Depends(require_casino_owner)
 ):
     now = datetime.now(timezone.utc)
     yesterday = now - timedelta(days=1)
 
+    # Lifetime totals per tenant and game (rollups: closed days + today's hours)
+    rollup = AnalyticsService.totals(date.min)
+
     # 1. Global KPIs (Aggregation across the whole system)
     global_stats = db.query(
-        func.sum(Bet.bet_amount).label("turnover"),
-        func.sum(Bet.bet_amount - Bet.payout_amount).label("net_revenue")
-    ).select_from(Bet).join(GameRound).join(GameSession).filter(
-        Bet.bet_status != BetStatus.cancelled
+        func.sum(rollup.c.wagered).label("turnover"),
+        func.sum(rollup.c.wagered - rollup.c.payout).label("net_revenue")
     ).first()
 
     # 2. Tenant Counts
@@ -123,26 +109,34 @@ async def get_owner_profile(
         .filter(Wallet.type_of_wallet == WalletType.cash).scalar() or 0
 
     # 5. Tenant Leaderboard (Ranked by Turnover) - Including ALL tenants
+    tenant_money = db.query(
+        rollup.c.tenant_id,
+        func.sum(rollup.c.wagered).label("turnover"),
+        func.sum(rollup.c.wagered - rollup.c.payout).label("revenue")
+    ).group_by(rollup.c.tenant_id).subquery()
+
+    tenant_users = db.query(
+        User.tenant_id,
+        func.count(User.user_id).label("user_count")
+    ).group_by(User.tenant_id).subquery()
+
     leaderboard_query = db.query(
         Tenant.tenant_name,
-        func.count(func.distinct(User.user_id)).label("user_count"),
-        func.coalesce(func.sum(Bet.bet_amount), 0).label("turnover"),
-        func.coalesce(func.sum(Bet.bet_amount - Bet.payout_amount), 0).label("revenue")
+        func.coalesce(tenant_users.c.user_count, 0).label("user_count"),
+        func.coalesce(tenant_money.c.turnover, 0).label("turnover"),
+        func.coalesce(tenant_money.c.revenue, 0).label("revenue")
     ).select_from(Tenant)\
-     .outerjoin(User)\
-     .outerjoin(GameSession)\
-     .outerjoin(GameRound)\
-     .outerjoin(Bet)\
-     .group_by(Tenant.tenant_name)\
+     .outerjoin(tenant_users, tenant_users.c.tenant_id == Tenant.tenant_id)\
+     .outerjoin(tenant_money, tenant_money.c.tenant_id == Tenant.tenant_id)\
      .order_by(desc("turnover"))\
      .all()
 
     # 6. Global Top Games (Ranked by Revenue)
     top_games = db.query(
         Game.game_name,
-        func.sum(Bet.bet_amount - Bet.payout_amount).label("revenue"),
-        func.count(GameSession.session_id).label("plays")
-    ).select_from(Game).join(GameSession).join(GameRound).join(Bet)\
+        func.sum(rollup.c.wagered - rollup.c.payout).label("revenue"),
+        func.sum(rollup.c.sessions).label("plays")
+    ).select_from(rollup).join(Game, Game.game_id == rollup.c.game_id)\
      .group_by(Game.game_name)\
      .order_by(desc("revenue")).limit(5).all()
 
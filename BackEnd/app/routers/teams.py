@@ -11,6 +11,7 @@ from ..database import get_db
 from ..models.team import FantasyTeam, TeamPlayer, TeamStatus
 from ..models.player import Player
 from ..models.match import Match
+from ..redis_client import CacheManager
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/teams", tags=["Fantasy Teams"])
@@ -108,6 +109,8 @@ def create_fantasy_team(
         db.add(team_player)
     
     db.commit()
+    # The cached match list carries prize_pool
+    CacheManager.invalidate_match_list()
     db.refresh(team)
     
     return TeamResponse(
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from typing import List
+from sqlalchemy import func, desc, tuple_
+from typing import List, Optional
+from datetime import datetime
 from decimal import Decimal
+import base64
 from ..database import get_db
 from ..models.user import User
 from ..models.game import GameSession, GameRound, Bet, Game, BetStatus
 from ..models.wallet import Wallet, WalletType
 from ..models.tenant import Tenant
-from ..schemas.user import ChangePasswordRequest, FullUserProfile, GameHistoryItem, ActiveSessionItem
-from ..utils.dependencies import get_current_active_user
-from ..utils.security import verify_password, get_password_hash
+from ..schemas.user import ChangePasswordRequest, FullUserProfile, GameHistoryItem, GameHistoryPage, ActiveSessionItem
+from ..utils.dependencies import get_current_active_user, get_read_db
+from ..utils.security import verify_password_async, get_password_hash_async
 
 router = APIRouter(prefix="/user", tags=["User Profile"])
 
@@ -22,18 +24,15 @@ async def get_user_profile(
     """Get detailed user profile with stats filtered by the ACTIVE Tenant"""
     
     # 1. Calculate Stats specifically for the current Tenant
-    # We join Bet -> Wallet to ensure we only count money spent in the current casino
+    # Bet carries user/tenant, so only money spent in the current casino is counted without joins.
+    # Every game opens one round per session, so distinct rounds == games played.
     stats_query = db.query(
         func.sum(Bet.bet_amount).label("total_bet"),
         func.sum(Bet.payout_amount).label("total_payout"),
-        func.count(func.distinct(GameSession.session_id)).label("total_games")
-    ).select_from(Bet)\
-     .join(Wallet, Bet.wallet_id == Wallet.wallet_id)\
-     .join(GameRound, Bet.round_id == GameRound.round_id)\
-     .join(GameSession, GameRound.session_id == GameSession.session_id)\
-     .filter(
-         Wallet.user_id == current_user.user_id,
-         Wallet.tenant_id == current_user.tenant_id, # Filter by active Casino
+        func.count(func.distinct(Bet.round_id)).label("total_games")
+    ).filter(
+         Bet.user_id == current_user.user_id,
+         Bet.tenant_id == current_user.tenant_id, # Filter by active Casino
          Bet.bet_status != BetStatus.cancelled
      )
     
@@ -62,53 +61,101 @@ async def get_user_profile(
         "region_name": current_user.region.region_name if current_user.region else None
     }
 
-@router.get("/history", response_model=List[GameHistoryItem])
-async def get_game_history(
-    limit: int = 50,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get finished game sessions for the current active Tenant"""
-    
-    # We join with the Wallet table to filter history by the active casino
-    sessions = db.query(GameSession)\
-        .join(GameRound)\
-        .join(Bet)\
-        .join(Wallet)\
-        .filter(
-            GameSession.user_id == current_user.user_id,
-            Wallet.tenant_id == current_user.tenant_id, # Only show history for this casino
-            GameSession.ended_at.isnot(None)
-        )\
-        .order_by(desc(GameSession.started_at))\
-        .distinct()\
-        .limit(limit).all()
-    
+HISTORY_MAX_PAGE = 200
+
+def _encode_cursor(started_at: datetime, session_id: int) -> str:
+    raw = f"{started_at.isoformat()}|{session_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        started_at, session_id = raw.split("|")
+        return datetime.fromisoformat(started_at), int(session_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _history_page(db: Session, current_user: User, limit: int, cursor: Optional[str]) -> dict:
+    """
+    One page of finished sessions with their totals, newest first.
+
+    A single grouped query: sessions are paged by (started_at, session_id) so page N costs the same
+    as page 1 (idx_game_session_user_started), and the bet joins carry started_at, so only the
+    partitions covering the page are touched.
+    """
+    limit = max(1, min(limit, HISTORY_MAX_PAGE))
+
+    query = db.query(
+        GameSession.session_id,
+        GameSession.started_at,
+        GameSession.ended_at,
+        Game.game_name,
+        func.sum(Bet.bet_amount).label("total_bet"),
+        func.sum(Bet.payout_amount).label("total_payout")
+    ).join(Game, Game.game_id == GameSession.game_id)\
+     .join(GameRound)\
+     .join(Bet)\
+     .filter(
+        GameSession.user_id == current_user.user_id,
+        Bet.tenant_id == current_user.tenant_id, # Only show history for this casino
+        GameSession.ended_at.isnot(None)
+    )
+
+    if cursor:
+        cursor_started_at, cursor_session_id = _decode_cursor(cursor)
+        query = query.filter(
+            tuple_(GameSession.started_at, GameSession.session_id) < (cursor_started_at, cursor_session_id)
+        )
+
+    # Fetch one extra row to know whether an older page exists
+    rows = query.group_by(
+        GameSession.session_id, GameSession.started_at, GameSession.ended_at, Game.game_name
+    ).order_by(desc(GameSession.started_at), desc(GameSession.session_id))\
+     .limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
     history = []
-    for session in sessions:
-        # Calculate totals for this specific session
-        bets = db.query(
-            func.sum(Bet.bet_amount).label("total_bet"),
-            func.sum(Bet.payout_amount).label("total_payout")
-        ).join(GameRound).filter(GameRound.session_id == session.session_id).first()
-        
-        b_amt = bets.total_bet or Decimal("0")
-        p_amt = bets.total_payout or Decimal("0")
-        
+    for row in rows:
+        b_amt = row.total_bet or Decimal("0")
+        p_amt = row.total_payout or Decimal("0")
+
         status = "won" if p_amt > b_amt else "lost"
         if p_amt == b_amt: status = "draw"
 
         history.append({
-            "session_id": session.session_id,
-            "game_name": session.game.game_name,
-            "started_at": session.started_at,
-            "ended_at": session.ended_at,
+            "session_id": row.session_id,
+            "game_name": row.game_name,
+            "started_at": row.started_at,
+            "ended_at": row.ended_at,
             "total_bet": b_amt,
             "total_payout": p_amt,
             "status": status
         })
-        
-    return history
+
+    next_cursor = _encode_cursor(rows[-1].started_at, rows[-1].session_id) if has_more else None
+    return {"items": history, "next_cursor": next_cursor}
+
+@router.get("/history", response_model=List[GameHistoryItem])
+async def get_game_history(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get finished game sessions for the current active Tenant (use /history/page for the next cursor)"""
+    return _history_page(db, current_user, limit, cursor)["items"]
+
+@router.get("/history/page", response_model=GameHistoryPage)
+async def get_game_history_page(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Keyset-paginated history: pass next_cursor back as ?cursor= to fetch older sessions"""
+    return _history_page(db, current_user, limit, cursor)
 
 @router.get("/active-sessions", response_model=List[ActiveSessionItem])
 async def get_active_sessions(
@@ -117,15 +164,14 @@ async def get_active_sessions(
 ):
     """Get unfinished game sessions for the current active Tenant"""
     
-    # Join with Bet and Wallet to ensure user can only resume games 
+    # Join with Bet to ensure user can only resume games 
     # belonging to the casino they are currently logged into
     sessions = db.query(GameSession)\
         .join(GameRound)\
         .join(Bet)\
-        .join(Wallet)\
         .filter(
             GameSession.user_id == current_user.user_id,
-            Wallet.tenant_id == current_user.tenant_id,
+            Bet.tenant_id == current_user.tenant_id,
             GameSession.ended_at.is_(None)
         )\
         .order_by(desc(GameSession.started_at))\
@@ -149,11 +195,11 @@ async def change_password(
     db: Session = Depends(get_db)
 ):
     # 1. Verify current password
-    if not verify_password(data.current_password, current_user.password):
+    if not await verify_password_async(data.current_password, current_user.password):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # 2. Hash and update
-    current_user.password = get_password_hash(data.new_password)
+    current_user.password = await get_password_hash_async(data.new_password)
     db.commit()
     
     return {"message": "Password updated successfully"}
\ No newline at end of file
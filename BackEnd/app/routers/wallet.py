@@ -4,10 +4,11 @@ from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
 from ..models.user import User
-from ..models.wallet import WalletType
+from ..models.wallet import WalletType, LedgerEntryType
 from ..schemas.wallet import WalletResponse, WalletDeposit, WalletWithdraw
 from ..utils.dependencies import get_current_active_user
 from ..services.wallet_service import wallet_service
+from ..services.ledger_service import ledger_service
 from ..config import settings
 from ..services.stripe_service import stripe_service
 import stripe
@@ -21,7 +22,7 @@ async def get_user_wallets(
 ):
     """Get all wallets for the current user"""
     wallets = wallet_service.get_all_wallets(db, current_user.user_id, current_user.tenant_id)
-    return wallets
+    return wallet_service.wallet_views(db, wallets)
 
 @router.get("/{wallet_type}", response_model=WalletResponse)
 async def get_wallet_by_type(
@@ -36,7 +37,7 @@ async def get_wallet_by_type(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"{wallet_type.value} wallet not found"
         )
-    return wallet
+    return wallet_service.wallet_views(db, [wallet])[0]
 
 # @router.post("/deposit", response_model=WalletResponse)
 # async def deposit_to_wallet(
@@ -161,7 +162,7 @@ async def withdraw_funds(
     
     # 1.1 Get Wallet
     wallet = wallet_service.get_wallet(db, current_user.user_id, current_user.tenant_id, WalletType.cash)
-    if not wallet or wallet.balance < withdraw_data.amount:
+    if not wallet or ledger_service.available_balance(db, wallet) < withdraw_data.amount:
         raise HTTPException(status_code=400, detail="Insufficient funds")
     
     # 1.2 Fetch tax rate from the user's region
@@ -188,7 +189,7 @@ async def withdraw_funds(
         
         return {
             "wallet_id": wallet.wallet_id,
-            "balance": wallet.balance, # Updated balance
+            "balance": ledger_service.available_balance(db, wallet), # Updated balance
             "message": "Withdrawal processed successfully",
             "status": "success",
             "tax_withheld": tax_to_deduct,
@@ -196,7 +197,7 @@ async def withdraw_funds(
         }
     except Exception as e:
         # Rollback money if Stripe fails
-        wallet_service.credit_wallet(db, wallet.wallet_id, withdraw_data.amount)
+        wallet_service.credit_wallet(db, wallet.wallet_id, withdraw_data.amount, reference_type=LedgerEntryType.refund)
         raise HTTPException(status_code=500, detail=f"Payout failed: {str(e)}")
 
 
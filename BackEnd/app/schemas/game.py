@@ -73,4 +73,11 @@ class PlayerGameResponse(BaseModel):
     game_id: int
     game_name: str
     provider_name: str
-    rtp_percent: float
\ No newline at end of file
+    rtp_percent: float
+class AutoplayStopRules(BaseModel):
+    """Autoplay stops after the first round that meets any of these (all optional)"""
+    on_any_win: bool = False
+    single_win_above: Optional[Decimal] = None   # one round pays at least this much
+    loss_limit: Optional[Decimal] = None         # cumulative net loss reaches this
+    profit_target: Optional[Decimal] = None      # cumulative net profit reaches this
+    balance_below: Optional[Decimal] = None      # running cash balance drops below this
@@ -77,6 +77,10 @@ class GameHistoryItem(BaseModel):
     total_payout: Decimal
     status: str # "won", "lost", "ongoing"
 
+class GameHistoryPage(BaseModel):
+    items: list[GameHistoryItem]
+    next_cursor: Optional[str] = None # pass back as ?cursor= for the next (older) page
+
 class ActiveSessionItem(BaseModel):
     session_id: int
     game_name: str
@@ -0,0 +1,276 @@
+from sqlalchemy import text, func, desc, select, union_all
+from sqlalchemy.orm import Session
+from datetime import datetime, date, timedelta, timezone
+from typing import Iterable, List
+import logging
+
+from ..config import settings
+from ..models.analytics import AnalyticsHourly, AnalyticsDaily, AnalyticsUserDaily
+from ..models.user import User
+from ..redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Hours whose rollups must be rebuilt even though they are outside the sweep window
+# (e.g. fantasy bets settled days after the session started). Members are ISO hour starts.
+DIRTY_HOURS_KEY = "analytics:dirty_hours"
+
+# All statements run with `SET LOCAL timezone = 'UTC'`, so date_trunc/::date bucket in UTC.
+# A bet belongs to its own tenant_id/game_id (copied from the wallet/session at insert time)
+# and to the hour its session started (bet.started_at, also the partition key).
+
+REFRESH_HOURLY_SQL = text("""
+    INSERT INTO analytics_hourly
+        (tenant_id, game_id, bucket_start, total_wagered, total_payout, bet_count, session_count, updated_at)
+    SELECT b.tenant_id,
+           b.game_id,
+           date_trunc('hour', b.started_at),
+           COALESCE(SUM(b.bet_amount), 0),
+           COALESCE(SUM(b.payout_amount), 0),
+           COUNT(b.bet_id),
+           COUNT(DISTINCT gr.session_id),
+           :refreshed_at
+    FROM bet b
+    JOIN game_round gr ON gr.round_id = b.round_id AND gr.started_at = b.started_at
+    WHERE b.started_at >= :start AND b.started_at < :end
+      AND gr.started_at >= :start AND gr.started_at < :end
+      AND b.bet_status != 'cancelled'
+    GROUP BY b.tenant_id, b.game_id, date_trunc('hour', b.started_at)
+    ON CONFLICT (tenant_id, game_id, bucket_start) DO UPDATE SET
+        total_wagered = EXCLUDED.total_wagered,
+        total_payout = EXCLUDED.total_payout,
+        bet_count = EXCLUDED.bet_count,
+        session_count = EXCLUDED.session_count,
+        updated_at = EXCLUDED.updated_at
+""")
+
+# Buckets in the range that the refresh did not touch no longer have any bets behind them
+PRUNE_HOURLY_SQL = text("""
+    DELETE FROM analytics_hourly
+    WHERE bucket_start >= :start AND bucket_start < :end AND updated_at < :refreshed_at
+""")
+
+# Only players who played inside the window get their day rows recomputed
+REFRESH_USER_DAILY_SQL = text("""
+    INSERT INTO analytics_user_daily (tenant_id, user_id, day, total_wagered, total_payout, updated_at)
+    SELECT b.tenant_id,
+           b.user_id,
+           b.started_at::date,
+           COALESCE(SUM(b.bet_amount), 0),
+           COALESCE(SUM(b.payout_amount), 0),
+           :refreshed_at
+    FROM bet b
+    WHERE b.started_at >= date_trunc('day', CAST(:start AS timestamptz))
+      AND b.started_at < date_trunc('day', CAST(:end AS timestamptz)) + INTERVAL '1 day'
+      AND b.user_id IN (
+          SELECT DISTINCT user_id FROM bet
+          WHERE started_at >= :start AND started_at < :end
+      )
+      AND b.bet_status != 'cancelled'
+    GROUP BY b.tenant_id, b.user_id, b.started_at::date
+    ON CONFLICT (tenant_id, user_id, day) DO UPDATE SET
+        total_wagered = EXCLUDED.total_wagered,
+        total_payout = EXCLUDED.total_payout,
+        updated_at = EXCLUDED.updated_at
+""")
+
+FOLD_DAILY_SQL = text("""
+    INSERT INTO analytics_daily
+        (tenant_id, game_id, day, total_wagered, total_payout, bet_count, session_count, updated_at)
+    SELECT tenant_id, game_id, bucket_start::date,
+           SUM(total_wagered), SUM(total_payout), SUM(bet_count), SUM(session_count), :refreshed_at
+    FROM analytics_hourly
+    WHERE bucket_start >= :day AND bucket_start < CAST(:day AS date) + INTERVAL '1 day'
+    GROUP BY tenant_id, game_id, bucket_start::date
+    ON CONFLICT (tenant_id, game_id, day) DO UPDATE SET
+        total_wagered = EXCLUDED.total_wagered,
+        total_payout = EXCLUDED.total_payout,
+        bet_count = EXCLUDED.bet_count,
+        session_count = EXCLUDED.session_count,
+        updated_at = EXCLUDED.updated_at
+""")
+
+PRUNE_DAILY_SQL = text("""
+    DELETE FROM analytics_daily WHERE day = :day AND updated_at < :refreshed_at
+""")
+
+
+def _hour_floor(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+class AnalyticsService:
+    """
+    Incrementally maintained dashboard rollups.
+
+    analytics_hourly holds every hour, analytics_daily holds closed days only.
+    Dashboards read closed days from analytics_daily and today from analytics_hourly.
+    """
+
+    # --- Maintenance ---
+
+    @staticmethod
+    def refresh(db: Session, start: datetime, end: datetime) -> dict:
+        """Rebuild the hourly and per-player rollups for [start, end) and fold any closed days it touches"""
+        start, end = _hour_floor(start), _hour_floor(end - timedelta(microseconds=1)) + timedelta(hours=1)
+        refreshed_at = datetime.now(timezone.utc)
+        params = {"start": start, "end": end, "refreshed_at": refreshed_at}
+
+        db.execute(text("SET LOCAL timezone = 'UTC'"))
+        hourly_rows = db.execute(REFRESH_HOURLY_SQL, params).rowcount
+        db.execute(PRUNE_HOURLY_SQL, params)
+        user_rows = db.execute(REFRESH_USER_DAILY_SQL, params).rowcount
+
+        today = refreshed_at.date()
+        closed_days = [d for d in AnalyticsService._days(start, end) if d < today]
+        for day in closed_days:
+            db.execute(FOLD_DAILY_SQL, {"day": day, "refreshed_at": refreshed_at})
+            db.execute(PRUNE_DAILY_SQL, {"day": day, "refreshed_at": refreshed_at})
+
+        db.commit()
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "hourly_rows": hourly_rows,
+            "user_daily_rows": user_rows,
+            "days_folded": [d.isoformat() for d in closed_days],
+        }
+
+    @staticmethod
+    def _days(start: datetime, end: datetime) -> List[date]:
+        day, last = start.date(), (end - timedelta(microseconds=1)).date()
+        days = []
+        while day <= last:
+            days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    @staticmethod
+    def sweep(db: Session) -> dict:
+        """Periodic refresh: the trailing window (in-flight sessions settle here) plus any hours marked dirty"""
+        now = datetime.now(timezone.utc)
+        result = AnalyticsService.refresh(db, now - timedelta(hours=settings.ANALYTICS_SWEEP_HOURS), now)
+
+        for hour in AnalyticsService.pop_dirty_hours():
+            try:
+                AnalyticsService.refresh(db, hour, hour + timedelta(hours=1))
+            except Exception as e:
+                logger.error(f"Analytics refresh failed for {hour.isoformat()}: {e}")
+                db.rollback()
+                AnalyticsService.mark_dirty([hour])
+        return result
+
+    @staticmethod
+    def backfill(db: Session, days: int) -> List[dict]:
+        """Build rollups for the last `days` days, one day per transaction"""
+        today_start = AnalyticsService._today_start()
+        results = []
+        for offset in range(days, -1, -1):
+            day_start = today_start - timedelta(days=offset)
+            results.append(AnalyticsService.refresh(db, day_start, day_start + timedelta(days=1)))
+        return results
+
+    @staticmethod
+    def mark_dirty(started_at: Iterable[datetime]):
+        """Queue the hours of sessions whose bets settled after the sweep window moved past them"""
+        if redis_client is None:
+            return
+        hours = {_hour_floor(moment).isoformat() for moment in started_at if moment is not None}
+        if not hours:
+            return
+        try:
+            redis_client.sadd(DIRTY_HOURS_KEY, *hours)
+        except Exception as e:
+            logger.error(f"Could not mark analytics hours dirty: {e}")
+
+    @staticmethod
+    def pop_dirty_hours(batch: int = 500) -> List[datetime]:
+        if redis_client is None:
+            return []
+        try:
+            members = redis_client.spop(DIRTY_HOURS_KEY, batch) or []
+        except Exception as e:
+            logger.error(f"Could not read dirty analytics hours: {e}")
+            return []
+        return sorted(datetime.fromisoformat(m.decode() if isinstance(m, bytes) else m) for m in members)
+
+    # --- Dashboard reads ---
+
+    @staticmethod
+    def _today_start() -> datetime:
+        return datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def totals(since: date, tenant_id: int = None):
+        """
+        Subquery of (tenant_id, game_id, wagered, payout, bets, sessions) rows from `since` through now:
+        analytics_daily for closed days, analytics_hourly for today. Aggregate it with func.sum.
+        """
+        today_start = AnalyticsService._today_start()
+        daily = select(
+            AnalyticsDaily.tenant_id.label("tenant_id"),
+            AnalyticsDaily.game_id.label("game_id"),
+            AnalyticsDaily.total_wagered.label("wagered"),
+            AnalyticsDaily.total_payout.label("payout"),
+            AnalyticsDaily.bet_count.label("bets"),
+            AnalyticsDaily.session_count.label("sessions"),
+        ).where(AnalyticsDaily.day >= since, AnalyticsDaily.day < today_start.date())
+        hourly = select(
+            AnalyticsHourly.tenant_id,
+            AnalyticsHourly.game_id,
+            AnalyticsHourly.total_wagered,
+            AnalyticsHourly.total_payout,
+            AnalyticsHourly.bet_count,
+            AnalyticsHourly.session_count,
+        ).where(AnalyticsHourly.bucket_start >= max(
+            today_start, datetime.combine(since, datetime.min.time(), timezone.utc)
+        ))
+        if tenant_id is not None:
+            daily = daily.where(AnalyticsDaily.tenant_id == tenant_id)
+            hourly = hourly.where(AnalyticsHourly.tenant_id == tenant_id)
+        return union_all(daily, hourly).subquery("rollup")
+
+    @staticmethod
+    def daily_revenue(db: Session, tenant_id: int, since: date):
+        """[(day, revenue)] for closed days from analytics_daily plus today from analytics_hourly"""
+        today_start = AnalyticsService._today_start()
+        closed = db.query(
+            AnalyticsDaily.day,
+            func.sum(AnalyticsDaily.total_wagered - AnalyticsDaily.total_payout)
+        ).filter(
+            AnalyticsDaily.tenant_id == tenant_id,
+            AnalyticsDaily.day >= since,
+            AnalyticsDaily.day < today_start.date()
+        ).group_by(AnalyticsDaily.day).order_by(AnalyticsDaily.day).all()
+
+        today_revenue = db.query(
+            func.sum(AnalyticsHourly.total_wagered - AnalyticsHourly.total_payout)
+        ).filter(
+            AnalyticsHourly.tenant_id == tenant_id,
+            AnalyticsHourly.bucket_start >= today_start
+        ).scalar()
+
+        rows = [(day, revenue) for day, revenue in closed]
+        if today_revenue is not None:
+            rows.append((today_start.date(), today_revenue))
+        return rows
+
+    @staticmethod
+    def top_players(db: Session, tenant_id: int, since: date, limit: int = 5):
+        """[(email, first_name, total_wagered)] for the tenant's biggest players since `since`"""
+        wagered = db.query(
+            AnalyticsUserDaily.user_id,
+            func.sum(AnalyticsUserDaily.total_wagered).label("total_wagered")
+        ).filter(
+            AnalyticsUserDaily.tenant_id == tenant_id,
+            AnalyticsUserDaily.day >= since
+        ).group_by(AnalyticsUserDaily.user_id)\
+         .order_by(desc("total_wagered"))\
+         .limit(limit).subquery()
+
+        return db.query(User.email, User.first_name, wagered.c.total_wagered)\
+            .join(wagered, wagered.c.user_id == User.user_id)\
+            .order_by(desc(wagered.c.total_wagered)).all()
+
+
+analytics_service = AnalyticsService()
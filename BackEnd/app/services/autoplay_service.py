@@ -0,0 +1,188 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, insert, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.game import Game, GameSession, GameRound, Bet, BetStatus
+from ..models.wallet import WalletType, LedgerEntryType
+from ..schemas.game import AutoplayStopRules
+from ..utils.dependencies import Principal
+from .jackpot_service import jackpot_service, NO_WIN
+from .ledger_service import LedgerService
+from .wallet_service import WalletService, wallet_service
+
+
+class AutoplayService:
+    """
+    Settles a run of pre-played rounds (slots, dice) in one wallet transaction:
+    one limit check and one debit for the stake of the rounds actually played, bulk inserts
+    for their rounds and bets, and a payout ledger entry per winning bet, committed together.
+    The jackpot runs after the commit, once per round, as it would for rounds played one by one.
+    Rounds are played by the router before anything is charged, so the stop rules can be applied
+    to the outcomes first. Every stake is paid from the cash balance at the start: winnings are
+    credited at the end.
+    """
+
+    @staticmethod
+    def apply_stop_rules(
+        stake: Decimal,
+        payouts: List[Decimal],
+        start_balance: Decimal,
+        rules: AutoplayStopRules
+    ) -> Tuple[int, Optional[str]]:
+        """How many rounds are played, and why autoplay stopped early (None if it did not)"""
+        balance = start_balance
+        staked = Decimal("0")
+        net = Decimal("0")
+        for played, payout in enumerate(payouts, start=1):
+            if staked + stake > start_balance:
+                return played - 1, "insufficient_balance"
+            staked += stake
+            net += payout - stake
+            balance += payout - stake
+
+            if rules.on_any_win and payout > 0:
+                return played, "win"
+            if rules.single_win_above is not None and payout >= rules.single_win_above:
+                return played, "single_win_above"
+            if rules.loss_limit is not None and -net >= rules.loss_limit:
+                return played, "loss_limit"
+            if rules.profit_target is not None and net >= rules.profit_target:
+                return played, "profit_target"
+            if rules.balance_below is not None and balance < rules.balance_below:
+                return played, "balance_below"
+        return len(payouts), None
+
+    @staticmethod
+    async def settle_async(
+        db: AsyncSession,
+        principal: Principal,
+        game: Game,
+        stake: Decimal,
+        gross_payouts: List[Decimal],
+        outcomes: List[Dict],
+        rules: AutoplayStopRules
+    ) -> Dict:
+        # Same RTP adjustment credit_winnings applies to a single round
+        rtp_multiplier = (game.rtp_percent / Decimal("100")) if game.rtp_percent else Decimal("1")
+        payouts = [(gross * rtp_multiplier).quantize(Decimal("0.01")) for gross in gross_payouts]
+
+        wallets = (await db.execute(WalletService._bet_wallets_stmt(principal.user_id, principal.tenant_id, lock=True))).scalars().all()
+        cash_wallet = next((w for w in wallets if w.type_of_wallet == WalletType.cash), None)
+        if not cash_wallet:
+            raise HTTPException(status_code=404, detail="Cash wallet for this casino not found")
+        if await LedgerService.project_async(db, [cash_wallet.wallet_id]):
+            await db.refresh(cash_wallet)
+
+        played, stop_reason = AutoplayService.apply_stop_rules(stake, payouts, cash_wallet.balance, rules)
+        if played == 0:
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+        payouts, outcomes = payouts[:played], outcomes[:played]
+        total_bet = stake * played
+        total_payout = sum(payouts, Decimal("0"))
+
+        # One limit check and one debit (with the hybrid split) for every round played, committed
+        # below together with the rounds, bets and payouts
+        txn_details = await wallet_service.process_game_bet_async(
+            db, principal.user_id, principal.tenant_id, total_bet, commit=False
+        )
+
+        session = GameSession(user_id=principal.user_id, game_id=game.game_id, ended_at=datetime.now(timezone.utc))
+        db.add(session)
+        await db.flush()
+
+        round_ids = (await db.execute(
+            insert(GameRound).returning(GameRound.round_id, sort_by_parameter_order=True),
+            [
+                {"session_id": session.session_id, "started_at": session.started_at, "round_number": i, "outcome": outcome}
+                for i, outcome in enumerate(outcomes, start=1)
+            ]
+        )).scalars().all()
+
+        bet_ids = (await db.execute(
+            insert(Bet).returning(Bet.bet_id, sort_by_parameter_order=True),
+            [
+                {
+                    "round_id": round_id,
+                    "started_at": session.started_at,
+                    "user_id": principal.user_id,
+                    "tenant_id": principal.tenant_id,
+                    "game_id": game.game_id,
+                    "wallet_id": txn_details["primary_wallet_id"],
+                    "bet_amount": stake,
+                    "payout_amount": payout,
+                    "bet_status": BetStatus.won if payout > 0 else BetStatus.lost
+                }
+                for round_id, payout in zip(round_ids, payouts)
+            ]
+        )).scalars().all()
+
+        # Ledger appends only: the projector folds them into the cash balance
+        for bet_id, payout in zip(bet_ids, payouts):
+            if payout > 0:
+                LedgerService.credit(db, txn_details["primary_wallet_id"], payout, LedgerEntryType.payout, bet_id)
+        await db.commit()
+
+        # Jackpot per round on that round's cash share, not once on the summed stake
+        round_cash = txn_details["deducted_cash"] / played
+        jackpot_wins = await jackpot_service.process_spins_async(
+            db, principal.user_id, principal.tenant_id, [round_cash] * played
+        )
+
+        return {
+            "session_id": session.session_id,
+            "rounds_requested": len(gross_payouts),
+            "rounds_played": played,
+            "stop_reason": stop_reason,
+            "bet_amount": stake,
+            "total_bet": total_bet,
+            "total_payout": total_payout,
+            "net_result": total_payout - total_bet,
+            "wins": sum(1 for payout in payouts if payout > 0),
+            "biggest_win": max(payouts, default=Decimal("0")),
+            "rounds": [
+                {"round_number": i, "bet_id": bet_id, "payout": payout, **outcome}
+                for i, (bet_id, payout, outcome) in enumerate(zip(bet_ids, payouts, outcomes), start=1)
+            ],
+            "bet_breakdown": {
+                "cash": txn_details["deducted_cash"],
+                "bonus": txn_details["deducted_bonus"],
+                "points": txn_details["deducted_points"]
+            },
+            "jackpot_result": jackpot_wins[0][1] if jackpot_wins else dict(NO_WIN),
+            "jackpot_wins": [{"round_number": i + 1, **win} for i, win in jackpot_wins]
+        }
+
+    @staticmethod
+    async def session_rounds_async(db: AsyncSession, user_id: int, session_id: int, game_id: int) -> List[Dict]:
+        """Rounds of one of the player's autoplay sessions with their stored outcomes"""
+        rows = (await db.execute(
+            select(GameRound.round_number, GameRound.outcome, Bet.bet_id, Bet.bet_amount, Bet.payout_amount)
+            .join(GameSession, and_(
+                GameSession.session_id == GameRound.session_id,
+                GameSession.started_at == GameRound.started_at
+            ))
+            .join(Bet, and_(Bet.round_id == GameRound.round_id, Bet.started_at == GameRound.started_at))
+            .where(
+                GameSession.session_id == session_id,
+                GameSession.user_id == user_id,
+                GameSession.game_id == game_id
+            )
+            .order_by(GameRound.round_number)
+        )).all()
+        if not rows:
+            raise HTTPException(status_code=404, detail="Autoplay session not found")
+        return [
+            {
+                "round_number": row.round_number,
+                "bet_id": row.bet_id,
+                "bet_amount": row.bet_amount,
+                "payout": row.payout_amount,
+                **(row.outcome or {})
+            }
+            for row in rows
+        ]
+
+
+autoplay_service = AutoplayService()
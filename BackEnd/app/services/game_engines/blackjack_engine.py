@@ -1,115 +1,147 @@
 import random
-from typing import List, Tuple
+import struct
 from decimal import Decimal
 
-class Card:
-    def __init__(self, suit: str, rank: str):
-        self.suit = suit
-        self.rank = rank
-    
-    def value(self) -> int:
-        """Get card value for blackjack"""
-        if self.rank in ['J', 'Q', 'K']:
-            return 10
-        elif self.rank == 'A':
-            return 11  # Ace can be 1 or 11
-        else:
-            return int(self.rank)
-    
-    def __repr__(self):
-        return f"{self.rank}{self.suit}"
+# Cards are ints 0-51: rank index * 4 + suit index, into RANKS and SUITS below.
+# A shoe is a bytearray of those ints; hands are bytearrays too.
+SUITS = ['♠', '♥', '♦', '♣']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+ACE_RANK = RANKS.index('A')
+
+# Per-card lookup tables
+CARD_LABELS = tuple(f"{RANKS[c // 4]}{SUITS[c % 4]}" for c in range(52))
+# Aces count 1 here; a hand holding an ace is worth 10 more while that stays <= 21
+CARD_POINTS = bytes(1 if c // 4 == ACE_RANK else min(c // 4 + 2, 10) for c in range(52))
+IS_ACE = bytes(1 if c // 4 == ACE_RANK else 0 for c in range(52))
+
+RESULTS = [None, "blackjack", "win", "lose", "push", "bust"]
+
+# Serialized state: version, shoe seed, decks, cards drawn, game_over, result, hand lengths, then the cards
+STATE_VERSION = 1
+STATE_HEADER = struct.Struct("<BQBHBBBB")
+
+
+def card_value(card: int) -> int:
+    """Blackjack value of one card (aces 11)"""
+    return 11 if IS_ACE[card] else CARD_POINTS[card]
+
+
+def hand_value(hand) -> int:
+    """Best total of a hand: one ace counts 11 when that does not bust"""
+    total = 0
+    has_ace = 0
+    for card in hand:
+        total += CARD_POINTS[card]
+        has_ace |= IS_ACE[card]
+    return total + 10 if has_ace and total <= 11 else total
+
+
+def is_soft(hand) -> bool:
+    """True when an ace in the hand is counting 11"""
+    total = sum(CARD_POINTS[card] for card in hand)
+    return total <= 11 and any(IS_ACE[card] for card in hand)
+
 
 class BlackjackEngine:
     """Server-authoritative Blackjack engine"""
-    
-    SUITS = ['♠', '♥', '♦', '♣']
-    RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
-    
-    def __init__(self, seed: int = None):
+
+    SUITS = SUITS
+    RANKS = RANKS
+    # Unshuffled shoes by deck count; copying one is a single memcpy
+    _FRESH_SHOES = {}
+
+    def __init__(self, seed: int = None, num_decks: int = 6):
         if seed:
             random.seed(seed)
-        self.deck: List[Card] = []
-        self.player_hand: List[Card] = []
-        self.dealer_hand: List[Card] = []
+        self.num_decks = num_decks
+        self.shoe_seed = 0
+        self.drawn = 0
+        self._rng = None
+        self.deck = bytearray()
+        self.player_hand = bytearray()
+        self.dealer_hand = bytearray()
         self.game_over = False
         self.result = None
-    
-    def create_deck(self, num_decks: int = 6) -> List[Card]:
-        """Create a shuffled deck"""
-        deck = []
-        for _ in range(num_decks):
-            for suit in self.SUITS:
-                for rank in self.RANKS:
-                    deck.append(Card(suit, rank))
-        random.shuffle(deck)
-        return deck
-    
-    def calculate_hand_value(self, hand: List[Card]) -> int:
+
+    def create_deck(self, num_decks: int = 6) -> bytearray:
+        """An unshuffled shoe; cards are drawn from it at random (see draw)"""
+        shoe = self._FRESH_SHOES.get(num_decks)
+        if shoe is None:
+            shoe = self._FRESH_SHOES[num_decks] = bytes(range(52)) * num_decks
+        return bytearray(shoe)
+
+    def draw(self) -> int:
+        """
+        Deal one card: a step of Fisher-Yates on the undealt part of the shoe.
+        Same distribution as shuffling all cards up front, but the cost is per card dealt.
+        """
+        i = self._rng.randrange(len(self.deck))
+        self.deck[i], self.deck[-1] = self.deck[-1], self.deck[i]
+        self.drawn += 1
+        return self.deck.pop()
+
+    def calculate_hand_value(self, hand) -> int:
         """Calculate the value of a hand, handling aces"""
-        value = sum(card.value() for card in hand)
-        num_aces = sum(1 for card in hand if card.rank == 'A')
-        
-        # Adjust for aces
-        while value > 21 and num_aces > 0:
-            value -= 10
-            num_aces -= 1
-        
-        return value
-    
+        return hand_value(hand)
+
     def start_game(self) -> dict:
         """Start a new blackjack game"""
-        self.deck = self.create_deck()
-        self.player_hand = []
-        self.dealer_hand = []
+        # The shoe order follows from this seed, so the game can be restored from a few bytes
+        self.shoe_seed = random.getrandbits(64)
+        self._rng = random.Random(self.shoe_seed)
+        self.deck = self.create_deck(self.num_decks)
+        self.drawn = 0
+        self.player_hand = bytearray()
+        self.dealer_hand = bytearray()
         self.game_over = False
         self.result = None
-        
+
         # Deal initial cards
-        self.player_hand.append(self.deck.pop())
-        self.dealer_hand.append(self.deck.pop())
-        self.player_hand.append(self.deck.pop())
-        self.dealer_hand.append(self.deck.pop())
-        
-        player_value = self.calculate_hand_value(self.player_hand)
-        
+        self.player_hand.append(self.draw())
+        self.dealer_hand.append(self.draw())
+        self.player_hand.append(self.draw())
+        self.dealer_hand.append(self.draw())
+
+        player_value = hand_value(self.player_hand)
+
         # Check for natural blackjack
         if player_value == 21:
             self.game_over = True
-            dealer_value = self.calculate_hand_value(self.dealer_hand)
+            dealer_value = hand_value(self.dealer_hand)
             if dealer_value == 21:
                 self.result = "push"
             else:
                 self.result = "blackjack"
-        
+
         return self.get_game_state(hide_dealer_card=True)
-    
+
     def hit(self) -> dict:
         """Player hits"""
         if self.game_over:
             raise Exception("Game is already over")
-        
-        self.player_hand.append(self.deck.pop())
-        player_value = self.calculate_hand_value(self.player_hand)
-        
+
+        self.player_hand.append(self.draw())
+        player_value = hand_value(self.player_hand)
+
         if player_value > 21:
             self.game_over = True
             self.result = "bust"
-        
+
         return self.get_game_state(hide_dealer_card=not self.game_over)
-    
+
     def stand(self) -> dict:
         """Player stands, dealer plays"""
         if self.game_over:
             raise Exception("Game is already over")
-        
+
         # Dealer plays (hits until 17 or higher)
-        dealer_value = self.calculate_hand_value(self.dealer_hand)
+        dealer_value = hand_value(self.dealer_hand)
         while dealer_value < 17:
-            self.dealer_hand.append(self.deck.pop())
-            dealer_value = self.calculate_hand_value(self.dealer_hand)
-        
-        player_value = self.calculate_hand_value(self.player_hand)
-        
+            self.dealer_hand.append(self.draw())
+            dealer_value = hand_value(self.dealer_hand)
+
+        player_value = hand_value(self.player_hand)
+
         # Determine winner
         if dealer_value > 21:
             self.result = "win"
@@ -119,42 +151,42 @@ class BlackjackEngine:
             self.result = "lose"
         else:
             self.result = "push"
-        
+
         self.game_over = True
         return self.get_game_state(hide_dealer_card=False)
-    
+
     def double_down(self) -> dict:
         """Player doubles down"""
         if self.game_over or len(self.player_hand) != 2:
             raise Exception("Cannot double down")
-        
+
         # Hit once
-        self.player_hand.append(self.deck.pop())
-        player_value = self.calculate_hand_value(self.player_hand)
-        
+        self.player_hand.append(self.draw())
+        player_value = hand_value(self.player_hand)
+
         if player_value > 21:
             self.game_over = True
             self.result = "bust"
             return self.get_game_state(hide_dealer_card=False)
-        
+
         # Auto-stand
         return self.stand()
-    
+
     def get_game_state(self, hide_dealer_card: bool = False) -> dict:
         """Get current game state"""
-        dealer_hand_display = self.dealer_hand.copy()
+        dealer_hand_display = self.dealer_hand
         if hide_dealer_card and len(dealer_hand_display) > 1:
-            dealer_hand_display = [dealer_hand_display[0]]
-        
+            dealer_hand_display = dealer_hand_display[:1]
+
         return {
-            "player_hand": [str(card) for card in self.player_hand],
-            "player_value": self.calculate_hand_value(self.player_hand),
-            "dealer_hand": [str(card) for card in dealer_hand_display],
-            "dealer_value": self.calculate_hand_value(dealer_hand_display) if not hide_dealer_card else None,
+            "player_hand": [CARD_LABELS[card] for card in self.player_hand],
+            "player_value": hand_value(self.player_hand),
+            "dealer_hand": [CARD_LABELS[card] for card in dealer_hand_display],
+            "dealer_value": hand_value(dealer_hand_display) if not hide_dealer_card else None,
             "game_over": self.game_over,
             "result": self.result
         }
-    
+
     def calculate_payout(self, bet_amount: Decimal) -> Decimal:
         """Calculate payout based on result"""
         if self.result == "blackjack":
@@ -164,4 +196,32 @@ class BlackjackEngine:
         elif self.result == "push":
             return bet_amount  # Return original bet
         else:  # bust or lose
-            return Decimal("0")
\ No newline at end of file
+            return Decimal("0")
+
+    # ---------- Compact state (external session storage) ----------
+
+    def to_bytes(self) -> bytes:
+        """The whole game in ~20 bytes: the undealt shoe is rebuilt from its seed and the draw count"""
+        return STATE_HEADER.pack(
+            STATE_VERSION, self.shoe_seed, self.num_decks, self.drawn,
+            self.game_over, RESULTS.index(self.result), len(self.player_hand), len(self.dealer_hand)
+        ) + bytes(self.player_hand) + bytes(self.dealer_hand)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BlackjackEngine":
+        version, shoe_seed, num_decks, drawn, game_over, result, n_player, n_dealer = STATE_HEADER.unpack_from(data)
+        if version != STATE_VERSION:
+            raise ValueError(f"Unsupported blackjack state version {version}")
+        engine = cls(num_decks=num_decks)
+        engine.shoe_seed = shoe_seed
+        engine._rng = random.Random(shoe_seed)
+        engine.deck = engine.create_deck(num_decks)
+        # Replay the draws so the next card is the one the live game would have dealt
+        for _ in range(drawn):
+            engine.draw()
+        offset = STATE_HEADER.size
+        engine.player_hand = bytearray(data[offset:offset + n_player])
+        engine.dealer_hand = bytearray(data[offset + n_player:offset + n_player + n_dealer])
+        engine.game_over = bool(game_over)
+        engine.result = RESULTS[result]
+        return engine
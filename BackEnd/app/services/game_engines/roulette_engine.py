@@ -1,7 +1,51 @@
 import random
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from decimal import Decimal
 
+
+def _mask(numbers) -> int:
+    """Bit n set for every winning number n"""
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def _is_int(value) -> bool:
+    """A real int: not a bool, float or numeric string"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _inside_bets() -> Dict[Tuple[str, frozenset], int]:
+    """Every legal split/street/corner/line on the single-zero layout (rows of three: 1-2-3, 4-5-6, ...)"""
+    bets = {}
+    def add(bet_type, numbers):
+        bets[(bet_type, frozenset(numbers))] = _mask(numbers)
+
+    for n in range(1, 37):
+        if n % 3 != 0:
+            add("split", (n, n + 1))
+        if n <= 33:
+            add("split", (n, n + 3))
+        if n % 3 != 0 and n <= 32:
+            add("corner", (n, n + 1, n + 3, n + 4))
+    for zero_split in (1, 2, 3):
+        add("split", (0, zero_split))
+    for row in range(12):
+        add("street", (3 * row + 1, 3 * row + 2, 3 * row + 3))
+    for row in range(11):
+        add("line", tuple(range(3 * row + 1, 3 * row + 7)))
+    # Trios and the first four, paid as street and corner
+    add("street", (0, 1, 2))
+    add("street", (0, 2, 3))
+    add("corner", (0, 1, 2, 3))
+    return bets
+
+
+def _colors(red_numbers) -> List[str]:
+    return ["green"] + ["red" if n in red_numbers else "black" for n in range(1, 37)]
+
+
 class RouletteEngine:
     """Server-authoritative Roulette engine (European style - single zero)"""
     
@@ -12,6 +56,41 @@ class RouletteEngine:
     RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
     BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
     
+    # Bets are resolved against precomputed 37-bit masks: a bet wins when bit `winning_number` is set
+    OUTSIDE_BETS = {
+        "red": _mask(RED_NUMBERS),
+        "black": _mask(BLACK_NUMBERS),
+        "even": _mask(range(2, 37, 2)),
+        "odd": _mask(range(1, 37, 2)),
+        "low": _mask(range(1, 19)),
+        "high": _mask(range(19, 37)),
+        "dozen1": _mask(range(1, 13)),
+        "dozen2": _mask(range(13, 25)),
+        "dozen3": _mask(range(25, 37)),
+        "column1": _mask(range(1, 37, 3)),
+        "column2": _mask(range(2, 37, 3)),
+        "column3": _mask(range(3, 37, 3)),
+    }
+    INSIDE_BETS = _inside_bets()
+    COLORS = _colors(RED_NUMBERS)
+    
+    # Winnings per unit staked (the stake is returned on top)
+    PAYOUTS = {
+        "straight": Decimal("35"),      # Single number: 35:1
+        "split": Decimal("17"),         # Two numbers: 17:1
+        "street": Decimal("11"),        # Three numbers: 11:1
+        "corner": Decimal("8"),         # Four numbers: 8:1
+        "line": Decimal("5"),           # Six numbers: 5:1
+        "dozen": Decimal("2"),          # Dozen: 2:1
+        "column": Decimal("2"),         # Column: 2:1
+        "red": Decimal("1"),            # Even money: 1:1
+        "black": Decimal("1"),
+        "even": Decimal("1"),
+        "odd": Decimal("1"),
+        "low": Decimal("1"),
+        "high": Decimal("1"),
+    }
+    
     def __init__(self, seed: int = None):
         if seed:
             random.seed(seed)
@@ -22,147 +101,95 @@ class RouletteEngine:
     
     def get_color(self, number: int) -> str:
         """Get color of a number"""
-        if number == 0:
-            return "green"
-        elif number in self.RED_NUMBERS:
-            return "red"
-        else:
-            return "black"
+        return self.COLORS[number]
     
-    def check_bet(self, bet_type: str, bet_value: any, winning_number: int) -> bool:
-        """Check if a bet wins"""
-        
-        if bet_type == "straight":
-            # Bet on single number
-            return int(bet_value) == winning_number
-        
-        elif bet_type == "red":
-            return winning_number in self.RED_NUMBERS
-        
-        elif bet_type == "black":
-            return winning_number in self.BLACK_NUMBERS
-        
-        elif bet_type == "even":
-            return winning_number != 0 and winning_number % 2 == 0
-        
-        elif bet_type == "odd":
-            return winning_number != 0 and winning_number % 2 == 1
-        
-        elif bet_type == "low":
-            # 1-18
-            return 1 <= winning_number <= 18
-        
-        elif bet_type == "high":
-            # 19-36
-            return 19 <= winning_number <= 36
-        
-        elif bet_type == "dozen1":
-            # 1-12
-            return 1 <= winning_number <= 12
-        
-        elif bet_type == "dozen2":
-            # 13-24
-            return 13 <= winning_number <= 24
-        
-        elif bet_type == "dozen3":
-            # 25-36
-            return 25 <= winning_number <= 36
-        
-        elif bet_type == "column1":
-            # 1, 4, 7, 10, 13, 16, 19, 22, 25, 28, 31, 34
-            return winning_number > 0 and (winning_number - 1) % 3 == 0
-        
-        elif bet_type == "column2":
-            # 2, 5, 8, 11, 14, 17, 20, 23, 26, 29, 32, 35
-            return winning_number > 0 and (winning_number - 2) % 3 == 0
-        
-        elif bet_type == "column3":
-            # 3, 6, 9, 12, 15, 18, 21, 24, 27, 30, 33, 36
-            return winning_number > 0 and winning_number % 3 == 0
-        
-        elif bet_type == "split":
-            # Bet on two adjacent numbers
-            numbers = bet_value if isinstance(bet_value, list) else []
-            return winning_number in numbers
-        
-        elif bet_type == "street":
-            # Bet on a row of three numbers
-            numbers = bet_value if isinstance(bet_value, list) else []
-            return winning_number in numbers
-        
-        elif bet_type == "corner":
-            # Bet on four numbers that meet at a corner
-            numbers = bet_value if isinstance(bet_value, list) else []
-            return winning_number in numbers
+    def compile_bet(self, bet_type: str, bet_value: any = None) -> Tuple[str, int, Decimal]:
+        """
+        Validate a bet and return (canonical bet_type, winning-number mask, payout multiplier).
+        dozen/column take bet_value 1-3 (or use dozen1..column3); straight takes one int; other inside bets
+        take their numbers as a list of ints. Strings and floats are not coerced ("12" is not the split [1, 2]).
+        Raises ValueError for unknown bet types and numbers that do not form the bet on the layout.
+        """
+        if bet_type in ("dozen", "column"):
+            if bet_value not in (1, 2, 3, "1", "2", "3"):
+                raise ValueError(f"{bet_type} bets take bet_value 1, 2 or 3")
+            bet_type = f"{bet_type}{int(bet_value)}"
         
-        elif bet_type == "line":
-            # Bet on two adjacent streets (6 numbers)
-            numbers = bet_value if isinstance(bet_value, list) else []
-            return winning_number in numbers
+        if bet_type in self.OUTSIDE_BETS:
+            return bet_type, self.OUTSIDE_BETS[bet_type], self.PAYOUTS[bet_type.rstrip("123")]
         
-        return False
+        if bet_type == "straight":
+            if not _is_int(bet_value):
+                raise ValueError("straight bets take a single number")
+            if not 0 <= bet_value <= 36:
+                raise ValueError("straight bets take a number from 0 to 36")
+            return bet_type, 1 << bet_value, self.PAYOUTS[bet_type]
+        
+        if bet_type in ("split", "street", "corner", "line"):
+            if not isinstance(bet_value, (list, tuple)) or not all(_is_int(n) for n in bet_value):
+                raise ValueError(f"{bet_type} bets take a list of numbers")
+            numbers = frozenset(bet_value)
+            # Repeated numbers would collapse into a different bet
+            mask = self.INSIDE_BETS.get((bet_type, numbers)) if len(numbers) == len(bet_value) else None
+            if mask is None:
+                raise ValueError(f"{sorted(bet_value)} is not a {bet_type} on the table")
+            return bet_type, mask, self.PAYOUTS[bet_type]
+        
+        raise ValueError(f"Unknown bet type: {bet_type}")
+    
+    def compile_slip(self, bets: List[Dict]) -> List[Tuple[str, int, Decimal]]:
+        """compile_bet for every bet of a slip; validate before taking the stake"""
+        return [self.compile_bet(bet["bet_type"], bet.get("bet_value")) for bet in bets]
+    
+    def check_bet(self, bet_type: str, bet_value: any, winning_number: int) -> bool:
+        """Check if a bet wins (invalid bets never win)"""
+        try:
+            _, mask, _ = self.compile_bet(bet_type, bet_value)
+        except ValueError:
+            return False
+        return bool(mask >> winning_number & 1)
     
     def get_payout_multiplier(self, bet_type: str) -> Decimal:
         """Get payout multiplier for bet type"""
-        payouts = {
-            "straight": Decimal("35"),      # Single number: 35:1
-            "split": Decimal("17"),         # Two numbers: 17:1
-            "street": Decimal("11"),        # Three numbers: 11:1
-            "corner": Decimal("8"),         # Four numbers: 8:1
-            "line": Decimal("5"),           # Six numbers: 5:1
-            "dozen1": Decimal("2"),         # Dozen: 2:1
-            "dozen2": Decimal("2"),
-            "dozen3": Decimal("2"),
-            "column1": Decimal("2"),        # Column: 2:1
-            "column2": Decimal("2"),
-            "column3": Decimal("2"),
-            "red": Decimal("1"),            # Even money: 1:1
-            "black": Decimal("1"),
-            "even": Decimal("1"),
-            "odd": Decimal("1"),
-            "low": Decimal("1"),
-            "high": Decimal("1"),
-        }
-        return payouts.get(bet_type, Decimal("0"))
+        return self.PAYOUTS.get(bet_type.rstrip("123") if bet_type[:-1] in ("dozen", "column") else bet_type, Decimal("0"))
     
-    def play_round(self, bets: List[Dict]) -> Dict:
+    def resolve_slip(self, bets: List[Dict], compiled: List[Tuple[str, int, Decimal]], winning_number: int) -> Dict:
         """
-        Play a round of roulette
+        Settle a compiled slip against one winning number: one bit test per bet
         
         bets: List of dicts with keys: bet_type, bet_value, bet_amount
-        Returns: dict with winning_number, color, results
+        Returns: dict with bet_results and total_payout
         """
-        winning_number = self.spin()
-        color = self.get_color(winning_number)
-        
         results = []
         total_payout = Decimal("0")
-        
-        for bet in bets:
-            bet_type = bet["bet_type"]
-            bet_value = bet.get("bet_value")
-            bet_amount = Decimal(str(bet["bet_amount"]))
-            
-            is_winner = self.check_bet(bet_type, bet_value, winning_number)
-            
+        for bet, (_, mask, multiplier) in zip(bets, compiled):
+            bet_amount = bet["bet_amount"] if isinstance(bet["bet_amount"], Decimal) else Decimal(str(bet["bet_amount"]))
+            is_winner = bool(mask >> winning_number & 1)
             if is_winner:
-                multiplier = self.get_payout_multiplier(bet_type)
                 payout = bet_amount * (multiplier + 1)  # Include original bet
                 total_payout += payout
             else:
                 payout = Decimal("0")
-            
             results.append({
-                "bet_type": bet_type,
-                "bet_value": bet_value,
+                "bet_type": bet["bet_type"],
+                "bet_value": bet.get("bet_value"),
                 "bet_amount": bet_amount,
                 "won": is_winner,
                 "payout": payout
             })
+        return {"bet_results": results, "total_payout": total_payout}
+    
+    def play_round(self, bets: List[Dict]) -> Dict:
+        """
+        Play a round of roulette
         
+        bets: List of dicts with keys: bet_type, bet_value, bet_amount
+        Returns: dict with winning_number, color, results
+        """
+        compiled = self.compile_slip(bets)
+        winning_number = self.spin()
         return {
             "winning_number": winning_number,
-            "color": color,
-            "bet_results": results,
-            "total_payout": total_payout
-        }
\ No newline at end of file
+            "color": self.get_color(winning_number),
+            **self.resolve_slip(bets, compiled, winning_number)
+        }
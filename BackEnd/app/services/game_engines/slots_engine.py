@@ -1,6 +1,22 @@
 import random
-from typing import List, Dict
+from functools import lru_cache
+from itertools import product
+from typing import List, Dict, Tuple
 from decimal import Decimal
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def _line_payouts(paytable: Tuple, length: int):
+    """
+    Multiplier of every possible line, indexed by the line's symbol indices read as a base-S number.
+    Scores each combination exactly like check_winning_lines (per symbol, counts of 2 or more).
+    """
+    payouts = [dict(payout) for _, _, payout in paytable]
+    table = np.zeros(len(paytable) ** length, dtype=np.float64)
+    for code, line in enumerate(product(range(len(paytable)), repeat=length)):
+        table[code] = sum(payouts[s].get(line.count(s), 0) for s in set(line) if line.count(s) >= 2)
+    return table
 
 class SlotsEngine:
     """Server-authoritative Slots game engine (3x3 grid)"""
@@ -20,17 +36,16 @@ class SlotsEngine:
         self.rows = rows
         self.cols = cols
         self.rtp_percent = 96.0  # Return to Player percentage
+        self.symbols = list(self.SYMBOLS)
+        self.cum_weights = []
+        total = 0
+        for data in self.SYMBOLS.values():
+            total += data["weight"]
+            self.cum_weights.append(total)
     
     def get_weighted_symbol(self) -> str:
         """Get a random symbol based on weights"""
-        symbols = []
-        weights = []
-        
-        for symbol, data in self.SYMBOLS.items():
-            symbols.append(symbol)
-            weights.append(data["weight"])
-        
-        return random.choices(symbols, weights=weights, k=1)[0]
+        return random.choices(self.symbols, cum_weights=self.cum_weights, k=1)[0]
     
     def spin(self) -> List[List[str]]:
         """Spin the reels and return grid"""
@@ -129,6 +144,50 @@ class SlotsEngine:
         
         return wins
     
+    def _lines(self) -> List[List[int]]:
+        """Flat cell indices of every line check_winning_lines scores"""
+        lines = [[r * self.cols + c for c in range(self.cols)] for r in range(self.rows)]
+        lines += [[r * self.cols + c for r in range(self.rows)] for c in range(self.cols)]
+        if self.rows == self.cols:
+            lines.append([i * self.cols + i for i in range(self.rows)])
+            lines.append([i * self.cols + self.cols - 1 - i for i in range(self.rows)])
+        return lines
+
+    def spin_batch(self, n: int, seed: int = None) -> Dict:
+        """
+        Spin `n` rounds at once with NumPy (autoplay, simulations)
+
+        Returns:
+            dict with grids (n x rows x cols array of indices into self.symbols)
+            and multipliers (n floats, the total_multiplier play_round would report)
+        """
+        rng = np.random.default_rng(seed)
+        cum_weights = np.asarray(self.cum_weights, dtype=np.float64)
+        # One draw for every cell of every round, mapped to symbols through the cumulative weights
+        draws = rng.random((n, self.rows * self.cols)) * cum_weights[-1]
+        cells = np.searchsorted(cum_weights, draws, side="right").astype(np.uint8)
+
+        paytable = tuple(
+            (symbol, data["weight"], tuple(sorted(data["payout"].items())))
+            for symbol, data in self.SYMBOLS.items()
+        )
+        base = len(self.symbols)
+        multipliers = np.zeros(n, dtype=np.float64)
+        for line in self._lines():
+            code = np.zeros(n, dtype=np.int64)
+            for cell in line:
+                code = code * base + cells[:, cell]
+            multipliers += _line_payouts(paytable, len(line))[code]
+
+        return {
+            "grids": cells.reshape(n, self.rows, self.cols),
+            "multipliers": multipliers
+        }
+
+    def grid_symbols(self, grid) -> List[List[str]]:
+        """A spin_batch grid as the symbol grid spin() returns"""
+        return [[self.symbols[int(index)] for index in row] for row in grid]
+    
     def play_round(self, bet_amount: Decimal) -> Dict:
         """
         Play a round of slots
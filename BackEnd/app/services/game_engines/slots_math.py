@@ -0,0 +1,153 @@
+"""
+Exact RTP of a SlotsEngine paytable, without enumerating grids.
+
+Every cell is an independent weighted draw, and a line pays per symbol according to how many
+cells of that line show it. Expectation is linear, so
+    RTP = sum over lines, symbols s and counts k of P(line shows s exactly k times) * payout[s][k]
+where the count is Binomial(line length, weight_s / total weight). That is the full 7^9-grid
+expectation of check_winning_lines, computed as exact fractions in well under a second.
+Like the engine, only counts of 2 or more pay.
+
+The variance is exact too: two distinct lines of a grid share at most one cell, so each pair is
+either independent or independent given the shared cell.
+
+Tune a paytable before deploying it (same shape as SlotsEngine.SYMBOLS, as JSON):
+    python -m app.services.game_engines.slots_math
+    python -m app.services.game_engines.slots_math --config symbols.json --json
+"""
+import argparse
+import json
+from fractions import Fraction
+from itertools import product
+from math import comb, sqrt
+from typing import Dict, List, Tuple
+
+from .slots_engine import SlotsEngine
+
+
+def winning_lines(rows: int = 3, cols: int = 3) -> List[Tuple[str, Tuple]]:
+    """The lines check_winning_lines scores, as (name, cells) in the same order"""
+    lines = [(f"horizontal:{r}", tuple((r, c) for c in range(cols))) for r in range(rows)]
+    lines += [(f"vertical:{c}", tuple((r, c) for r in range(rows))) for c in range(cols)]
+    if rows == cols:
+        lines.append(("diagonal:main", tuple((i, i) for i in range(rows))))
+        lines.append(("diagonal:anti", tuple((i, cols - 1 - i) for i in range(rows))))
+    return lines
+
+
+def _paying(data: Dict) -> Dict[int, int]:
+    return {count: multiplier for count, multiplier in data["payout"].items() if count >= 2}
+
+
+def _probabilities(symbols: Dict) -> Dict[str, Fraction]:
+    total = sum(data["weight"] for data in symbols.values())
+    return {symbol: Fraction(data["weight"], total) for symbol, data in symbols.items()}
+
+
+def _binomial(n: int, k: int, p: Fraction) -> Fraction:
+    if k < 0 or k > n:
+        return Fraction(0)
+    return comb(n, k) * p ** k * (1 - p) ** (n - k)
+
+
+def _line_mean(symbols: Dict, probs: Dict, length: int, fixed: str = None) -> Fraction:
+    """E[line multiplier], optionally given that one of its cells shows `fixed`"""
+    free = length - (fixed is not None)
+    mean = Fraction(0)
+    for symbol, data in symbols.items():
+        offset = 1 if symbol == fixed else 0
+        for count, multiplier in _paying(data).items():
+            mean += _binomial(free, count - offset, probs[symbol]) * multiplier
+    return mean
+
+
+def _line_second_moment(symbols: Dict, probs: Dict, length: int) -> Fraction:
+    """E[line multiplier ^ 2], enumerating the line's symbols (7^3 combinations for a 3x3 grid)"""
+    second = Fraction(0)
+    for line in product(symbols, repeat=length):
+        payout = sum(_paying(symbols[s]).get(line.count(s), 0) for s in set(line))
+        if payout:
+            prob = Fraction(1)
+            for s in line:
+                prob *= probs[s]
+            second += prob * payout * payout
+    return second
+
+
+def exact_rtp(symbols: Dict = None, rows: int = 3, cols: int = 3) -> dict:
+    """RTP, variance and per-symbol/per-count contribution of a paytable (stake 1)"""
+    symbols = symbols or SlotsEngine.SYMBOLS
+    probs = _probabilities(symbols)
+    lines = winning_lines(rows, cols)
+
+    breakdown = []
+    rtp = Fraction(0)
+    for symbol, data in symbols.items():
+        for count, multiplier in sorted(_paying(data).items(), reverse=True):
+            per_line = sum(_binomial(len(cells), count, probs[symbol]) for _, cells in lines)
+            contribution = per_line * multiplier
+            rtp += contribution
+            breakdown.append({
+                "symbol": symbol,
+                "count": count,
+                "multiplier": multiplier,
+                "hits_per_spin": float(per_line),
+                "contribution": float(contribution),
+            })
+
+    # E[X^2] = sum over ordered line pairs of E[L_i * L_j]
+    means = [_line_mean(symbols, probs, len(cells)) for _, cells in lines]
+    second = Fraction(0)
+    for i, (_, cells_i) in enumerate(lines):
+        for j, (_, cells_j) in enumerate(lines):
+            if i == j:
+                second += _line_second_moment(symbols, probs, len(cells_i))
+                continue
+            if set(cells_i) & set(cells_j):
+                second += sum(
+                    probs[s] * _line_mean(symbols, probs, len(cells_i), s) * _line_mean(symbols, probs, len(cells_j), s)
+                    for s in symbols
+                )
+            else:
+                second += means[i] * means[j]
+    variance = second - rtp * rtp
+
+    for item in breakdown:
+        item["share"] = round(item["contribution"] / float(rtp), 6) if rtp else 0.0
+    return {
+        "rtp": float(rtp),
+        "rtp_exact": f"{rtp.numerator}/{rtp.denominator}",
+        "house_edge": float(1 - rtp),
+        "variance": float(variance),
+        "std_dev": sqrt(float(variance)),
+        "lines": [{"line": name, "rtp": float(mean)} for (name, _), mean in zip(lines, means)],
+        "breakdown": breakdown,
+    }
+
+
+def load_symbols(path: str) -> Dict:
+    """SYMBOLS-shaped JSON; payout counts arrive as string keys"""
+    with open(path) as f:
+        raw = json.load(f)
+    return {
+        symbol: {"weight": data["weight"], "payout": {int(k): v for k, v in data["payout"].items()}}
+        for symbol, data in raw.items()
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", help="JSON paytable shaped like SlotsEngine.SYMBOLS (default: the live one)")
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON")
+    args = parser.parse_args()
+
+    result = exact_rtp(load_symbols(args.config) if args.config else None, args.rows, args.cols)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print(f"RTP {result['rtp']:.6%}  house edge {result['house_edge']:.6%}  sd {result['std_dev']:.4f}")
+        for item in result["breakdown"]:
+            print(f"  {item['symbol']} x{item['count']} pays {item['multiplier']:>3}  "
+                  f"{item['hits_per_spin']:.6f} hits/spin  {item['contribution']:.6f} ({item['share']:.2%})")
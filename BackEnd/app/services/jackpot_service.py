@@ -1,76 +1,244 @@
 import random
 from decimal import Decimal
+from typing import Dict, List, Tuple
+from sqlalchemy import select, update, text, func
 from sqlalchemy.orm import Session
-from ..models.jackpot import Jackpot, JackpotWin
-from ..models.wallet import Wallet, WalletType
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..models.jackpot import Jackpot, JackpotWin, JackpotContributionShard
+from ..models.wallet import Wallet, WalletType, LedgerEntryType
+from .ledger_service import LedgerService
+
+# Add this bet's contribution to one shard of every active pool of the tenant.
+# The jackpot rows are only read, so the bet never waits on (or blocks) a pool row.
+CONTRIBUTE_SQL = text("""
+    WITH pools AS (
+        SELECT jackpot_id, name, win_probability, contribution_percent
+        FROM jackpots
+        WHERE tenant_id = :tenant_id AND is_active = TRUE
+    ),
+    added AS (
+        INSERT INTO jackpot_contribution_shards AS s (jackpot_id, shard_no, pending_amount)
+        SELECT jackpot_id, :shard_no, :bet_amount * contribution_percent
+        FROM pools
+        ORDER BY jackpot_id
+        ON CONFLICT (jackpot_id, shard_no)
+        DO UPDATE SET pending_amount = s.pending_amount + EXCLUDED.pending_amount
+    )
+    SELECT jackpot_id, name, win_probability FROM pools
+""")
+
+# Pool rows first (jackpot_id order), then their shards: the order both folding and win claims use
+LOCK_POOLS_SQL = text("""
+    SELECT jackpot_id FROM jackpots
+    WHERE jackpot_id = ANY(CAST(:jackpot_ids AS int[]))
+    ORDER BY jackpot_id
+    FOR UPDATE
+""")
+
+PENDING_POOLS_SQL = text("""
+    SELECT DISTINCT jackpot_id FROM jackpot_contribution_shards WHERE pending_amount >= 0.01
+""")
+
+# Move whole cents from the shards into current_amount; sub-cent remainders stay in the shards
+DRAIN_SQL = text("""
+    WITH shards AS (
+        SELECT jackpot_id, shard_no, trunc(pending_amount, 2) AS moved
+        FROM jackpot_contribution_shards
+        WHERE jackpot_id = ANY(CAST(:jackpot_ids AS int[])) AND pending_amount >= 0.01
+        ORDER BY jackpot_id, shard_no
+        FOR UPDATE
+    ),
+    drained AS (
+        UPDATE jackpot_contribution_shards s
+        SET pending_amount = s.pending_amount - shards.moved
+        FROM shards
+        WHERE s.jackpot_id = shards.jackpot_id AND s.shard_no = shards.shard_no
+    )
+    UPDATE jackpots j
+    SET current_amount = j.current_amount + t.moved, updated_at = now()
+    FROM (SELECT jackpot_id, SUM(moved) AS moved FROM shards GROUP BY jackpot_id) t
+    WHERE j.jackpot_id = t.jackpot_id
+    RETURNING j.jackpot_id, t.moved
+""")
+
+NO_WIN = {"won": False, "amount": Decimal(0), "name": ""}
 
 class JackpotService:
-    
+
+    @staticmethod
+    def _cash_wallet_stmt(user_id: int, tenant_id: int):
+        return select(Wallet).where(
+            Wallet.user_id == user_id,
+            Wallet.tenant_id == tenant_id,
+            Wallet.type_of_wallet == WalletType.cash
+        )
+
+    @staticmethod
+    def _contribute_params(tenant_id: int, bet_amount: Decimal) -> dict:
+        return {"tenant_id": tenant_id, "bet_amount": bet_amount, "shard_no": random.randrange(settings.JACKPOT_SHARDS)}
+
+    @staticmethod
+    def _roll(pools) -> object:
+        """The pool won by this spin (RNG per pool, in jackpot_id order), or None"""
+        for pool in sorted(pools, key=lambda p: p.jackpot_id):
+            if random.random() < float(pool.win_probability or 0):
+                return pool
+        return None
+
+    @staticmethod
+    def _reset_stmt(jackpot_id: int):
+        return update(Jackpot).where(Jackpot.jackpot_id == jackpot_id)\
+            .values(current_amount=Jackpot.start_amount, updated_at=func.now())\
+            .execution_options(synchronize_session=False)
+
+    @staticmethod
+    def _record_win(db, pool, win_amount: Decimal, user_id: int, wallet: Wallet):
+        db.add(JackpotWin(
+            jackpot_id=pool.jackpot_id,
+            user_id=user_id,
+            amount_won=win_amount
+        ))
+        # Credit User Cash Wallet (ledger entry, projected asynchronously)
+        if wallet:
+            LedgerService.credit(db, wallet.wallet_id, win_amount, LedgerEntryType.jackpot_win, pool.jackpot_id)
+        return {"won": True, "amount": win_amount, "name": pool.name} # Only one jackpot win per spin allowed
+
     @staticmethod
     def process_spin(db: Session, user_id: int, tenant_id: int, bet_amount: Decimal):
         """
         Process jackpot contribution and check for win.
         Condition: Only bets > 100 contribute and trigger a roll.
+        Commits its own short transactions; call it after the bet's wallet debits are committed.
         """
         # --- CONDITION CHECK ---
         if bet_amount <= 100:
-            return {"won": False, "amount": Decimal(0), "name": ""}
+            return dict(NO_WIN)
         # -----------------------
 
-        # 1. Fetch active jackpots for this tenant
-        jackpots = db.query(Jackpot).filter(
-            Jackpot.tenant_id == tenant_id,
-            Jackpot.is_active == True
-        ).with_for_update().all() # Lock row for atomicity
-        
-        win_result = {"won": False, "amount": Decimal(0), "name": ""}
-        
-        for jackpot in jackpots:
-            # 2. Contribute to Pool
-            contribution = bet_amount * jackpot.contribution_percent
-            jackpot.current_amount += contribution
-            
-            # 3. Check for Win (RNG)
-            if random.random() < float(jackpot.win_probability):
-                # WINNER!
-                win_amount = jackpot.current_amount
-                
-                # a. Log Win
-                win_record = JackpotWin(
-                    jackpot_id=jackpot.id,
-                    user_id=user_id,
-                    amount_won=win_amount
-                )
-                db.add(win_record)
-                
-                # b. Credit User Cash Wallet
-                wallet = db.query(Wallet).filter(
-                    Wallet.user_id == user_id,
-                    Wallet.type_of_wallet == WalletType.cash
-                ).first()
-                
-                if wallet:
-                    wallet.balance += win_amount
-                
-                # c. Reset Jackpot
-                jackpot.current_amount = jackpot.start_amount
-                
-                # d. Set Result
-                win_result = {
-                    "won": True, 
-                    "amount": win_amount, 
-                    "name": jackpot.name
-                }
-                break # Only one jackpot win per spin allowed
-        
-        # Note: We don't commit here; the calling WalletService commits the transaction
-        return win_result
+        pools = db.execute(CONTRIBUTE_SQL, JackpotService._contribute_params(tenant_id, bet_amount)).all()
+        db.commit()
+
+        pool = JackpotService._roll(pools)
+        if not pool:
+            return dict(NO_WIN)
+        return JackpotService.claim(db, pool, user_id, tenant_id)
+
+    @staticmethod
+    def claim(db: Session, pool, user_id: int, tenant_id: int):
+        """
+        Pay out a won pool in one transaction: lock the pool, fold its shards, record the win,
+        credit the winner and reset the pool. A concurrent claim waits on the pool row and pays
+        out whatever has accumulated since.
+        """
+        db.execute(LOCK_POOLS_SQL, {"jackpot_ids": [pool.jackpot_id]})
+        db.execute(DRAIN_SQL, {"jackpot_ids": [pool.jackpot_id]}).all()
+        win_amount = db.execute(select(Jackpot.current_amount).where(Jackpot.jackpot_id == pool.jackpot_id)).scalar_one()
+        db.execute(JackpotService._reset_stmt(pool.jackpot_id))
+        wallet = db.execute(JackpotService._cash_wallet_stmt(user_id, tenant_id)).scalar_one_or_none()
+        result = JackpotService._record_win(db, pool, win_amount, user_id, wallet)
+        db.commit()
+        return result
 
     @staticmethod
-    def get_jackpots(db: Session, tenant_id: int):
-        return db.query(Jackpot).filter(
-            Jackpot.tenant_id == tenant_id, 
+    async def process_spin_async(db: AsyncSession, user_id: int, tenant_id: int, bet_amount: Decimal):
+        """Non-blocking variant of process_spin for AsyncSession callers"""
+        if bet_amount <= 100:
+            return dict(NO_WIN)
+
+        pools = (await db.execute(CONTRIBUTE_SQL, JackpotService._contribute_params(tenant_id, bet_amount))).all()
+        await db.commit()
+
+        pool = JackpotService._roll(pools)
+        if not pool:
+            return dict(NO_WIN)
+        return await JackpotService.claim_async(db, pool, user_id, tenant_id)
+
+    @staticmethod
+    async def process_spins_async(db: AsyncSession, user_id: int, tenant_id: int, bet_amounts: List[Decimal]) -> List[Tuple[int, dict]]:
+        """
+        process_spin for a run of rounds settled together (autoplay): each round over 100 contributes
+        its own share and gets its own roll, as a single bet of that amount would. The contributions go
+        in as one statement (they are linear in the amount), before the first roll, so a win also takes
+        the later rounds' share. Returns (round index, win) for the winning rounds.
+        """
+        rounds = [i for i, amount in enumerate(bet_amounts) if amount > 100]
+        if not rounds:
+            return []
+
+        total = sum((bet_amounts[i] for i in rounds), Decimal("0"))
+        pools = (await db.execute(CONTRIBUTE_SQL, JackpotService._contribute_params(tenant_id, total))).all()
+        await db.commit()
+
+        wins = []
+        for i in rounds:
+            pool = JackpotService._roll(pools)
+            if pool:
+                wins.append((i, await JackpotService.claim_async(db, pool, user_id, tenant_id)))
+        return wins
+
+    @staticmethod
+    async def claim_async(db: AsyncSession, pool, user_id: int, tenant_id: int):
+        """Non-blocking variant of claim"""
+        await db.execute(LOCK_POOLS_SQL, {"jackpot_ids": [pool.jackpot_id]})
+        (await db.execute(DRAIN_SQL, {"jackpot_ids": [pool.jackpot_id]})).all()
+        win_amount = (await db.execute(
+            select(Jackpot.current_amount).where(Jackpot.jackpot_id == pool.jackpot_id)
+        )).scalar_one()
+        await db.execute(JackpotService._reset_stmt(pool.jackpot_id))
+        wallet = (await db.execute(JackpotService._cash_wallet_stmt(user_id, tenant_id))).scalar_one_or_none()
+        result = JackpotService._record_win(db, pool, win_amount, user_id, wallet)
+        await db.commit()
+        return result
+
+    @staticmethod
+    def fold_contributions(db: Session) -> dict:
+        """Fold accumulated shard contributions into the pools (periodic; see workers/jackpot_fold.py)"""
+        jackpot_ids = [row[0] for row in db.execute(PENDING_POOLS_SQL)]
+        if not jackpot_ids:
+            return {}
+        db.execute(LOCK_POOLS_SQL, {"jackpot_ids": jackpot_ids})
+        folded = {row.jackpot_id: row.moved for row in db.execute(DRAIN_SQL, {"jackpot_ids": jackpot_ids})}
+        db.commit()
+        return folded
+
+    @staticmethod
+    def _live_query(db: Session):
+        """Jackpots with their live amount (folded amount plus whole cents still in the shards)"""
+        pending = select(
+            JackpotContributionShard.jackpot_id,
+            func.sum(JackpotContributionShard.pending_amount).label("pending")
+        ).group_by(JackpotContributionShard.jackpot_id).subquery()
+
+        return db.query(Jackpot, func.coalesce(pending.c.pending, 0))\
+            .outerjoin(pending, pending.c.jackpot_id == Jackpot.jackpot_id)\
+            .order_by(Jackpot.jackpot_id)
+
+    @staticmethod
+    def _live_amount(jackpot: Jackpot, pending_amount) -> dict:
+        return {
+            "jackpot_id": jackpot.jackpot_id,
+            "name": jackpot.name,
+            "current_amount": jackpot.current_amount + Decimal(pending_amount).quantize(Decimal("0.01"), rounding="ROUND_DOWN")
+        }
+
+    @staticmethod
+    def get_jackpots(db: Session, tenant_id: int) -> List[dict]:
+        """Active pools of one tenant with their live amount"""
+        rows = JackpotService._live_query(db).filter(
+            Jackpot.tenant_id == tenant_id,
             Jackpot.is_active == True
         ).all()
+        return [JackpotService._live_amount(jackpot, pending_amount) for jackpot, pending_amount in rows]
+
+    @staticmethod
+    def live_snapshot(db: Session) -> Dict[int, List[dict]]:
+        """Active pools of every tenant in one query (tenants whose pools are all inactive map to [])"""
+        snapshot = {}
+        for jackpot, pending_amount in JackpotService._live_query(db).all():
+            pools = snapshot.setdefault(jackpot.tenant_id, [])
+            if jackpot.is_active:
+                pools.append(JackpotService._live_amount(jackpot, pending_amount))
+        return snapshot
 
-jackpot_service = JackpotService()
\ No newline at end of file
+jackpot_service = JackpotService()
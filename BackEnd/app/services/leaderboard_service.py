@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from ..database import is_replica_session
 from ..models.team import FantasyTeam
 from ..models.user import User
 from ..redis_client import CacheManager
@@ -17,6 +18,8 @@ class LeaderboardService:
         """
         Get leaderboard for a match
         Returns sorted list of teams with ranks
+        `db` may be a read-replica session: a possibly lagging read is returned as is, but only a
+        primary session persists ranks and fills the shared cache (score_updater refreshes both)
         """
         # Try cache first
         if use_cache:
@@ -31,11 +34,12 @@ class LeaderboardService:
         ).order_by(desc(FantasyTeam.total_points)).all()
         
         leaderboard = []
+        rank_changes = {}
         current_rank = 1
         
         for idx, team in enumerate(teams):
-            # Update rank in database
-            team.rank = current_rank
+            if team.rank != current_rank:
+                rank_changes[team.team_id] = current_rank
             
             # Get user info
             user = db.query(User).filter(User.user_id == team.user_id).first()
@@ -54,7 +58,13 @@ class LeaderboardService:
             leaderboard.append(leaderboard_entry)
             current_rank += 1
         
-        db.commit()
+        if is_replica_session(db):
+            logger.info(f"Generated leaderboard for match {match_id} from the replica: {len(leaderboard)} teams")
+            return leaderboard
+        
+        # Update ranks in database
+        if rank_changes:
+            LeaderboardService._persist_ranks(db, rank_changes)
         
         # Cache the result
         CacheManager.set_leaderboard(match_id, leaderboard, ttl=120)
@@ -62,6 +72,14 @@ class LeaderboardService:
         logger.info(f"Generated leaderboard for match {match_id}: {len(leaderboard)} teams")
         return leaderboard
     
+    @staticmethod
+    def _persist_ranks(db: Session, rank_changes: Dict[int, int]):
+        """Write changed ranks through the primary session the leaderboard was read from"""
+        db.bulk_update_mappings(FantasyTeam, [
+            {"team_id": team_id, "rank": rank} for team_id, rank in rank_changes.items()
+        ])
+        db.commit()
+    
     @staticmethod
     def get_user_rank(db: Session, match_id: int, user_id: int) -> Dict:
         """
@@ -0,0 +1,251 @@
+from sqlalchemy import text, func, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, List, Optional
+import logging
+
+from ..config import settings
+from ..models.wallet import Wallet, WalletLedger, LedgerEntryType
+
+logger = logging.getLogger(__name__)
+
+# Fold unprojected entries into wallet.balance and stamp each entry with its before/after balance.
+# Wallets are locked in wallet_id order. The bet path has already locked all of its wallets in that order.
+PROJECT_SQL = text("""
+    WITH pending AS (
+        SELECT ledger_id, wallet_id, amount
+        FROM wallet_ledger
+        WHERE projected_at IS NULL
+          AND (CAST(:wallet_ids AS int[]) IS NULL OR wallet_id = ANY(CAST(:wallet_ids AS int[])))
+        ORDER BY ledger_id
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    ),
+    locked AS (
+        SELECT wallet_id FROM wallet
+        WHERE wallet_id IN (SELECT wallet_id FROM pending)
+        ORDER BY wallet_id
+        FOR UPDATE
+    ),
+    folded AS (
+        UPDATE wallet w
+        SET balance = w.balance + t.delta
+        FROM (
+            SELECT p.wallet_id, SUM(p.amount) AS delta
+            FROM pending p JOIN locked USING (wallet_id)
+            GROUP BY p.wallet_id
+        ) t
+        WHERE w.wallet_id = t.wallet_id
+        RETURNING w.wallet_id, w.balance - t.delta AS base_balance
+    ),
+    running AS (
+        SELECT ledger_id, wallet_id, amount,
+               SUM(amount) OVER (PARTITION BY wallet_id ORDER BY ledger_id) AS running_total
+        FROM pending
+    )
+    UPDATE wallet_ledger l
+    SET projected_at = now(),
+        before_balance = f.base_balance + r.running_total - r.amount,
+        after_balance = f.base_balance + r.running_total
+    FROM running r
+    JOIN folded f ON f.wallet_id = r.wallet_id
+    WHERE l.ledger_id = r.ledger_id
+    RETURNING l.ledger_id
+""")
+
+# Wallets whose balance disagrees with their projected entries (pending credits are reported, not counted)
+RECONCILE_SQL = text("""
+    SELECT w.wallet_id, w.balance,
+           COALESCE(SUM(l.amount) FILTER (WHERE l.projected_at IS NOT NULL), 0) AS ledger_balance,
+           COALESCE(SUM(l.amount) FILTER (WHERE l.projected_at IS NULL), 0) AS pending
+    FROM wallet w
+    LEFT JOIN wallet_ledger l ON l.wallet_id = w.wallet_id
+    WHERE CAST(:wallet_ids AS int[]) IS NULL OR w.wallet_id = ANY(CAST(:wallet_ids AS int[]))
+    GROUP BY w.wallet_id, w.balance
+    HAVING w.balance <> COALESCE(SUM(l.amount) FILTER (WHERE l.projected_at IS NOT NULL), 0)
+    ORDER BY w.wallet_id
+""")
+
+# Rebuild balances from the full ledger (projecting anything pending) and re-stamp before/after balances
+REPLAY_SQL = text("""
+    WITH locked AS (
+        SELECT wallet_id FROM wallet
+        WHERE CAST(:wallet_ids AS int[]) IS NULL OR wallet_id = ANY(CAST(:wallet_ids AS int[]))
+        ORDER BY wallet_id
+        FOR UPDATE
+    ),
+    entries AS (
+        SELECT l.ledger_id, l.wallet_id, l.amount,
+               SUM(l.amount) OVER (PARTITION BY l.wallet_id ORDER BY l.ledger_id) AS running_total
+        FROM wallet_ledger l JOIN locked USING (wallet_id)
+    ),
+    annotated AS (
+        UPDATE wallet_ledger l
+        SET before_balance = e.running_total - e.amount,
+            after_balance = e.running_total,
+            projected_at = COALESCE(l.projected_at, now())
+        FROM entries e
+        WHERE l.ledger_id = e.ledger_id
+    )
+    UPDATE wallet w
+    SET balance = t.total
+    FROM (
+        SELECT locked.wallet_id, COALESCE(SUM(e.amount), 0) AS total
+        FROM locked LEFT JOIN entries e USING (wallet_id)
+        GROUP BY locked.wallet_id
+    ) t
+    WHERE w.wallet_id = t.wallet_id AND w.balance IS DISTINCT FROM t.total
+    RETURNING w.wallet_id, w.balance
+""")
+
+
+class LedgerService:
+    """
+    Ledger-first wallet bookkeeping (see models/wallet.py WalletLedger).
+
+    Debits need the balance to be checked, so they are a conditional UPDATE of wallet.balance plus a projected
+    entry in the same transaction. Credits never reduce what a player can spend, so they only append an entry; the projector
+    folds them into wallet.balance shortly after, without holding the wallet row during the game round.
+    """
+
+    @staticmethod
+    def _debit_stmt(wallet_id: int, amount: Decimal):
+        # Check and debit in one statement: no read-modify-write, and the row lock lasts only until commit
+        return update(Wallet).where(
+            Wallet.wallet_id == wallet_id,
+            Wallet.balance >= amount
+        ).values(balance=Wallet.balance - amount)\
+         .returning(Wallet.balance)\
+         .execution_options(synchronize_session=False)
+
+    @staticmethod
+    def _debit_entry(wallet_id: int, amount: Decimal, after: Decimal, reference_type: LedgerEntryType, reference_id: int) -> WalletLedger:
+        return WalletLedger(
+            wallet_id=wallet_id,
+            amount=-amount,
+            before_balance=after + amount,
+            after_balance=after,
+            reference_type=reference_type,
+            reference_id=reference_id,
+            projected_at=datetime.now(timezone.utc)
+        )
+
+    @staticmethod
+    def debit(db: Session, wallet_id: int, amount: Decimal, reference_type: LedgerEntryType, reference_id: int = None) -> Optional[Decimal]:
+        """
+        Debit a wallet if it can cover the amount; returns the new balance, or None (nothing changed) if it cannot.
+        Loaded Wallet objects are not refreshed. Caller commits.
+        """
+        after = db.execute(LedgerService._debit_stmt(wallet_id, amount)).scalar_one_or_none()
+        if after is not None:
+            db.add(LedgerService._debit_entry(wallet_id, amount, after, reference_type, reference_id))
+        return after
+
+    @staticmethod
+    async def debit_async(db: AsyncSession, wallet_id: int, amount: Decimal, reference_type: LedgerEntryType, reference_id: int = None) -> Optional[Decimal]:
+        after = (await db.execute(LedgerService._debit_stmt(wallet_id, amount))).scalar_one_or_none()
+        if after is not None:
+            db.add(LedgerService._debit_entry(wallet_id, amount, after, reference_type, reference_id))
+        return after
+
+    @staticmethod
+    def credit(db, wallet_id: int, amount: Decimal, reference_type: LedgerEntryType, reference_id: int = None) -> WalletLedger:
+        """Append a credit; wallet.balance catches up when it is projected. Caller commits."""
+        entry = WalletLedger(
+            wallet_id=wallet_id,
+            amount=amount,
+            reference_type=reference_type,
+            reference_id=reference_id
+        )
+        db.add(entry)
+        return entry
+
+    # ---------- Projection ----------
+
+    @staticmethod
+    def project(db: Session, wallet_ids: Optional[List[int]] = None, batch_size: int = None, commit: bool = True) -> int:
+        """Fold pending credits into wallet.balance; returns the number of entries projected"""
+        params = {"wallet_ids": wallet_ids, "batch_size": batch_size or settings.WALLET_PROJECTION_BATCH}
+        projected = len(db.execute(PROJECT_SQL, params).all())
+        if commit:
+            db.commit()
+        return projected
+
+    @staticmethod
+    async def project_async(db: AsyncSession, wallet_ids: Optional[List[int]] = None, batch_size: int = None) -> int:
+        """Fold pending credits for the given wallets inside the caller's transaction"""
+        params = {"wallet_ids": wallet_ids, "batch_size": batch_size or settings.WALLET_PROJECTION_BATCH}
+        return len((await db.execute(PROJECT_SQL, params)).all())
+
+    @staticmethod
+    def _pending_stmt(wallet_ids: List[int]):
+        return select(WalletLedger.wallet_id, func.sum(WalletLedger.amount)).where(
+            WalletLedger.wallet_id.in_(wallet_ids),
+            WalletLedger.projected_at.is_(None)
+        ).group_by(WalletLedger.wallet_id)
+
+    @staticmethod
+    def pending_credits(db: Session, wallet_ids: List[int]) -> Dict[int, Decimal]:
+        """Credits appended but not yet folded into wallet.balance, per wallet"""
+        if not wallet_ids:
+            return {}
+        return {wallet_id: total for wallet_id, total in db.execute(LedgerService._pending_stmt(wallet_ids))}
+
+    @staticmethod
+    def available_balance(db: Session, wallet: Wallet) -> Decimal:
+        """What the player sees and can spend: projected balance plus pending credits"""
+        return wallet.balance + LedgerService.pending_credits(db, [wallet.wallet_id]).get(wallet.wallet_id, Decimal("0"))
+
+    # ---------- Reconciliation / replay ----------
+
+    @staticmethod
+    def reconcile(db: Session, wallet_ids: Optional[List[int]] = None) -> List[dict]:
+        """Wallets whose balance differs from the sum of their projected ledger entries"""
+        rows = db.execute(RECONCILE_SQL, {"wallet_ids": wallet_ids}).all()
+        mismatches = [{
+            "wallet_id": row.wallet_id,
+            "balance": row.balance,
+            "ledger_balance": row.ledger_balance,
+            "pending": row.pending,
+            "drift": row.balance - row.ledger_balance
+        } for row in rows]
+        if mismatches:
+            logger.warning(f"Wallet ledger drift on {len(mismatches)} wallet(s): {[m['wallet_id'] for m in mismatches]}")
+        return mismatches
+
+    @staticmethod
+    def replay(db: Session, wallet_ids: Optional[List[int]] = None, dry_run: bool = False) -> List[dict]:
+        """
+        Rebuild wallet balances from the ledger alone. Locks the selected wallets for the duration,
+        so replay everything only during maintenance. With dry_run, reports what would change.
+        """
+        before = {row.wallet_id: row.balance for row in db.execute(
+            select(Wallet.wallet_id, Wallet.balance).where(Wallet.wallet_id.in_(wallet_ids)) if wallet_ids
+            else select(Wallet.wallet_id, Wallet.balance)
+        )}
+        if dry_run:
+            totals = {row.wallet_id: row.total for row in db.execute(
+                select(WalletLedger.wallet_id, func.sum(WalletLedger.amount).label("total"))
+                .where(WalletLedger.wallet_id.in_(list(before)))
+                .group_by(WalletLedger.wallet_id)
+            )}
+            return [
+                {"wallet_id": wallet_id, "balance": balance, "replayed": totals.get(wallet_id, Decimal("0"))}
+                for wallet_id, balance in sorted(before.items())
+                if balance != totals.get(wallet_id, Decimal("0"))
+            ]
+
+        changed = db.execute(REPLAY_SQL, {"wallet_ids": wallet_ids}).all()
+        db.commit()
+        changes = [
+            {"wallet_id": row.wallet_id, "balance": before.get(row.wallet_id), "replayed": row.balance}
+            for row in sorted(changed, key=lambda r: r.wallet_id)
+        ]
+        if changes:
+            logger.warning(f"Ledger replay changed {len(changes)} wallet balance(s)")
+        return changes
+
+
+ledger_service = LedgerService()
@@ -1,10 +1,11 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
 from datetime import datetime, timezone
 from decimal import Decimal
 from fastapi import HTTPException
 from ..models.user import ResponsibleLimit
-from ..models.game import Bet, BetStatus, GameRound, GameSession
+from ..models.game import Bet, BetStatus
 
 class LimitService:
     
@@ -13,27 +14,32 @@ class LimitService:
         return db.query(ResponsibleLimit).filter(ResponsibleLimit.user_id == user_id).first()
 
     @staticmethod
-    def check_bet_limits(db: Session, user_id: int, bet_amount: Decimal):
-        """
-        Checks if placing a bet violates any set limits.
-        Raises HTTPException if limit is exceeded.
-        """
-        limits = LimitService.get_user_limits(db, user_id)
-        if not limits:
-            return # No limits set
-
+    def _periods():
         now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        return today_start, month_start
+
+    @staticmethod
+    def _wager_stmt(user_id: int, since: datetime):
+        """Total wagered and paid out for a user since `since` (shared by sync and async paths)"""
+        return select(
+            func.sum(Bet.bet_amount).label("total_bet"),
+            func.sum(Bet.payout_amount).label("total_payout")
+        ).where(
+            Bet.user_id == user_id,
+            Bet.bet_status != BetStatus.cancelled,
+            # started_at is the partition key, so only recent bet partitions are read
+            Bet.started_at >= since
+        )
+
+    @staticmethod
+    def _enforce(limits: ResponsibleLimit, bet_amount: Decimal, daily, monthly):
+        """Raise if the bet breaks a limit, given (total_bet, total_payout) rows for today and this month"""
+        daily_wagered = (daily.total_bet if daily else None) or Decimal(0)
 
         # 1. Check Daily Bet Limit (Total Wagered Today)
         if limits.daily_bet_limit and limits.daily_bet_limit > 0:
-            daily_wagered = db.query(func.sum(Bet.bet_amount)).join(GameRound).join(GameSession).filter(
-                GameSession.user_id == user_id,
-                Bet.bet_status != BetStatus.cancelled,
-                GameSession.started_at >= today_start
-            ).scalar() or Decimal(0)
-
             if (daily_wagered + bet_amount) > limits.daily_bet_limit:
                 raise HTTPException(
                     status_code=400, 
@@ -42,11 +48,7 @@ class LimitService:
 
         # 2. Check Monthly Bet Limit
         if limits.monthly_bet_limit and limits.monthly_bet_limit > 0:
-            monthly_wagered = db.query(func.sum(Bet.bet_amount)).join(GameRound).join(GameSession).filter(
-                GameSession.user_id == user_id,
-                Bet.bet_status != BetStatus.cancelled,
-                GameSession.started_at >= month_start
-            ).scalar() or Decimal(0)
+            monthly_wagered = (monthly.total_bet if monthly else None) or Decimal(0)
 
             if (monthly_wagered + bet_amount) > limits.monthly_bet_limit:
                 raise HTTPException(
@@ -57,53 +59,67 @@ class LimitService:
         # 3. Check Daily Loss Limit (Net Loss Today)
         # Loss Limit usually means: Stop if (TotalBets - TotalWins) > Limit
         if limits.daily_loss_limit and limits.daily_loss_limit > 0:
-            # Get stats for today
-            stats = db.query(
-                func.sum(Bet.bet_amount).label("total_bet"),
-                func.sum(Bet.payout_amount).label("total_payout")
-            ).join(GameRound).join(GameSession).filter(
-                GameSession.user_id == user_id,
-                Bet.bet_status != BetStatus.cancelled,
-                GameSession.started_at >= today_start
-            ).first()
-
-            total_bet = (stats.total_bet or Decimal(0))
-            total_payout = (stats.total_payout or Decimal(0))
+            total_payout = (daily.total_payout if daily else None) or Decimal(0)
             
             # Current Net Loss (Positive number means player lost money)
-            current_net_loss = total_bet - total_payout
-            
-            # If we place this bet, assuming we lose it immediately (worst case for limit check)
-            # or simply checking if we are ALREADY past the limit to stop further play.
-            # Usually, loss limits stop you from opening new positions if you are down X amount.
+            current_net_loss = daily_wagered - total_payout
             
+            # Loss limits stop you from opening new positions if you are ALREADY down X amount.
             if current_net_loss >= limits.daily_loss_limit:
                  raise HTTPException(
                     status_code=400, 
                     detail=f"Daily loss limit of {limits.daily_loss_limit} reached."
                 )
 
+    @staticmethod
+    def _needs(limits: ResponsibleLimit):
+        needs_daily = bool(
+            (limits.daily_bet_limit and limits.daily_bet_limit > 0) or
+            (limits.daily_loss_limit and limits.daily_loss_limit > 0)
+        )
+        needs_monthly = bool(limits.monthly_bet_limit and limits.monthly_bet_limit > 0)
+        return needs_daily, needs_monthly
+
+    @staticmethod
+    def check_bet_limits(db: Session, user_id: int, bet_amount: Decimal):
+        """
+        Checks if placing a bet violates any set limits.
+        Raises HTTPException if limit is exceeded.
+        """
+        limits = LimitService.get_user_limits(db, user_id)
+        if not limits:
+            return # No limits set
+
+        today_start, month_start = LimitService._periods()
+        needs_daily, needs_monthly = LimitService._needs(limits)
+        daily = db.execute(LimitService._wager_stmt(user_id, today_start)).first() if needs_daily else None
+        monthly = db.execute(LimitService._wager_stmt(user_id, month_start)).first() if needs_monthly else None
+
+        LimitService._enforce(limits, bet_amount, daily, monthly)
+
+    @staticmethod
+    async def check_bet_limits_async(db: AsyncSession, user_id: int, bet_amount: Decimal):
+        """Non-blocking variant of check_bet_limits for AsyncSession callers"""
+        limits = (await db.execute(
+            select(ResponsibleLimit).where(ResponsibleLimit.user_id == user_id)
+        )).scalar_one_or_none()
+        if not limits:
+            return # No limits set
+
+        today_start, month_start = LimitService._periods()
+        needs_daily, needs_monthly = LimitService._needs(limits)
+        daily = (await db.execute(LimitService._wager_stmt(user_id, today_start))).first() if needs_daily else None
+        monthly = (await db.execute(LimitService._wager_stmt(user_id, month_start))).first() if needs_monthly else None
+
+        LimitService._enforce(limits, bet_amount, daily, monthly)
+
     @staticmethod
     def get_usage_stats(db: Session, user_id: int):
         """Helper to get current usage for UI"""
-        now = datetime.now(timezone.utc)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        today_start, month_start = LimitService._periods()
 
-        daily_stats = db.query(
-            func.sum(Bet.bet_amount).label("total_bet"),
-            func.sum(Bet.payout_amount).label("total_payout")
-        ).join(GameRound).join(GameSession).filter(
-            GameSession.user_id == user_id,
-            Bet.bet_status != BetStatus.cancelled,
-            GameSession.started_at >= today_start
-        ).first()
-
-        monthly_wager = db.query(func.sum(Bet.bet_amount)).join(GameRound).join(GameSession).filter(
-            GameSession.user_id == user_id,
-            Bet.bet_status != BetStatus.cancelled,
-            GameSession.started_at >= month_start
-        ).scalar() or Decimal(0)
+        daily_stats = db.execute(LimitService._wager_stmt(user_id, today_start)).first()
+        monthly_wager = db.execute(LimitService._wager_stmt(user_id, month_start)).first().total_bet or Decimal(0)
 
         daily_bet = daily_stats.total_bet or Decimal(0)
         daily_payout = daily_stats.total_payout or Decimal(0)
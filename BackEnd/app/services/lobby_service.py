@@ -0,0 +1,79 @@
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..models.game import TenantGame, ProviderGame, Game, GameProvider
+from ..redis_client import CacheManager, AsyncCacheManager
+
+
+def _catalog_key(tenant_id: int) -> str:
+    return f"lobby:{tenant_id}"
+
+
+class LobbyService:
+    """
+    Per-tenant lobby catalog, cached in both cache tiers under lobby:{tenant_id}.
+    Anything that changes what a tenant's lobby shows (tenant game toggles, provider status,
+    catalog adds) must call one of the invalidate_* helpers after its commit.
+    """
+
+    @staticmethod
+    def _catalog_stmt(tenant_id: int):
+        # One round trip: the joins that filter the rows also populate the relationships
+        return (
+            select(TenantGame)
+            .join(TenantGame.provider_game)
+            .join(ProviderGame.game)
+            .join(ProviderGame.provider)
+            .options(
+                contains_eager(TenantGame.provider_game).contains_eager(ProviderGame.game),
+                contains_eager(TenantGame.provider_game).contains_eager(ProviderGame.provider)
+            )
+            .where(
+                TenantGame.tenant_id == tenant_id,
+                TenantGame.is_active == True,
+                GameProvider.is_active == True
+            )
+            .order_by(Game.game_name, GameProvider.provider_name)
+        )
+
+    @staticmethod
+    def _to_items(tenant_games) -> List[dict]:
+        return [
+            {
+                "game_id": tg.provider_game.game.game_id,
+                "game_name": tg.provider_game.game.game_name,
+                "provider_name": tg.provider_game.provider.provider_name,
+                "rtp_percent": float(tg.provider_game.game.rtp_percent)
+            }
+            for tg in tenant_games
+        ]
+
+    @staticmethod
+    async def tenant_catalog_async(db: AsyncSession, tenant_id: int) -> List[dict]:
+        cached = await AsyncCacheManager.get(_catalog_key(tenant_id))
+        if cached is not None:
+            return cached
+        result = await db.execute(LobbyService._catalog_stmt(tenant_id))
+        catalog = LobbyService._to_items(result.scalars().unique().all())
+        await AsyncCacheManager.set(_catalog_key(tenant_id), catalog, ttl=settings.LOBBY_CACHE_TTL)
+        return catalog
+
+    @staticmethod
+    def invalidate_tenant(tenant_id: int):
+        CacheManager.delete(_catalog_key(tenant_id))
+
+    @staticmethod
+    def invalidate_provider(db: Session, provider_id: int):
+        """Drop the lobby of every tenant subscribed to any game of this provider"""
+        tenant_ids = db.execute(
+            select(TenantGame.tenant_id).distinct()
+            .join(ProviderGame, TenantGame.provider_game_id == ProviderGame.id)
+            .where(ProviderGame.provider_id == provider_id)
+        ).scalars().all()
+        for tenant_id in tenant_ids:
+            LobbyService.invalidate_tenant(tenant_id)
+
+
+lobby_service = LobbyService()
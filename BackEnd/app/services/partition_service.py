@@ -0,0 +1,104 @@
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from datetime import date, datetime, timezone
+from typing import List
+import logging
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Detach order matters: bet references game_round, which references game_session
+PARTITIONED_TABLES = ["bet", "game_round", "game_session"]
+
+LIST_PARTITIONS_SQL = text("""
+    SELECT child.relname
+    FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = :parent
+    ORDER BY child.relname
+""")
+
+# Foreign keys a detached partition keeps to the partitioned parents (bet -> game_round -> game_session)
+PARENT_FOREIGN_KEYS_SQL = text("""
+    SELECT con.conname
+    FROM pg_constraint con
+    JOIN pg_class ref ON ref.oid = con.confrelid
+    WHERE con.conrelid = CAST(:child AS regclass)
+      AND con.contype = 'f'
+      AND ref.relname = ANY(:parents)
+""")
+
+
+def _month_of(partition_name: str, parent: str):
+    """bet_2025_01 -> date(2025, 1, 1); None for the DEFAULT partition or foreign names"""
+    suffix = partition_name[len(parent) + 1:]
+    try:
+        return datetime.strptime(suffix, "%Y_%m").date()
+    except ValueError:
+        return None
+
+
+def _months_before(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class PartitionService:
+    """Monthly partitions of game_session, game_round and bet (see sql/casino_db.sql)"""
+
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: int = None):
+        """Create this month's and the next `months_ahead` months' partitions if missing"""
+        months_ahead = settings.PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+        for table in reversed(PARTITIONED_TABLES):
+            db.execute(
+                text("SELECT ensure_monthly_partitions(:parent, 0, :ahead)"),
+                {"parent": table, "ahead": months_ahead}
+            )
+        db.commit()
+
+    @staticmethod
+    def list_partitions(db: Session, parent: str) -> List[str]:
+        return [row[0] for row in db.execute(LIST_PARTITIONS_SQL, {"parent": parent})]
+
+    @staticmethod
+    def archive_old_partitions(db: Session, retention_months: int = None, drop: bool = False) -> List[str]:
+        """
+        Detach month partitions older than the retention window and move them to the archive schema
+        (or drop them). Archived months drop out of every live query; the analytics rollups keep their totals,
+        so do not backfill rollups over archived months.
+
+        A detached partition keeps its foreign key to the parent table (bet_2025_01 -> game_round), which would
+        stop that parent's month from being detached next, so archived partitions lose those foreign keys.
+        """
+        retention_months = settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+        cutoff = _months_before(datetime.now(timezone.utc).date().replace(day=1), retention_months)
+        archive_schema = settings.PARTITION_ARCHIVE_SCHEMA
+
+        if not drop:
+            db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"'))
+
+        archived = []
+        for table in PARTITIONED_TABLES:
+            for name in PartitionService.list_partitions(db, table):
+                month = _month_of(name, table)
+                if month is None or month >= cutoff:
+                    continue
+                db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+                if drop:
+                    db.execute(text(f'DROP TABLE "{name}"'))
+                else:
+                    for constraint in db.execute(PARENT_FOREIGN_KEYS_SQL, {"child": name, "parents": PARTITIONED_TABLES}).scalars().all():
+                        db.execute(text(f'ALTER TABLE "{name}" DROP CONSTRAINT "{constraint}"'))
+                    db.execute(text(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"'))
+                archived.append(name)
+
+        db.commit()
+        if archived:
+            logger.info(f"{'Dropped' if drop else 'Archived'} partitions older than {cutoff}: {archived}")
+        return archived
+
+
+partition_service = PartitionService()
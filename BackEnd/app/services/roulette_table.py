@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import secrets
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import select, insert, update, bindparam, and_, tuple_, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..config import settings
+from ..database import AsyncSessionLocal
+from ..models.game import Game, GameSession, GameRound, Bet, BetStatus
+from ..models.wallet import LedgerEntryType
+from ..redis_client import AsyncCacheManager
+from .game_engines.roulette_engine import RouletteEngine
+from .jackpot_service import jackpot_service
+from .ledger_service import LedgerService
+from .wallet_service import wallet_service
+
+logger = logging.getLogger(__name__)
+
+# The first batch settled for a round stores its number; every later batch, on any worker, reads it back.
+# A concurrent insert for the same round waits for the other transaction, then inserts nothing.
+SPIN_INSERT_SQL = text("""
+    INSERT INTO roulette_table_spin (tenant_id, round_no, winning_number)
+    VALUES (:tenant_id, :round_no, :candidate)
+    ON CONFLICT (tenant_id, round_no) DO NOTHING
+    RETURNING winning_number
+""")
+
+# Separate statement: under READ COMMITTED it sees the row the conflicting transaction committed
+SPIN_SELECT_SQL = text("""
+    SELECT winning_number FROM roulette_table_spin WHERE tenant_id = :tenant_id AND round_no = :round_no
+""")
+
+CHANNEL = "roulette_channel_{tenant_id}"
+
+# Settlement updates, one row each by primary and partition key (executemany)
+_settle_bet_stmt = update(Bet.__table__).where(
+    Bet.__table__.c.bet_id == bindparam("b_id"),
+    Bet.__table__.c.started_at == bindparam("b_started_at")
+).values(payout_amount=bindparam("b_payout"), bet_status=bindparam("b_status"))
+
+_settle_round_stmt = update(GameRound.__table__).where(
+    GameRound.__table__.c.round_id == bindparam("b_id"),
+    GameRound.__table__.c.started_at == bindparam("b_started_at")
+).values(outcome=bindparam("b_outcome"))
+
+_close_session_stmt = update(GameSession.__table__).where(
+    GameSession.__table__.c.session_id == bindparam("b_id"),
+    GameSession.__table__.c.started_at == bindparam("b_started_at")
+).values(ended_at=bindparam("b_ended_at"))
+
+
+class RouletteTableService:
+    """
+    Shared-wheel roulette: one spin per tenant table every ROULETTE_TABLE_ROUND_SECONDS.
+
+    Rounds are numbered by wall clock (round_no = now // round length), so every worker agrees on
+    which round is open without talking to the others. A slip is written when it is placed, in the
+    transaction that takes its stake: a game_session left open (ended_at NULL), a game_round whose
+    outcome holds the table round and the bets, and one placed bet row per bet. Nothing is held in
+    memory, so a crash or restart loses no stakes.
+
+    Every worker polls for open table sessions of rounds that closed at least SETTLE_GRACE_SECONDS
+    ago, locks them (SKIP LOCKED, so workers split the work), reads or sets the round's number in
+    roulette_table_spin (so all settle against the same spin), settles them in one transaction and pushes
+    the result to roulette_channel_{tenant_id}. A round is never spun while it is still open.
+    """
+
+    # Placement re-checks the round before committing; this covers that commit
+    SETTLE_GRACE_SECONDS = 2
+    SETTLE_BATCH = 500
+
+    def __init__(self):
+        self.engine = RouletteEngine()
+        self._task: Optional[asyncio.Task] = None
+        self._game_id: Optional[int] = None
+        self._rtp_multiplier = Decimal("1")
+
+    @staticmethod
+    def round_seconds() -> int:
+        return settings.ROULETTE_TABLE_ROUND_SECONDS
+
+    def current_round(self) -> Tuple[int, datetime]:
+        """Open round number and when it closes"""
+        round_no = int(time.time() // self.round_seconds())
+        return round_no, self.round_start(round_no + 1)
+
+    def round_start(self, round_no: int) -> datetime:
+        return datetime.fromtimestamp(round_no * self.round_seconds(), tz=timezone.utc)
+
+    async def _roulette_game(self, db: AsyncSession) -> int:
+        if self._game_id is None:
+            game = (await db.execute(select(Game).where(Game.game_name == "Roulette"))).scalars().first()
+            if not game:
+                game = Game(game_name="Roulette", rtp_percent=Decimal("97.3"))
+                db.add(game)
+                await db.flush()
+            self._game_id = game.game_id
+            # Same RTP adjustment credit_winnings applies to private spins
+            if game.rtp_percent:
+                self._rtp_multiplier = game.rtp_percent / Decimal("100")
+        return self._game_id
+
+    # ---------- Placement ----------
+
+    async def place_slip(self, db: AsyncSession, user_id: int, tenant_id: int, bets: List[Dict], total_bet: Decimal) -> Dict:
+        """Take the stake and record the slip as placed bets on the open round, in one transaction"""
+        round_no, closes_at = self.current_round()
+        txn_details = await wallet_service.process_game_bet_async(db, user_id, tenant_id, total_bet, commit=False)
+        game_id = await self._roulette_game(db)
+
+        started_at = self.round_start(round_no)
+        session = GameSession(user_id=user_id, game_id=game_id, started_at=started_at)
+        db.add(session)
+        await db.flush()
+        round_obj = GameRound(
+            session_id=session.session_id,
+            started_at=started_at,
+            round_number=1,
+            outcome={
+                "table_round": round_no,
+                "bets": [{"bet_type": bet["bet_type"], "bet_value": bet["bet_value"]} for bet in bets]
+            }
+        )
+        db.add(round_obj)
+        await db.flush()
+        await db.execute(insert(Bet), [
+            {
+                "round_id": round_obj.round_id,
+                "started_at": started_at,
+                "user_id": user_id,
+                "tenant_id": tenant_id,
+                "game_id": game_id,
+                "wallet_id": txn_details["primary_wallet_id"],
+                "bet_amount": bet["bet_amount"],
+                "payout_amount": Decimal("0"),
+                "bet_status": BetStatus.placed
+            }
+            for bet in bets
+        ])
+
+        # The round may have closed while the stake was taken: never accept a bet on a closed round
+        if self.current_round()[0] != round_no:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail="This round has closed, please bet on the next one")
+        await db.commit()
+
+        txn_details["jackpot_result"] = await jackpot_service.process_spin_async(db, user_id, tenant_id, txn_details["deducted_cash"])
+        return {"round": round_no, "closes_at": closes_at, "session_id": session.session_id, **txn_details}
+
+    async def pending_for(self, db: AsyncSession, tenant_id: int, user_id: int) -> List[Dict]:
+        """The player's placed slips that are not settled yet"""
+        game_id = await self._roulette_game(db)
+        rows = (await db.execute(
+            select(GameRound.round_id, GameRound.outcome, Bet.bet_amount)
+            .join(GameSession, and_(
+                GameSession.session_id == GameRound.session_id,
+                GameSession.started_at == GameRound.started_at
+            ))
+            .join(Bet, and_(Bet.round_id == GameRound.round_id, Bet.started_at == GameRound.started_at))
+            .where(
+                GameSession.user_id == user_id,
+                GameSession.game_id == game_id,
+                GameSession.ended_at.is_(None),
+                Bet.tenant_id == tenant_id,
+                Bet.bet_status == BetStatus.placed
+            )
+            .order_by(GameRound.round_id, Bet.bet_id)
+        )).all()
+        slips = []
+        for _, group in groupby(rows, key=lambda row: row.round_id):
+            group = list(group)
+            outcome = group[0].outcome
+            slips.append({
+                "round": outcome["table_round"],
+                "bets": [{**bet, "bet_amount": row.bet_amount} for bet, row in zip(outcome["bets"], group)],
+                "total_bet": sum((row.bet_amount for row in group), Decimal("0"))
+            })
+        return slips
+
+    # ---------- Spin ----------
+
+    async def _spin(self, db: AsyncSession, tenant_id: int, round_no: int) -> Tuple[int, bool]:
+        """The round's winning number, and whether this batch spun it (committed with the batch)"""
+        params = {"tenant_id": tenant_id, "round_no": round_no, "candidate": secrets.randbelow(37)}
+        winning_number = (await db.execute(SPIN_INSERT_SQL, params)).scalar_one_or_none()
+        if winning_number is not None:
+            return winning_number, True
+        return (await db.execute(SPIN_SELECT_SQL, params)).scalar_one(), False
+
+    # ---------- Settlement ----------
+
+    async def _claim_closed(self, db: AsyncSession, game_id: int, before_round: int):
+        """Lock a batch of unsettled table slips from closed rounds (other workers skip them)"""
+        return (await db.execute(
+            select(GameSession, GameRound)
+            .join(GameRound, and_(
+                GameRound.session_id == GameSession.session_id,
+                GameRound.started_at == GameSession.started_at
+            ))
+            .where(
+                GameSession.game_id == game_id,
+                GameSession.ended_at.is_(None),
+                GameSession.started_at < self.round_start(before_round),
+                GameRound.outcome["table_round"].is_not(None)
+            )
+            .order_by(GameSession.started_at, GameSession.session_id)
+            .limit(self.SETTLE_BATCH)
+            .with_for_update(of=GameSession, skip_locked=True)
+        )).all()
+
+    async def settle_closed(self) -> List[Dict]:
+        """Settle every closed round's slips (any worker's), one transaction per batch"""
+        round_no = int((time.time() - self.SETTLE_GRACE_SECONDS) // self.round_seconds())
+        settled = []
+        async with AsyncSessionLocal() as db:
+            game_id = await self._roulette_game(db)
+            while True:
+                claimed = await self._claim_closed(db, game_id, round_no)
+                if not claimed:
+                    await db.rollback()
+                    break
+                settled.extend(await self._settle_batch(db, claimed))
+        return settled
+
+    async def _settle_batch(self, db: AsyncSession, claimed) -> List[Dict]:
+        round_keys = [(round_obj.round_id, round_obj.started_at) for _, round_obj in claimed]
+        bets = (await db.execute(
+            select(Bet).where(
+                tuple_(Bet.round_id, Bet.started_at).in_(round_keys),
+                Bet.bet_status == BetStatus.placed
+            ).order_by(Bet.bet_id)
+        )).scalars().all()
+        bets_by_round: Dict[int, List[Bet]] = {}
+        for bet in bets:
+            bets_by_round.setdefault(bet.round_id, []).append(bet)
+
+        tables: Dict[Tuple[int, int], List] = {}
+        for session, round_obj in claimed:
+            round_bets = bets_by_round.get(round_obj.round_id, [])
+            if round_bets:
+                tables.setdefault((round_bets[0].tenant_id, round_obj.outcome["table_round"]), []).append(
+                    (session, round_obj, round_bets)
+                )
+
+        ended_at = datetime.now(timezone.utc)
+        updates, outcomes, credits, messages, summaries = [], [], [], [], []
+        for (tenant_id, round_no), slips in tables.items():
+            winning_number, spun_here = await self._spin(db, tenant_id, round_no)
+            player_totals = []
+            for session, round_obj, round_bets in slips:
+                slip = [
+                    {**bet, "bet_amount": row.bet_amount}
+                    for bet, row in zip(round_obj.outcome["bets"], round_bets)
+                ]
+                # Validated when placed; compiled again here since only the bets are stored
+                result = self.engine.resolve_slip(slip, self.engine.compile_slip(slip), winning_number)
+                total_payout = Decimal("0")
+                for row, bet_result in zip(round_bets, result["bet_results"]):
+                    payout = (bet_result["payout"] * self._rtp_multiplier).quantize(Decimal("0.01"))
+                    total_payout += payout
+                    updates.append({
+                        "b_id": row.bet_id,
+                        "b_started_at": row.started_at,
+                        "b_payout": payout,
+                        "b_status": BetStatus.won if bet_result["won"] else BetStatus.lost
+                    })
+                    if payout > 0:
+                        credits.append((row.wallet_id, payout, row.bet_id))
+                outcomes.append({
+                    "b_id": round_obj.round_id,
+                    "b_started_at": round_obj.started_at,
+                    "b_outcome": {**round_obj.outcome, "winning_number": winning_number}
+                })
+                player_totals.append({
+                    "user_id": session.user_id,
+                    "total_bet": str(sum((row.bet_amount for row in round_bets), Decimal("0"))),
+                    "total_payout": str(total_payout)
+                })
+
+            channel = CHANNEL.format(tenant_id=tenant_id)
+            if spun_here:
+                messages.append((channel, {
+                    "type": "roulette_spin",
+                    "tenant_id": tenant_id,
+                    "round": round_no,
+                    "winning_number": winning_number,
+                    "color": self.engine.get_color(winning_number)
+                }))
+            messages.append((channel, {
+                "type": "roulette_settled",
+                "tenant_id": tenant_id,
+                "round": round_no,
+                "winning_number": winning_number,
+                "results": player_totals
+            }))
+            summaries.append({"tenant_id": tenant_id, "round": round_no, "winning_number": winning_number, "slips": len(slips)})
+
+        # Every claimed session is closed, including any whose bets were settled or cancelled by hand
+        await db.execute(_close_session_stmt, [
+            {"b_id": session.session_id, "b_started_at": session.started_at, "b_ended_at": ended_at}
+            for session, _ in claimed
+        ])
+        if outcomes:
+            await db.execute(_settle_round_stmt, outcomes)
+        if updates:
+            await db.execute(_settle_bet_stmt, updates)
+        # Payouts are ledger appends; the projector folds them into the cash wallets
+        for wallet_id, payout, bet_id in credits:
+            LedgerService.credit(db, wallet_id, payout, LedgerEntryType.payout, bet_id)
+        await db.commit()
+
+        await AsyncCacheManager.publish_many(messages)
+        for summary in summaries:
+            logger.info(f"Roulette table settled: {summary}")
+        return summaries
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(1)
+            try:
+                await self.settle_closed()
+            except Exception as e:
+                # Slips stay placed in the database; the next tick (or another worker) retries
+                logger.error(f"Roulette table settlement failed: {e}")
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop polling. Open rounds are left alone: their slips are settled once the round closes."""
+        if self._task:
+            self._task.cancel()
+
+
+roulette_tables = RouletteTableService()
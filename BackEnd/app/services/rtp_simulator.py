@@ -0,0 +1,340 @@
+"""
+Monte Carlo RTP check for the game engines.
+
+Rounds are played through the real engines (services/game_engines) with a fixed player strategy
+per game and a stake of 1. The run is split into chunks of --chunk-size rounds that execute in a
+process pool. Each chunk reseeds the RNG from (seed, game, chunk index), so a report can be
+reproduced exactly from its seed, whatever the number of workers.
+
+Settlement pays players less than the engine returns: credit_winnings (and autoplay and the shared
+roulette table) multiply every payout by game.rtp_percent / 100 again. The report therefore has both
+engine_rtp (returned / staked, as the engine computes it) and rtp, what players are actually paid
+after that adjustment (before cent rounding). Multipliers default to the rtp_percent each router
+creates its Game row with; pass --settlement-rtp game=percent when the database holds another value.
+
+Per game the report also has house edge, per-round variance, hit frequency and a normal-approximation
+confidence interval, all on the paid figures. A game passes when its advertised RTP (GET /games) is
+inside the paid interval widened by --tolerance. The exit status is 1 when any game fails, so a
+release pipeline can gate on it:
+
+    python -m app.services.rtp_simulator --rounds 100000000 --report rtp_report.json
+    python -m app.services.rtp_simulator --game slots --game dice --rounds 2000000 --workers 8
+    python -m app.services.rtp_simulator --game roulette --settlement-rtp roulette=100
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from decimal import Decimal
+from statistics import NormalDist
+from typing import Dict, List
+
+from .game_engines.slots_engine import SlotsEngine, np as slots_np
+from .game_engines.roulette_engine import RouletteEngine
+from .game_engines.dice_engine import DiceEngine
+from .game_engines.mines_engine import MinesEngine
+from .game_engines.blackjack_engine import BlackjackEngine, card_value, is_soft
+
+# As advertised by GET /games (main.py)
+ADVERTISED_RTP = {
+    "blackjack": 0.995,
+    "roulette": 0.973,
+    "dice": 0.99,
+    "mines": 0.98,
+    "slots": 0.96,
+}
+
+# Game.rtp_percent the routers create each game with; settlement multiplies payouts by it / 100
+SETTLEMENT_RTP_PERCENT = {
+    "blackjack": 99.5,
+    "roulette": 97.3,
+    "dice": 99.0,
+    "mines": 98.0,
+    "slots": 96.0,
+}
+
+DEFAULT_STRATEGY = {
+    "roulette_bet": "red",
+    "dice_target": 50.0,
+    "dice_roll_over": True,
+    "mines_count": 5,
+    "mines_reveals": 1,
+}
+
+
+def _chunk_seed(seed: int, game: str, chunk: int) -> int:
+    digest = hashlib.sha256(f"{seed}:{game}:{chunk}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+# ---- one round per game: returns (staked, returned) for a base stake of 1 ----
+
+def _slots_round(engine: SlotsEngine, strategy: dict):
+    wins = engine.check_winning_lines(engine.spin())
+    return 1, sum(win["multiplier"] for win in wins)
+
+
+def _roulette_round(engine: RouletteEngine, strategy: dict):
+    bet_type = strategy["roulette_bet"]
+    bet_value = random.randint(0, 36) if bet_type == "straight" else None
+    if engine.check_bet(bet_type, bet_value, engine.spin()):
+        return 1, float(engine.get_payout_multiplier(bet_type)) + 1
+    return 1, 0
+
+
+def _dice_round(engine: DiceEngine, strategy: dict, nonce: int):
+    # Server seeds come from the chunk RNG instead of secrets so runs are reproducible
+    server_seed = "%064x" % random.getrandbits(256)
+    roll = engine.roll_dice(server_seed, "rtp-simulator", nonce)
+    target, roll_over = strategy["dice_target"], strategy["dice_roll_over"]
+    if engine.check_win(roll, target, roll_over):
+        return 1, float(engine.calculate_multiplier(target, roll_over))
+    return 1, 0
+
+
+def _mines_round(engine: MinesEngine, strategy: dict):
+    engine.start_game()
+    for position in random.sample(range(engine.grid_size), strategy["mines_reveals"]):
+        if engine.reveal_tile(position)["is_mine"]:
+            return 1, 0
+    if not engine.game_over:
+        engine.cash_out()
+    return 1, float(engine.calculate_payout(Decimal("1")))
+
+
+def _blackjack_action(engine: BlackjackEngine) -> str:
+    """Basic strategy within the engine's rules (no splits, double on any first two cards)"""
+    total = engine.calculate_hand_value(engine.player_hand)
+    up = card_value(engine.dealer_hand[0])
+    soft = is_soft(engine.player_hand)
+    can_double = len(engine.player_hand) == 2
+
+    if soft:
+        if total >= 19 or (total == 18 and up in (2, 7, 8)):
+            return "stand"
+        if can_double and (total in (17, 18) and 3 <= up <= 6 or total in (15, 16) and 4 <= up <= 6
+                           or total in (13, 14) and 5 <= up <= 6):
+            return "double"
+        return "stand" if total == 18 and up <= 6 else "hit"
+
+    if can_double and (total == 11 or total == 10 and up <= 9 or total == 9 and 3 <= up <= 6):
+        return "double"
+    if total >= 17 or (13 <= total <= 16 and up <= 6) or (total == 12 and 4 <= up <= 6):
+        return "stand"
+    return "hit"
+
+
+def _blackjack_round(engine: BlackjackEngine, strategy: dict):
+    engine.start_game()
+    stake = Decimal("1")
+    while not engine.game_over:
+        action = _blackjack_action(engine)
+        if action == "double":
+            stake = Decimal("2")
+            engine.double_down()
+        elif action == "hit":
+            engine.hit()
+        else:
+            engine.stand()
+    return float(stake), float(engine.calculate_payout(stake))
+
+
+GAMES = {
+    "slots": _slots_round,
+    "roulette": _roulette_round,
+    "dice": _dice_round,
+    "mines": _mines_round,
+    "blackjack": _blackjack_round,
+}
+
+
+def _make_engine(game: str, strategy: dict):
+    if game == "mines":
+        return MinesEngine(num_mines=strategy["mines_count"])
+    return {"slots": SlotsEngine, "roulette": RouletteEngine, "dice": DiceEngine, "blackjack": BlackjackEngine}[game]()
+
+
+def _empty_totals() -> dict:
+    return {"rounds": 0, "hits": 0, "staked": 0.0, "returned": 0.0,
+            "staked_sq": 0.0, "returned_sq": 0.0, "cross": 0.0, "max_return": 0.0}
+
+
+def _slots_batch_chunk(engine: SlotsEngine, rounds: int, seed: int) -> dict:
+    multipliers = engine.spin_batch(rounds, seed=seed)["multipliers"]
+    totals = _empty_totals()
+    totals.update({
+        "rounds": rounds,
+        "hits": int((multipliers > 0).sum()),
+        "staked": float(rounds),
+        "returned": float(multipliers.sum()),
+        "staked_sq": float(rounds),
+        "returned_sq": float((multipliers * multipliers).sum()),
+        "cross": float(multipliers.sum()),
+        "max_return": float(multipliers.max(initial=0.0)),
+    })
+    return totals
+
+
+def simulate_chunk(game: str, chunk: int, rounds: int, seed: int, strategy: dict) -> dict:
+    """Play `rounds` rounds of one game on a freshly seeded RNG and return running sums"""
+    if game == "slots" and slots_np is not None:
+        # Vectorized spins, scored exactly like check_winning_lines
+        return _slots_batch_chunk(SlotsEngine(), rounds, _chunk_seed(seed, game, chunk))
+
+    # The engines draw from the module-level RNG, so seeding it seeds them
+    random.seed(_chunk_seed(seed, game, chunk))
+    play = GAMES[game]
+    engine = _make_engine(game, strategy)
+
+    totals = _empty_totals()
+    base_nonce = chunk * rounds
+    for i in range(rounds):
+        if game == "dice":
+            staked, returned = play(engine, strategy, base_nonce + i)
+        else:
+            staked, returned = play(engine, strategy)
+        totals["staked"] += staked
+        totals["returned"] += returned
+        totals["staked_sq"] += staked * staked
+        totals["returned_sq"] += returned * returned
+        totals["cross"] += staked * returned
+        if returned > 0:
+            totals["hits"] += 1
+            if returned > totals["max_return"]:
+                totals["max_return"] = returned
+    totals["rounds"] = rounds
+    return totals
+
+
+def _merge(into: dict, totals: dict):
+    for key, value in totals.items():
+        into[key] = max(into[key], value) if key == "max_return" else into[key] + value
+
+
+def summarize(game: str, totals: dict, confidence: float, tolerance: float, settlement: float = 1.0) -> dict:
+    """`settlement` is the payout multiplier applied when a round is settled (rtp_percent / 100)"""
+    n = totals["rounds"]
+    engine_rtp = totals["returned"] / totals["staked"]
+    # Every payout is scaled by the same factor, so the paid figures are the engine's scaled
+    rtp = engine_rtp * settlement
+    mean_stake = totals["staked"] / n
+    # Per-round variance of what is paid (per unit of base stake)
+    variance = max(totals["returned_sq"] / n - (totals["returned"] / n) ** 2, 0.0) * settlement ** 2
+    # Ratio estimator: RTP = sum(returned) / sum(staked), stakes vary with blackjack doubles
+    residual = max((totals["returned_sq"] - 2 * engine_rtp * totals["cross"]
+                    + engine_rtp * engine_rtp * totals["staked_sq"]) / n, 0.0)
+    std_error = math.sqrt(residual / n) / mean_stake * settlement
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    ci_low, ci_high = rtp - z * std_error, rtp + z * std_error
+    advertised = ADVERTISED_RTP.get(game)
+    return {
+        "rounds": n,
+        "rtp": round(rtp, 6),
+        "engine_rtp": round(engine_rtp, 6),
+        "settlement_multiplier": settlement,
+        "house_edge": round(1 - rtp, 6),
+        "variance": round(variance, 6),
+        "std_dev": round(math.sqrt(variance), 6),
+        "hit_frequency": round(totals["hits"] / n, 6),
+        "max_return": totals["max_return"] * settlement,
+        "std_error": round(std_error, 8),
+        "ci_low": round(ci_low, 6),
+        "ci_high": round(ci_high, 6),
+        "advertised_rtp": advertised,
+        "passed": advertised is None or ci_low - tolerance <= advertised <= ci_high + tolerance,
+    }
+
+
+def run(games: List[str], rounds: int, seed: int, workers: int, chunk_size: int,
+        strategy: Dict = None, confidence: float = 0.99, tolerance: float = 0.001,
+        settlement_rtp: Dict[str, float] = None) -> dict:
+    strategy = {**DEFAULT_STRATEGY, **(strategy or {})}
+    settlement_rtp = {**SETTLEMENT_RTP_PERCENT, **(settlement_rtp or {})}
+    started = time.perf_counter()
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for game in games:
+            chunks = [chunk_size] * (rounds // chunk_size) + ([rounds % chunk_size] if rounds % chunk_size else [])
+            futures[game] = [pool.submit(simulate_chunk, game, i, n, seed, strategy) for i, n in enumerate(chunks)]
+        for game, pending in futures.items():
+            totals = _empty_totals()
+            for future in pending:
+                _merge(totals, future.result())
+            results[game] = summarize(game, totals, confidence, tolerance, settlement_rtp[game] / 100)
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "seed": seed,
+        "rounds_per_game": rounds,
+        "chunk_size": chunk_size,
+        "workers": workers,
+        "confidence": confidence,
+        "tolerance": tolerance,
+        "strategy": strategy,
+        "settlement_rtp_percent": {game: settlement_rtp[game] for game in games},
+        "seconds": round(time.perf_counter() - started, 2),
+        "games": results,
+        "passed": all(r["passed"] for r in results.values()),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--game", action="append", dest="games", choices=list(GAMES), help="Game to simulate (repeatable, default all)")
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="Rounds per game")
+    parser.add_argument("--seed", type=int, default=None, help="Base seed (random when omitted, always recorded in the report)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=250_000, help="Rounds per task; also the reseeding unit")
+    parser.add_argument("--confidence", type=float, default=0.99)
+    parser.add_argument("--tolerance", type=float, default=0.001, help="Slack around the interval, in RTP units")
+    parser.add_argument("--roulette-bet", default=DEFAULT_STRATEGY["roulette_bet"])
+    parser.add_argument("--dice-target", type=float, default=DEFAULT_STRATEGY["dice_target"])
+    parser.add_argument("--dice-roll-under", action="store_true")
+    parser.add_argument("--mines-count", type=int, default=DEFAULT_STRATEGY["mines_count"])
+    parser.add_argument("--mines-reveals", type=int, default=DEFAULT_STRATEGY["mines_reveals"])
+    parser.add_argument("--settlement-rtp", action="append", default=[], metavar="GAME=PERCENT",
+                        help="Game.rtp_percent settlement applies, when it differs from the router default (repeatable)")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    settlement_rtp = {}
+    for item in args.settlement_rtp:
+        game, _, percent = item.partition("=")
+        if game not in GAMES or not percent:
+            parser.error(f"--settlement-rtp expects GAME=PERCENT with GAME one of {', '.join(GAMES)}")
+        settlement_rtp[game] = float(percent)
+
+    report = run(
+        games=args.games or list(GAMES),
+        rounds=args.rounds,
+        seed=args.seed if args.seed is not None else random.SystemRandom().getrandbits(63),
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        strategy={
+            "roulette_bet": args.roulette_bet,
+            "dice_target": args.dice_target,
+            "dice_roll_over": not args.dice_roll_under,
+            "mines_count": args.mines_count,
+            "mines_reveals": args.mines_reveals,
+        },
+        confidence=args.confidence,
+        tolerance=args.tolerance,
+        settlement_rtp=settlement_rtp,
+    )
+
+    for game, r in report["games"].items():
+        print(f"{'ok' if r['passed'] else 'FAIL':>4} {game:<10} paid={r['rtp']:.4%} engine={r['engine_rtp']:.4%} "
+              f"ci=[{r['ci_low']:.4%}, {r['ci_high']:.4%}] advertised={r['advertised_rtp']:.2%} "
+              f"hit={r['hit_frequency']:.2%} sd={r['std_dev']:.3f}")
+    print(f"seed={report['seed']} {report['seconds']}s")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(0 if report["passed"] else 1)
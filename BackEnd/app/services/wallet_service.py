@@ -1,12 +1,17 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from decimal import Decimal
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from fastapi import HTTPException, status
 from ..models.game import Bet, Game
 from ..models.user import User
-from ..models.wallet import Wallet, WalletType
+from ..models.wallet import Wallet, WalletType, WalletLedger, LedgerEntryType
 from .limit_service import limit_service
 from .jackpot_service import jackpot_service
+from .ledger_service import LedgerService
+from datetime import datetime, timezone
 
 class WalletService:
     """Server-authoritative wallet service with multi-tenant support"""
@@ -41,7 +46,23 @@ class WalletService:
                     balance=initial_balance,
                     type_of_wallet=wallet_type
                 )
-                db.add(wallet)
+                try:
+                    # Savepoint: a concurrent request may create the same wallet (uq_wallet_user_tenant_type)
+                    with db.begin_nested():
+                        db.add(wallet)
+                        db.flush()
+                        if initial_balance > 0:
+                            # Opening entry so the balance is fully backed by the ledger
+                            db.add(WalletLedger(
+                                wallet_id=wallet.wallet_id,
+                                amount=initial_balance,
+                                before_balance=Decimal("0.00"),
+                                after_balance=initial_balance,
+                                reference_type=LedgerEntryType.opening,
+                                projected_at=datetime.now(timezone.utc)
+                            ))
+                except IntegrityError:
+                    continue
                 wallets.append(wallet)
         
         db.commit()
@@ -68,30 +89,54 @@ class WalletService:
             Wallet.user_id == user_id,
             Wallet.tenant_id == tenant_id
         ).all()
+
+    @staticmethod
+    def wallet_views(db: Session, wallets: List[Wallet]) -> List[Dict]:
+        """Wallets as shown to the player: balance includes credits not yet projected"""
+        pending = LedgerService.pending_credits(db, [w.wallet_id for w in wallets])
+        return [{
+            "wallet_id": w.wallet_id,
+            "user_id": w.user_id,
+            "balance": w.balance + pending.get(w.wallet_id, Decimal("0")),
+            "type_of_wallet": w.type_of_wallet
+        } for w in wallets]
     
     @staticmethod
-    def credit_wallet(db: Session, wallet_id: int, amount: Decimal, commit: bool = True) -> Wallet:
-        """Credit amount to wallet (atomic)"""
+    def credit_wallet(
+        db: Session,
+        wallet_id: int,
+        amount: Decimal,
+        commit: bool = True,
+        reference_type: LedgerEntryType = LedgerEntryType.deposit,
+        reference_id: int = None
+    ) -> Wallet:
+        """Credit amount to wallet (appends a ledger entry; the balance is projected asynchronously)"""
         if amount <= 0:
             raise HTTPException(status_code=400, detail="Amount must be positive")
         
-        wallet = db.query(Wallet).filter(Wallet.wallet_id == wallet_id).with_for_update().first()
+        wallet = db.query(Wallet).filter(Wallet.wallet_id == wallet_id).first()
         if not wallet:
             raise HTTPException(status_code=404, detail="Wallet not found")
         
-        wallet.balance += amount
+        LedgerService.credit(db, wallet_id, amount, reference_type, reference_id)
         if commit:
             db.commit()
-            db.refresh(wallet)
         return wallet
     
     @staticmethod
-    def debit_wallet(db: Session, wallet_id: int, amount: Decimal, commit: bool = True) -> Wallet:
+    def debit_wallet(
+        db: Session,
+        wallet_id: int,
+        amount: Decimal,
+        commit: bool = True,
+        reference_type: LedgerEntryType = LedgerEntryType.withdrawal,
+        reference_id: int = None
+    ) -> Wallet:
         """Debit amount from wallet (atomic with limit and balance check)"""
         if amount <= 0:
             raise HTTPException(status_code=400, detail="Amount must be positive")
         
-        wallet = db.query(Wallet).filter(Wallet.wallet_id == wallet_id).with_for_update().first()
+        wallet = db.query(Wallet).filter(Wallet.wallet_id == wallet_id).first()
         if not wallet:
             raise HTTPException(status_code=404, detail="Wallet not found")
         
@@ -99,10 +144,11 @@ class WalletService:
         if wallet.type_of_wallet == WalletType.cash:
             limit_service.check_bet_limits(db, wallet.user_id, amount)
 
-        if wallet.balance < amount:
+        # Spend against the full balance, including credits not yet projected
+        LedgerService.project(db, [wallet_id], commit=False)
+        if LedgerService.debit(db, wallet_id, amount, reference_type, reference_id) is None:
             raise HTTPException(status_code=400, detail="Insufficient balance")
         
-        wallet.balance -= amount
         if commit:
             db.commit()
             db.refresh(wallet)
@@ -125,12 +171,13 @@ class WalletService:
             Wallet.user_id == user_id, 
             Wallet.tenant_id == tenant_id,
             Wallet.type_of_wallet == WalletType.cash
-        ).with_for_update().first()
+        ).first()
         
         if wallet:
-            wallet.balance += net_payout
+            # Ledger-first: no wallet row lock, the projector folds the payout in
+            if net_payout > 0:
+                LedgerService.credit(db, wallet.wallet_id, net_payout, LedgerEntryType.payout, bet_id)
             db.commit()
-            db.refresh(wallet)
         return wallet
 
     @staticmethod
@@ -140,6 +187,8 @@ class WalletService:
         1. Checks limits.
         2. Deducts up to 20% from Bonus/Points of the CURRENT tenant.
         3. Remainder from Cash of the CURRENT tenant.
+        The tenant's wallets are locked in wallet_id order first; projection and debits run under
+        those locks, and the jackpot runs after the commit.
         """
         if total_bet <= 0:
             raise HTTPException(status_code=400, detail="Bet amount must be positive")
@@ -147,7 +196,49 @@ class WalletService:
         limit_service.check_bet_limits(db, user_id, total_bet)
 
         # Fetch wallets ONLY for the active tenant
-        wallets = db.query(Wallet).filter(Wallet.user_id == user_id, Wallet.tenant_id == tenant_id).all()
+        wallets = db.execute(WalletService._bet_wallets_stmt(user_id, tenant_id, lock=True)).scalars().all()
+        # Split against the full balances, including payouts not yet projected
+        if LedgerService.project(db, [w.wallet_id for w in wallets], commit=False):
+            wallets = db.execute(WalletService._bet_wallets_stmt(user_id, tenant_id, lock=True)).scalars().all()
+        split, debits, points_wallet_id = WalletService._plan_bet_split(wallets, total_bet)
+
+        for wallet_id, amount in debits:
+            if LedgerService.debit(db, wallet_id, amount, LedgerEntryType.bet_stake) is None:
+                db.rollback()
+                raise HTTPException(status_code=409, detail="Balance changed during the bet, please retry")
+
+        if points_wallet_id and split["points_earned"] > 0:
+            LedgerService.credit(db, points_wallet_id, split["points_earned"], LedgerEntryType.points_earned)
+        db.commit()
+
+        # Jackpot Logic (Real cash used in current tenant), in its own short transaction
+        jackpot_result = jackpot_service.process_spin(db, user_id, tenant_id, split["deducted_cash"])
+        
+        return {**split, "jackpot_result": jackpot_result}
+
+    @staticmethod
+    def _bet_wallets_stmt(user_id: int, tenant_id: int, lock: bool = False):
+        """
+        The tenant's wallets. With lock, FOR UPDATE in wallet_id order: the bet paths take every wallet
+        they may touch up front, before projecting. Projection alone would lock only the wallets with
+        pending entries (usually points, the highest id) and let a concurrent bet take cash first.
+        """
+        stmt = select(Wallet).where(
+            Wallet.user_id == user_id,
+            Wallet.tenant_id == tenant_id
+        ).execution_options(populate_existing=True)
+        if lock:
+            stmt = stmt.order_by(Wallet.wallet_id).with_for_update()
+        return stmt
+
+    @staticmethod
+    def _plan_bet_split(wallets: List[Wallet], total_bet: Decimal) -> Tuple[Dict, List[Tuple[int, Decimal]], Optional[int]]:
+        """
+        Split a bet across the tenant's wallets (locked by the caller).
+        Up to 20% comes from Bonus, then Points (10 Points = $1); the rest from Cash.
+        Returns the split, the (wallet_id, amount) debits in wallet_id order, and the wallet that
+        earns loyalty points.
+        """
         cash_wallet = next((w for w in wallets if w.type_of_wallet == WalletType.cash), None)
         bonus_wallet = next((w for w in wallets if w.type_of_wallet == WalletType.bonus), None)
         points_wallet = next((w for w in wallets if w.type_of_wallet == WalletType.points), None)
@@ -175,30 +266,141 @@ class WalletService:
                 detail=f"Insufficient cash in this casino. Need ${required_cash} (Promos cover ${deducted_bonus + deducted_points})"
             )
 
-        # Execution
-        cash_wallet.balance -= required_cash
-        if bonus_wallet:
-            bonus_wallet.balance -= deducted_bonus
-        if points_wallet:
-            points_wallet.balance -= (deducted_points * 10)
-        
-        # Jackpot Logic (Real cash used in current tenant)
-        jackpot_result = jackpot_service.process_spin(db, user_id, tenant_id, required_cash)
+        debits = [(cash_wallet.wallet_id, required_cash)]
+        if deducted_bonus > 0:
+            debits.append((bonus_wallet.wallet_id, deducted_bonus))
+        if deducted_points > 0:
+            debits.append((points_wallet.wallet_id, deducted_points * 10))
+        debits = sorted((d for d in debits if d[1] > 0), key=lambda d: d[0])
         
         # Loyalty Points (Earned in current tenant)
         points_earned = total_bet * Decimal("0.10")
-        if points_wallet:
-            points_wallet.balance += points_earned
 
-        db.commit()
-        
-        return {
+        split = {
             "primary_wallet_id": cash_wallet.wallet_id,
             "deducted_cash": required_cash,
             "deducted_bonus": deducted_bonus,
             "deducted_points": deducted_points * 10,
-            "points_earned": points_earned,
-            "jackpot_result": jackpot_result
+            "points_earned": points_earned
         }
+        return split, debits, points_wallet.wallet_id if points_wallet else None
+
+    # ---------- AsyncSession variants (bet hot path) ----------
+
+    @staticmethod
+    async def get_wallet_async(
+        db: AsyncSession,
+        user_id: int,
+        tenant_id: int,
+        type_of_wallet: WalletType = WalletType.cash
+    ) -> Optional[Wallet]:
+        return (await db.execute(select(Wallet).where(
+            Wallet.user_id == user_id,
+            Wallet.tenant_id == tenant_id,
+            Wallet.type_of_wallet == type_of_wallet
+        ))).scalar_one_or_none()
+
+    @staticmethod
+    async def credit_wallet_async(
+        db: AsyncSession,
+        wallet_id: int,
+        amount: Decimal,
+        commit: bool = True,
+        reference_type: LedgerEntryType = LedgerEntryType.refund,
+        reference_id: int = None
+    ) -> Wallet:
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Amount must be positive")
+        
+        wallet = await db.get(Wallet, wallet_id)
+        if not wallet:
+            raise HTTPException(status_code=404, detail="Wallet not found")
+        
+        LedgerService.credit(db, wallet_id, amount, reference_type, reference_id)
+        if commit:
+            await db.commit()
+        return wallet
+
+    @staticmethod
+    async def debit_wallet_async(
+        db: AsyncSession,
+        wallet_id: int,
+        amount: Decimal,
+        commit: bool = True,
+        reference_type: LedgerEntryType = LedgerEntryType.bet_stake,
+        reference_id: int = None
+    ) -> Wallet:
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Amount must be positive")
+        
+        wallet = await db.get(Wallet, wallet_id)
+        if not wallet:
+            raise HTTPException(status_code=404, detail="Wallet not found")
+        
+        if wallet.type_of_wallet == WalletType.cash:
+            await limit_service.check_bet_limits_async(db, wallet.user_id, amount)
+
+        await LedgerService.project_async(db, [wallet_id])
+        if await LedgerService.debit_async(db, wallet_id, amount, reference_type, reference_id) is None:
+            raise HTTPException(status_code=400, detail="Insufficient balance")
+        
+        if commit:
+            await db.commit()
+        return wallet
+
+    @staticmethod
+    async def credit_winnings_async(db: AsyncSession, user_id: int, amount: Decimal, game_id: int, tenant_id: int, bet_id: int = None):
+        game = await db.get(Game, game_id)
+        rtp_multiplier = (game.rtp_percent / Decimal("100")) if game else Decimal("1")
+        net_payout = (amount * rtp_multiplier).quantize(Decimal("0.01"))
+
+        if bet_id:
+            bet = await db.get(Bet, bet_id)
+            if bet:
+                bet.payout_amount = net_payout
+
+        wallet = (await db.execute(select(Wallet).where(
+            Wallet.user_id == user_id, 
+            Wallet.tenant_id == tenant_id,
+            Wallet.type_of_wallet == WalletType.cash
+        ))).scalar_one_or_none()
+        
+        if wallet and net_payout > 0:
+            LedgerService.credit(db, wallet.wallet_id, net_payout, LedgerEntryType.payout, bet_id)
+        await db.commit()
+        return wallet
+
+    @staticmethod
+    async def process_game_bet_async(db: AsyncSession, user_id: int, tenant_id: int, total_bet: Decimal, commit: bool = True) -> Dict:
+        """
+        Non-blocking variant of process_game_bet (same hybrid Cash + Bonus + Points logic).
+        With commit=False the debits stay in the caller's transaction and the jackpot is not run
+        (jackpot_result is None): the caller commits, then runs it.
+        """
+        if total_bet <= 0:
+            raise HTTPException(status_code=400, detail="Bet amount must be positive")
+        
+        await limit_service.check_bet_limits_async(db, user_id, total_bet)
+
+        # Same lock order as process_game_bet: every wallet up front, then project and debit
+        wallets = (await db.execute(WalletService._bet_wallets_stmt(user_id, tenant_id, lock=True))).scalars().all()
+        if await LedgerService.project_async(db, [w.wallet_id for w in wallets]):
+            wallets = (await db.execute(WalletService._bet_wallets_stmt(user_id, tenant_id, lock=True))).scalars().all()
+        split, debits, points_wallet_id = WalletService._plan_bet_split(wallets, total_bet)
+
+        for wallet_id, amount in debits:
+            if await LedgerService.debit_async(db, wallet_id, amount, LedgerEntryType.bet_stake) is None:
+                await db.rollback()
+                raise HTTPException(status_code=409, detail="Balance changed during the bet, please retry")
+
+        if points_wallet_id and split["points_earned"] > 0:
+            LedgerService.credit(db, points_wallet_id, split["points_earned"], LedgerEntryType.points_earned)
+        if not commit:
+            return {**split, "jackpot_result": None}
+        await db.commit()
+        
+        jackpot_result = await jackpot_service.process_spin_async(db, user_id, tenant_id, split["deducted_cash"])
+        
+        return {**split, "jackpot_result": jackpot_result}
 
 wallet_service = WalletService()
\ No newline at end of file
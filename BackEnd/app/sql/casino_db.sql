@@ -98,10 +98,14 @@ verified_at TIMESTAMPTZ
 CREATE TABLE wallet(
 wallet_id SERIAL PRIMARY KEY,
 user_id INT REFERENCES users(user_id),
+tenant_id INT REFERENCES tenants(tenant_id),
 balance NUMERIC(18,2) DEFAULT 0.00,
 type_of_wallet wallet_type NOT NULL DEFAULT 'cash'
 );
 
+-- One wallet per user, tenant and type; every bet loads the player's wallets for one tenant
+CREATE UNIQUE INDEX uq_wallet_user_tenant_type ON wallet (user_id, tenant_id, type_of_wallet);
+
 CREATE TABLE wallet_transactions(
 txn_id SERIAL PRIMARY KEY,
 wallet_id INT REFERENCES wallet(wallet_id),
@@ -113,17 +117,23 @@ reference_id VARCHAR(40),
 txn_done_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 
--- immutable audit ledger
+-- immutable audit ledger: wallet.balance is a projection of SUM(amount) per wallet.
+-- Debits are projected in the same transaction; credits are appended with projected_at NULL
+-- and folded into wallet.balance by the wallet_ledger worker.
 
 CREATE TABLE wallet_ledger(
 ledger_id SERIAL PRIMARY KEY,
-wallet_id INT REFERENCES wallet(wallet_id),
+wallet_id INT NOT NULL REFERENCES wallet(wallet_id),
+amount NUMERIC(18,2) NOT NULL,
 before_balance NUMERIC(18,2),
 after_balance NUMERIC(18,2),
 reference_type TEXT,
 reference_id INT,
-created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+projected_at TIMESTAMPTZ
 );
+CREATE INDEX idx_wallet_ledger_wallet ON wallet_ledger (wallet_id, ledger_id);
+CREATE INDEX idx_wallet_ledger_pending ON wallet_ledger (wallet_id, ledger_id) WHERE projected_at IS NULL;
 
 -- =========================
 -- GAME PROVIDERS & GAMES
@@ -161,36 +171,98 @@ CREATE TABLE provider_games (
 -- =========================
 -- GAME SESSIONS & ROUNDS
 -- =========================
+-- game_session, game_round and bet are range-partitioned by month on started_at.
+-- Rounds and bets carry a copy of their session's started_at, so a date bound on any
+-- of the three prunes it to the matching months and the keys/foreign keys include it.
+-- Partitions are created ahead of time (and old ones archived) by
+-- app.workers.partition_maintenance; the DEFAULT partitions only catch strays.
+
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent TEXT, months_back INT, months_ahead INT)
+RETURNS void AS $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR i IN -months_back..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::date;
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(month_start, 'YYYY_MM'),
+            parent,
+            month_start::text || ' 00:00:00+00',
+            (month_start + INTERVAL '1 month')::date::text || ' 00:00:00+00'
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
 CREATE TABLE game_session(
-session_id SERIAL PRIMARY KEY,
+session_id SERIAL,
 user_id INT REFERENCES users(user_id),
 game_id INT REFERENCES game(game_id),
 provider_session_ref VARCHAR(64),
-started_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-ended_at TIMESTAMPTZ
-);
+started_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+ended_at TIMESTAMPTZ,
+PRIMARY KEY (session_id, started_at)
+) PARTITION BY RANGE (started_at);
 
 CREATE TABLE game_round(
-round_id SERIAL PRIMARY KEY,
-session_id INT REFERENCES game_session(session_id),
+round_id SERIAL,
+session_id INT,
 round_number INT,
-provider_round_ref VARCHAR(64)
-);
+provider_round_ref VARCHAR(64),
+outcome JSONB,
+started_at TIMESTAMPTZ NOT NULL,
+PRIMARY KEY (round_id, started_at),
+FOREIGN KEY (session_id, started_at) REFERENCES game_session(session_id, started_at)
+) PARTITION BY RANGE (started_at);
 
 -- =========================
 -- BETS
 -- =========================
 
 CREATE TABLE bet(
-bet_id SERIAL PRIMARY KEY,
-round_id INT REFERENCES game_round(round_id),
+bet_id SERIAL,
+round_id INT,
 wallet_id INT REFERENCES wallet(wallet_id),
+-- Denormalized at insert time (session user/game, wallet tenant) so aggregates read bet alone
+user_id INT REFERENCES users(user_id),
+tenant_id INT REFERENCES tenants(tenant_id),
+game_id INT REFERENCES game(game_id),
 bet_amount NUMERIC(18,2) NOT NULL,
 payout_amount NUMERIC(18,2),
 odds NUMERIC(8,4),
 bet_type bet_types DEFAULT 'single_bet',
 bet_status bet_statuses DEFAULT 'placed',
-placed_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+placed_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+started_at TIMESTAMPTZ NOT NULL,
+PRIMARY KEY (bet_id, started_at),
+FOREIGN KEY (round_id, started_at) REFERENCES game_round(round_id, started_at)
+) PARTITION BY RANGE (started_at);
+
+-- Hot-query indexes (created on the parents, so every partition gets them)
+CREATE INDEX idx_game_session_user_started ON game_session (user_id, started_at);
+CREATE INDEX idx_game_session_started ON game_session (started_at);
+CREATE INDEX idx_game_session_open ON game_session (game_id, started_at) WHERE ended_at IS NULL;
+CREATE INDEX idx_game_round_session ON game_round (session_id, started_at);
+CREATE INDEX idx_bet_round ON bet (round_id, started_at);
+CREATE INDEX idx_bet_user_started ON bet (user_id, started_at);
+CREATE INDEX idx_bet_tenant_started ON bet (tenant_id, started_at);
+
+CREATE TABLE game_session_default PARTITION OF game_session DEFAULT;
+CREATE TABLE game_round_default PARTITION OF game_round DEFAULT;
+CREATE TABLE bet_default PARTITION OF bet DEFAULT;
+
+SELECT ensure_monthly_partitions('game_session', 0, 3);
+SELECT ensure_monthly_partitions('game_round', 0, 3);
+SELECT ensure_monthly_partitions('bet', 0, 3);
+
+-- Winning number of each shared roulette table round (round_no = epoch seconds // round length)
+CREATE TABLE roulette_table_spin(
+tenant_id INT NOT NULL REFERENCES tenants(tenant_id),
+round_no BIGINT NOT NULL,
+winning_number SMALLINT NOT NULL CHECK (winning_number BETWEEN 0 AND 36),
+spun_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+PRIMARY KEY (tenant_id, round_no)
 );
 
 -- =========================
@@ -209,6 +281,15 @@ is_active boolean default true,
 updated_at timestamp default current_timestamp
 );
 
+-- Contributions not yet folded into jackpots.current_amount; each bet adds to one random shard.
+-- Live pool = current_amount + SUM(pending_amount). Folded by the jackpot_fold worker and on a win.
+CREATE TABLE jackpot_contribution_shards(
+jackpot_id INT NOT NULL REFERENCES jackpots(jackpot_id),
+shard_no SMALLINT NOT NULL,
+pending_amount NUMERIC(18,6) NOT NULL DEFAULT 0,
+PRIMARY KEY (jackpot_id, shard_no)
+);
+
 CREATE TABLE jackpot_wins(
 jackpot_win_id SERIAL PRIMARY KEY,
 jackpot_id INT REFERENCES jackpots(jackpot_id),
@@ -263,6 +344,8 @@ rank INTEGER,
 prize_won NUMERIC(18, 2) DEFAULT 0.00
 );
 
+CREATE INDEX idx_fantasy_user_teams_match_points ON fantasy_user_teams (match_id, total_points DESC);
+
 CREATE TABLE fantasy_team_players_link(
 user_team_id INTEGER NOT NULL REFERENCES fantasy_user_teams(id) ON DELETE CASCADE,
 player_id INTEGER NOT NULL REFERENCES fantasy_players(id) ON DELETE CASCADE,
@@ -382,6 +465,8 @@ CREATE TABLE fantasy_teams (
     FOREIGN KEY(vice_captain_id) REFERENCES players(player_id)
 );
 
+CREATE INDEX idx_fantasy_teams_match_points ON fantasy_teams (match_id, total_points DESC);
+
 CREATE TABLE team_players (
     id SERIAL PRIMARY KEY,
     team_id INTEGER NOT NULL,
@@ -395,73 +480,56 @@ CREATE TABLE team_players (
 );
 
 
-CREATE TABLE analytics_snapshots (
-    snapshot_id SERIAL PRIMARY KEY,
+-- =========================
+-- ANALYTICS ROLLUPS
+-- =========================
+-- Maintained by app.workers.analytics_rollup (replaces the old analytics_snapshots
+-- table and its pg_cron job). All buckets are UTC. Rows are derived data and can be
+-- rebuilt at any time with: python -m app.workers.analytics_rollup --backfill-days N
+
+CREATE TABLE analytics_hourly (
     tenant_id INTEGER NOT NULL REFERENCES tenants(tenant_id),
-    region_id INTEGER NOT NULL REFERENCES tenant_regions(region_id),
-    snapshot_date DATE NOT NULL,
+    game_id INTEGER NOT NULL REFERENCES game(game_id),
+    bucket_start TIMESTAMPTZ NOT NULL,
     total_wagered NUMERIC(18, 2) DEFAULT 0,
     total_payout NUMERIC(18, 2) DEFAULT 0,
-    total_ggr NUMERIC(18, 2) DEFAULT 0,
-    total_ngr NUMERIC(18, 2) DEFAULT 0,
-    active_users INTEGER DEFAULT 0,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
-    CONSTRAINT uq_tenant_snapshot_date UNIQUE (tenant_id, snapshot_date)
+    bet_count INTEGER DEFAULT 0,
+    session_count INTEGER DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tenant_id, game_id, bucket_start)
 );
+CREATE INDEX idx_analytics_hourly_bucket ON analytics_hourly (bucket_start);
 
+-- Closed days only; today is always read from analytics_hourly
+CREATE TABLE analytics_daily (
+    tenant_id INTEGER NOT NULL REFERENCES tenants(tenant_id),
+    game_id INTEGER NOT NULL REFERENCES game(game_id),
+    day DATE NOT NULL,
+    total_wagered NUMERIC(18, 2) DEFAULT 0,
+    total_payout NUMERIC(18, 2) DEFAULT 0,
+    bet_count INTEGER DEFAULT 0,
+    session_count INTEGER DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tenant_id, game_id, day)
+);
+CREATE INDEX idx_analytics_daily_day ON analytics_daily (day);
 
-CREATE OR REPLACE FUNCTION generate_daily_analytics_snapshot()
-RETURNS void AS $$
-BEGIN
-    INSERT INTO analytics_snapshots (
-        tenant_id, 
-        region_id, 
-        snapshot_date, 
-        total_wagered, 
-        total_payout, 
-        total_ggr, 
-        total_ngr, 
-        active_users
-    )
-    SELECT 
-        t.tenant_id,
-        t.region_id,
-        CURRENT_DATE - INTERVAL '1 day' AS snapshot_date,
-        COALESCE(SUM(b.bet_amount), 0) AS total_wagered,
-        COALESCE(SUM(b.payout_amount), 0) AS total_payout,
-        COALESCE(SUM(b.bet_amount) - SUM(b.payout_amount), 0) AS total_ggr,
-        -- Calculate NGR by deducting the tenant's regional tax rate from the GGR
-        COALESCE((SUM(b.bet_amount) - SUM(b.payout_amount)) * (1 - (tr.tax_rate / 100)), 0) AS total_ngr,
-        COUNT(DISTINCT gs.user_id) AS active_users
-    FROM tenants t
-    JOIN tenant_regions tr ON t.region_id = tr.region_id
-    LEFT JOIN users u ON u.tenant_id = t.tenant_id
-    LEFT JOIN game_session gs ON gs.user_id = u.user_id AND DATE(gs.started_at) = CURRENT_DATE - INTERVAL '1 day'
-    LEFT JOIN game_round gr ON gr.session_id = gs.session_id
-    LEFT JOIN bet b ON b.round_id = gr.round_id AND b.bet_status != 'cancelled'
-    GROUP BY t.tenant_id, t.region_id
-    
-    -- If a snapshot for this date already exists, update it instead of crashing
-    ON CONFLICT ON CONSTRAINT uq_tenant_snapshot_date 
-    DO UPDATE SET 
-        total_wagered = EXCLUDED.total_wagered,
-        total_payout = EXCLUDED.total_payout,
-        total_ggr = EXCLUDED.total_ggr,
-        total_ngr = EXCLUDED.total_ngr,
-        active_users = EXCLUDED.active_users;
-END;
-$$ LANGUAGE plpgsql;
-
-
--- 1. Enable the pg_cron extension (requires superuser privileges)
-CREATE EXTENSION IF NOT EXISTS pg_cron;
-
--- 2. Schedule the job to run every day at 01:00 AM database time
-SELECT cron.schedule(
-    'daily_analytics_rollup',   -- Job Name
-    '0 1 * * *',                -- Cron expression (1:00 AM daily)
-    'SELECT generate_daily_analytics_snapshot();' -- Command to execute
+-- Per-player daily wager: distinct active players and weekly top players
+CREATE TABLE analytics_user_daily (
+    tenant_id INTEGER NOT NULL REFERENCES tenants(tenant_id),
+    user_id INTEGER NOT NULL REFERENCES users(user_id),
+    day DATE NOT NULL,
+    total_wagered NUMERIC(18, 2) DEFAULT 0,
+    total_payout NUMERIC(18, 2) DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (tenant_id, user_id, day)
 );
+CREATE INDEX idx_analytics_user_daily_tenant_day ON analytics_user_daily (tenant_id, day);
+
+-- Migrating an existing database:
+-- SELECT cron.unschedule('daily_analytics_rollup');
+-- DROP FUNCTION IF EXISTS generate_daily_analytics_snapshot();
+-- DROP TABLE IF EXISTS analytics_snapshots;
 
 
 CREATE OR REPLACE FUNCTION log_cash_wallet_transaction()
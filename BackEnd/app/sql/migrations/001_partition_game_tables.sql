@@ -0,0 +1,126 @@
+-- Convert game_session, game_round and bet to monthly range partitions on started_at.
+--
+-- Run once against a database created from the pre-partitioning schema, during a
+-- maintenance window (it rewrites all three tables). Requires ensure_monthly_partitions()
+-- from casino_db.sql. The old tables are kept as *_unpartitioned until you drop them.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(parent TEXT, months_back INT, months_ahead INT)
+RETURNS void AS $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR i IN -months_back..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::date;
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            parent || '_' || to_char(month_start, 'YYYY_MM'),
+            parent,
+            month_start::text || ' 00:00:00+00',
+            (month_start + INTERVAL '1 month')::date::text || ' 00:00:00+00'
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 1. Move the old tables aside (their sequences keep their names and values)
+ALTER TABLE bet RENAME TO bet_unpartitioned;
+ALTER TABLE game_round RENAME TO game_round_unpartitioned;
+ALTER TABLE game_session RENAME TO game_session_unpartitioned;
+
+ALTER TABLE bet_unpartitioned RENAME CONSTRAINT bet_pkey TO bet_unpartitioned_pkey;
+ALTER TABLE game_round_unpartitioned RENAME CONSTRAINT game_round_pkey TO game_round_unpartitioned_pkey;
+ALTER TABLE game_session_unpartitioned RENAME CONSTRAINT game_session_pkey TO game_session_unpartitioned_pkey;
+
+-- 2. Partitioned tables, reusing the existing id sequences
+CREATE TABLE game_session(
+session_id INT NOT NULL DEFAULT nextval('game_session_session_id_seq'),
+user_id INT REFERENCES users(user_id),
+game_id INT REFERENCES game(game_id),
+provider_session_ref VARCHAR(64),
+started_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+ended_at TIMESTAMPTZ,
+PRIMARY KEY (session_id, started_at)
+) PARTITION BY RANGE (started_at);
+
+CREATE TABLE game_round(
+round_id INT NOT NULL DEFAULT nextval('game_round_round_id_seq'),
+session_id INT,
+round_number INT,
+provider_round_ref VARCHAR(64),
+started_at TIMESTAMPTZ NOT NULL,
+PRIMARY KEY (round_id, started_at),
+FOREIGN KEY (session_id, started_at) REFERENCES game_session(session_id, started_at)
+) PARTITION BY RANGE (started_at);
+
+CREATE TABLE bet(
+bet_id INT NOT NULL DEFAULT nextval('bet_bet_id_seq'),
+round_id INT,
+wallet_id INT REFERENCES wallet(wallet_id),
+bet_amount NUMERIC(18,2) NOT NULL,
+payout_amount NUMERIC(18,2),
+odds NUMERIC(8,4),
+bet_type bet_types DEFAULT 'single_bet',
+bet_status bet_statuses DEFAULT 'placed',
+placed_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+started_at TIMESTAMPTZ NOT NULL,
+PRIMARY KEY (bet_id, started_at),
+FOREIGN KEY (round_id, started_at) REFERENCES game_round(round_id, started_at)
+) PARTITION BY RANGE (started_at);
+
+CREATE TABLE game_session_default PARTITION OF game_session DEFAULT;
+CREATE TABLE game_round_default PARTITION OF game_round DEFAULT;
+CREATE TABLE bet_default PARTITION OF bet DEFAULT;
+
+-- 3. One partition per month from the oldest session through three months ahead
+DO $$
+DECLARE
+    months_back INT;
+BEGIN
+    SELECT COALESCE(
+        (EXTRACT(YEAR FROM age(date_trunc('month', CURRENT_DATE), date_trunc('month', MIN(started_at)))) * 12
+         + EXTRACT(MONTH FROM age(date_trunc('month', CURRENT_DATE), date_trunc('month', MIN(started_at)))))::int,
+        0)
+    INTO months_back
+    FROM game_session_unpartitioned;
+
+    PERFORM ensure_monthly_partitions('game_session', months_back, 3);
+    PERFORM ensure_monthly_partitions('game_round', months_back, 3);
+    PERFORM ensure_monthly_partitions('bet', months_back, 3);
+END $$;
+
+-- 4. Copy rows, denormalizing the session start onto rounds and bets.
+--    Rows without a session land on the epoch and therefore in the DEFAULT partitions;
+--    references to rows that never existed are dropped so the foreign keys hold.
+INSERT INTO game_session (session_id, user_id, game_id, provider_session_ref, started_at, ended_at)
+SELECT session_id, user_id, game_id, provider_session_ref, COALESCE(started_at, 'epoch'::timestamptz), ended_at
+FROM game_session_unpartitioned;
+
+INSERT INTO game_round (round_id, session_id, round_number, provider_round_ref, started_at)
+SELECT gr.round_id, gs.session_id, gr.round_number, gr.provider_round_ref, COALESCE(gs.started_at, 'epoch'::timestamptz)
+FROM game_round_unpartitioned gr
+LEFT JOIN game_session_unpartitioned gs ON gs.session_id = gr.session_id;
+
+INSERT INTO bet (bet_id, round_id, wallet_id, bet_amount, payout_amount, odds, bet_type, bet_status, placed_at, started_at)
+SELECT b.bet_id, gr.round_id, b.wallet_id, b.bet_amount, b.payout_amount, b.odds, b.bet_type, b.bet_status, b.placed_at,
+       COALESCE(gs.started_at, 'epoch'::timestamptz)
+FROM bet_unpartitioned b
+LEFT JOIN game_round_unpartitioned gr ON gr.round_id = b.round_id
+LEFT JOIN game_session_unpartitioned gs ON gs.session_id = gr.session_id;
+
+-- 5. The sequences now belong to the new tables
+ALTER SEQUENCE game_session_session_id_seq OWNED BY game_session.session_id;
+ALTER SEQUENCE game_round_round_id_seq OWNED BY game_round.round_id;
+ALTER SEQUENCE bet_bet_id_seq OWNED BY bet.bet_id;
+
+ANALYZE game_session;
+ANALYZE game_round;
+ANALYZE bet;
+
+COMMIT;
+
+-- After verifying counts match:
+-- DROP TABLE bet_unpartitioned;
+-- DROP TABLE game_round_unpartitioned;
+-- DROP TABLE game_session_unpartitioned;
@@ -0,0 +1,46 @@
+-- Composite indexes for the hot queries.
+--
+-- Derived from the bet, history and leaderboard workload. Capture it with
+--     python -m benchmarks.explain_hot_queries --workload pg_stat_statements
+-- (top statements by total execution time). Verify afterwards with
+--     python -m benchmarks.explain_hot_queries --user-id .. --tenant-id .. --match-id ..
+-- which fails if any hot query still sequentially scans a large table.
+--
+-- CONCURRENTLY is not supported on a partitioned parent. CREATE INDEX on game_session,
+-- game_round and bet holds a SHARE lock on the parent and every partition for the whole build,
+-- blocking writes to those tables until it finishes. Run during low traffic.
+--
+-- The other tables are indexed CONCURRENTLY, which cannot run inside a transaction block, so
+-- this file cannot be applied as one transaction (no psql -1 / --single-transaction):
+--     psql -v ON_ERROR_STOP=1 -f 002_hot_query_indexes.sql
+
+-- LimitService._wager_stmt (every bet), /user/history, /user/active-sessions:
+--   game_session WHERE user_id = ? AND started_at >= ?
+CREATE INDEX IF NOT EXISTS idx_game_session_user_started ON game_session (user_id, started_at);
+
+-- Owner dashboard active users, analytics rollup refresh:
+--   game_session WHERE started_at >= ? AND started_at < ?
+CREATE INDEX IF NOT EXISTS idx_game_session_started ON game_session (started_at);
+
+-- Session -> rounds join (limit checks, history totals, rollups)
+CREATE INDEX IF NOT EXISTS idx_game_round_session ON game_round (session_id, started_at);
+
+-- Round -> bets join (limit checks, history totals, rollups, blackjack/crash/mines settlement)
+CREATE INDEX IF NOT EXISTS idx_bet_round ON bet (round_id, started_at);
+
+-- WalletService.process_game_bet and JackpotService cash wallet lookup:
+--   wallet WHERE user_id = ? AND tenant_id = ? [AND type_of_wallet = ?]
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_wallet_user_tenant_type ON wallet (user_id, tenant_id, type_of_wallet);
+
+-- LeaderboardService.get_leaderboard: fantasy_teams WHERE match_id = ? ORDER BY total_points DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fantasy_teams_match_points ON fantasy_teams (match_id, total_points DESC);
+
+-- Fantasy cricket leaderboard and settlement: fantasy_user_teams WHERE match_id = ? ORDER BY total_points DESC
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fantasy_user_teams_match_points ON fantasy_user_teams (match_id, total_points DESC);
+
+ANALYZE game_session;
+ANALYZE game_round;
+ANALYZE bet;
+ANALYZE wallet;
+ANALYZE fantasy_teams;
+ANALYZE fantasy_user_teams;
@@ -0,0 +1,17 @@
+-- Denormalize user_id, tenant_id and game_id onto bet (placed_at already exists).
+--
+-- Adding nullable columns is metadata-only. New bets are written with the columns set;
+-- fill in existing rows afterwards, in batches, with
+--     python -m app.workers.bet_backfill
+-- and run the analytics backfill once it reports no rows left, because the rollups
+-- now group on bet.tenant_id / bet.game_id.
+
+ALTER TABLE bet ADD COLUMN IF NOT EXISTS user_id INT REFERENCES users(user_id);
+ALTER TABLE bet ADD COLUMN IF NOT EXISTS tenant_id INT REFERENCES tenants(tenant_id);
+ALTER TABLE bet ADD COLUMN IF NOT EXISTS game_id INT REFERENCES game(game_id);
+
+-- Limit checks and per-player stats: bet WHERE user_id = ? AND started_at >= ?
+CREATE INDEX IF NOT EXISTS idx_bet_user_started ON bet (user_id, started_at);
+
+-- Tenant dashboards and rollups: bet WHERE tenant_id = ? AND started_at >= ?
+CREATE INDEX IF NOT EXISTS idx_bet_tenant_started ON bet (tenant_id, started_at);
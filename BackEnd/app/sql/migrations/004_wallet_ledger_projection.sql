@@ -0,0 +1,43 @@
+-- Make wallet_ledger the source of truth for wallet balances.
+--
+-- Every balance change is now a ledger entry with a signed amount. Debits are applied to
+-- wallet.balance in the same transaction; credits are appended with projected_at NULL and
+-- folded in by app.workers.wallet_ledger (beat, every WALLET_PROJECTION_INTERVAL seconds).
+--
+-- Run during a quiet period: wallets must not change between the opening-entry insert and the
+-- deploy of the ledger-writing code. Check afterwards with
+--     python -m app.workers.wallet_ledger --reconcile
+
+BEGIN;
+
+ALTER TABLE wallet_ledger ADD COLUMN IF NOT EXISTS amount NUMERIC(18,2);
+ALTER TABLE wallet_ledger ADD COLUMN IF NOT EXISTS projected_at TIMESTAMPTZ;
+
+-- Legacy rows (if any) carried only before/after balances
+UPDATE wallet_ledger
+SET amount = COALESCE(after_balance - before_balance, 0),
+    projected_at = COALESCE(created_at, now())
+WHERE amount IS NULL;
+
+DELETE FROM wallet_ledger WHERE wallet_id IS NULL;
+
+-- Opening entry per wallet for whatever the existing ledger does not explain
+INSERT INTO wallet_ledger (wallet_id, amount, before_balance, after_balance, reference_type, projected_at)
+SELECT w.wallet_id,
+       w.balance - COALESCE(l.total, 0),
+       COALESCE(l.total, 0),
+       w.balance,
+       'opening',
+       now()
+FROM wallet w
+LEFT JOIN (SELECT wallet_id, SUM(amount) AS total FROM wallet_ledger GROUP BY wallet_id) l
+       ON l.wallet_id = w.wallet_id
+WHERE w.balance <> COALESCE(l.total, 0);
+
+ALTER TABLE wallet_ledger ALTER COLUMN amount SET NOT NULL;
+ALTER TABLE wallet_ledger ALTER COLUMN wallet_id SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_wallet_ledger_wallet ON wallet_ledger (wallet_id, ledger_id);
+CREATE INDEX IF NOT EXISTS idx_wallet_ledger_pending ON wallet_ledger (wallet_id, ledger_id) WHERE projected_at IS NULL;
+
+COMMIT;
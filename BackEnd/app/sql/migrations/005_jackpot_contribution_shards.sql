@@ -0,0 +1,12 @@
+-- Sharded jackpot contributions.
+--
+-- Bets no longer update jackpots.current_amount directly; they add to one of JACKPOT_SHARDS rows
+-- per pool (created on first use). app.workers.jackpot_fold folds the shards into the pool every
+-- JACKPOT_FOLD_INTERVAL seconds, and a win folds them before paying out. No backfill is needed.
+
+CREATE TABLE IF NOT EXISTS jackpot_contribution_shards(
+jackpot_id INT NOT NULL REFERENCES jackpots(jackpot_id),
+shard_no SMALLINT NOT NULL,
+pending_amount NUMERIC(18,6) NOT NULL DEFAULT 0,
+PRIMARY KEY (jackpot_id, shard_no)
+);
@@ -0,0 +1,8 @@
+-- Per-round outcome on game_round.
+--
+-- Autoplay (POST /games/slots/autoplay, /games/dice/autoplay) settles many rounds in one request
+-- and stores each round's grid or roll, with its provably fair seeds, in game_round.outcome so
+-- it can be fetched and verified afterwards. Adding a nullable column to the partitioned parent
+-- is metadata-only and propagates to every partition. Existing rounds keep NULL.
+
+ALTER TABLE game_round ADD COLUMN IF NOT EXISTS outcome JSONB;
@@ -0,0 +1,57 @@
+-- One wallet per (user, tenant, type).
+--
+-- The baseline model meant to enforce this (a UniqueConstraint that was never applied), and
+-- 002 only added a plain index. The bet path takes the first wallet of each type, so a duplicate
+-- would silently hold money no bet or payout ever touches. The unique index replaces the plain one:
+-- same columns, so the wallet lookups keep their index.
+--
+-- Duplicates have to be merged by hand first (both wallets may have ledger history), so this
+-- stops and lists them instead of picking one:
+--     SELECT user_id, tenant_id, type_of_wallet, array_agg(wallet_id ORDER BY wallet_id)
+--     FROM wallet GROUP BY 1, 2, 3 HAVING count(*) > 1;
+--
+-- A concurrent build that fails (a duplicate inserted after the check) leaves an INVALID index
+-- that IF NOT EXISTS would then skip, so a leftover invalid index is dropped first and the old
+-- index is only dropped once the new one is valid. Run outside a transaction, stopping on the
+-- first error:
+--     psql -v ON_ERROR_STOP=1 -f 007_wallet_unique_user_tenant_type.sql
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM wallet
+        GROUP BY user_id, tenant_id, type_of_wallet
+        HAVING count(*) > 1
+    ) THEN
+        RAISE EXCEPTION 'wallet has duplicate (user_id, tenant_id, type_of_wallet) rows; merge them before this migration';
+    END IF;
+END $$;
+
+-- Leftover from a failed earlier run. Plain DROP (DO blocks run in a transaction): the index is
+-- invalid, so the lock on wallet is brief.
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'uq_wallet_user_tenant_type' AND NOT i.indisvalid
+    ) THEN
+        DROP INDEX uq_wallet_user_tenant_type;
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_wallet_user_tenant_type ON wallet (user_id, tenant_id, type_of_wallet);
+
+-- Never drop the old index unless the unique one is there and valid
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE c.relname = 'uq_wallet_user_tenant_type' AND i.indisvalid
+    ) THEN
+        RAISE EXCEPTION 'uq_wallet_user_tenant_type is missing or invalid; keeping idx_wallet_user_tenant_type';
+    END IF;
+END $$;
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_wallet_user_tenant_type;
@@ -0,0 +1,11 @@
+-- Open sessions of a game, for shared roulette table settlement.
+--
+-- Table slips are written as open game_session rows (ended_at NULL) when they are placed, and
+-- every worker polls for the ones whose round has closed:
+--   game_session WHERE game_id = ? AND ended_at IS NULL AND started_at < ?
+-- The partial index stays small because settled sessions drop out of it.
+--
+-- CONCURRENTLY is not supported on a partitioned parent: the build holds a SHARE lock on
+-- game_session and every partition until it finishes, blocking writes. Run during low traffic.
+
+CREATE INDEX IF NOT EXISTS idx_game_session_open ON game_session (game_id, started_at) WHERE ended_at IS NULL;
@@ -0,0 +1,13 @@
+-- Winning number of each shared roulette table round.
+--
+-- The first settlement batch for a round inserts its number (ON CONFLICT DO NOTHING) in the
+-- batch's transaction; every other batch, on any worker, reads it back. A round with more than
+-- one batch of slips, or settled by several workers, is paid against a single number.
+
+CREATE TABLE IF NOT EXISTS roulette_table_spin(
+tenant_id INT NOT NULL REFERENCES tenants(tenant_id),
+round_no BIGINT NOT NULL,
+winning_number SMALLINT NOT NULL CHECK (winning_number BETWEEN 0 AND 36),
+spun_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+PRIMARY KEY (tenant_id, round_no)
+);
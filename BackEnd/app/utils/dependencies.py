@@ -1,23 +1,27 @@
+from typing import Optional
+from dataclasses import dataclass, asdict
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from ..database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from ..database import get_db, get_async_db, SessionLocal, ReplicaSessionLocal, replica_available
 from ..models.user import User, UserType
 from ..utils.security import decode_access_token
+from ..redis_client import AsyncCacheManager
+from ..config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+# Same scheme without the automatic 401, for endpoints that also serve anonymous callers
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _user_id_from_token(token: str) -> int:
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
@@ -26,7 +30,23 @@ async def get_current_user(
     if user_id_str is None:
         raise credentials_exception
         
-    user_id = int(user_id_str)
+    return int(user_id_str)
+
+def user_id_from_token_or_none(token: Optional[str]) -> Optional[int]:
+    """Best-effort user id for routing decisions; never raises"""
+    if not token:
+        return None
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+    return int(payload["sub"])
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user"""
+    user_id = _user_id_from_token(token)
     
     user = db.query(User).filter(User.user_id == user_id).first()
     if user is None:
@@ -34,6 +54,56 @@ async def get_current_user(
     
     return user
 
+# --- Authenticated principal cache (bet hot path) ---
+
+@dataclass(frozen=True)
+class Principal:
+    """The fields of User the game routers authorize with; cached so a bet needs no user lookup"""
+    user_id: int
+    role: UserType
+    tenant_id: Optional[int]
+    is_active: bool
+    region_id: Optional[int]
+
+def _principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+async def invalidate_principal(user_id: int):
+    """
+    Drop the cached principal (every worker). Call after changing role, tenant, region or active status,
+    or approving KYC; otherwise the change reaches the game routers within PRINCIPAL_CACHE_TTL.
+    """
+    await AsyncCacheManager.delete(_principal_key(user_id))
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Get current authenticated principal without blocking the event loop (bet hot path)"""
+    user_id = _user_id_from_token(token)
+
+    cached = await AsyncCacheManager.get(_principal_key(user_id))
+    if cached is not None:
+        return Principal(**{**cached, "role": UserType(cached["role"])})
+    
+    user = (await db.execute(select(User).where(User.user_id == user_id))).scalar_one_or_none()
+    if user is None:
+        raise credentials_exception
+
+    principal = Principal(
+        user_id=user.user_id,
+        role=user.role,
+        tenant_id=user.tenant_id,
+        is_active=bool(user.is_active),
+        region_id=user.region_id
+    )
+    await AsyncCacheManager.set(
+        _principal_key(user_id),
+        {**asdict(principal), "role": principal.role.value},
+        ttl=settings.PRINCIPAL_CACHE_TTL
+    )
+    return principal
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -67,6 +137,22 @@ async def require_tenant(
         )
     return current_user
 
+async def require_tenant_async(
+    current_user: Principal = Depends(get_current_user_async)
+) -> Principal:
+    """Async-session variant of require_tenant for the game routers"""
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    if current_user.tenant_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User must select a region first"
+        )
+    return current_user
+
 async def require_casino_owner(
     current_user: User = Depends(get_current_active_user)
 ) -> User:
@@ -92,4 +178,31 @@ async def require_tenant_admin(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Admin account is not linked to a tenant"
         )
-    return current_user
\ No newline at end of file
+    return current_user
+# --- Read routing (primary vs replica) ---
+
+def _primary_pin_key(user_id: int) -> str:
+    return f"db_pin:{user_id}"
+
+async def pin_to_primary(user_id: int):
+    """Keep this user's reads on the primary for a while so they see their own writes"""
+    # No invalidation publish: workers never cache a missing pin locally, so nothing elsewhere is stale
+    await AsyncCacheManager.set(_primary_pin_key(user_id), True, ttl=settings.PRIMARY_PIN_SECONDS, broadcast=False)
+
+async def get_read_db(token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """
+    Dependency for read-only endpoints.
+    Uses the replica unless none is configured, it is lagging, or the caller wrote recently.
+    Never use it for anything that writes.
+    """
+    use_replica = replica_available()
+    if use_replica:
+        user_id = user_id_from_token_or_none(token)
+        if user_id is not None and await AsyncCacheManager.get(_primary_pin_key(user_id)):
+            use_replica = False
+
+    db = ReplicaSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
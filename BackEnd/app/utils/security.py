@@ -3,8 +3,14 @@ from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from fastapi import HTTPException, status
 from ..config import settings
+import asyncio
 import hashlib
+import threading
+import time
 
 pass_context = CryptContext(schemes=["argon2"],deprecated="auto") # bcrypt allows only 72 bytes long (argon2_cffi)
 
@@ -18,6 +24,84 @@ def verify_password(plain_password:str, hashed_password: str):
     sha256_hash = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
     return pass_context.verify(sha256_hash,hashed_password)
 
+# --- Off-loop hashing for async handlers ---
+# Argon2 is deliberately slow (tens of ms per call). argon2-cffi releases the GIL while hashing,
+# so a small thread pool hashes in parallel and the event loop keeps serving game requests.
+
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2")
+_hash_slots: Optional[asyncio.Semaphore] = None # running + queued hashes, created on first use (needs the loop)
+
+_hash_stats = {"in_flight": 0, "completed": 0, "rejected": 0, "queue_ms_total": 0.0, "queue_ms_max": 0.0, "run_ms_total": 0.0}
+_recent_queue_ms = deque(maxlen=1000)
+_hash_stats_lock = threading.Lock()
+
+def _record_hash(queue_seconds: float, run_seconds: float):
+    queue_ms, run_ms = queue_seconds * 1000, run_seconds * 1000
+    with _hash_stats_lock:
+        _hash_stats["completed"] += 1
+        _hash_stats["queue_ms_total"] += queue_ms
+        _hash_stats["queue_ms_max"] = max(_hash_stats["queue_ms_max"], queue_ms)
+        _hash_stats["run_ms_total"] += run_ms
+        _recent_queue_ms.append(queue_ms)
+
+async def _run_hash(fn, *args):
+    """Run fn in the hash pool; beyond PASSWORD_HASH_MAX_PENDING waiting callers, shed load with a 503"""
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_PENDING)
+    if _hash_slots.locked():
+        with _hash_stats_lock:
+            _hash_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts right now, please retry",
+            headers={"Retry-After": "1"}
+        )
+
+    async with _hash_slots:
+        submitted = time.perf_counter()
+        with _hash_stats_lock:
+            _hash_stats["in_flight"] += 1
+
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                _record_hash(started - submitted, time.perf_counter() - started)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(_hash_executor, timed)
+        finally:
+            with _hash_stats_lock:
+                _hash_stats["in_flight"] -= 1
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash for async handlers (runs in the bounded hash pool)"""
+    return await _run_hash(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async handlers (runs in the bounded hash pool)"""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+def password_hash_stats() -> dict:
+    """Hash pool size, load and queue-time metrics"""
+    with _hash_stats_lock:
+        stats = dict(_hash_stats)
+        recent = sorted(_recent_queue_ms)
+    completed = stats["completed"]
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "in_flight": stats["in_flight"], # running + queued
+        "completed": completed,
+        "rejected": stats["rejected"],
+        "queue_ms_avg": round(stats["queue_ms_total"] / completed, 2) if completed else 0.0,
+        "queue_ms_p95": round(recent[int(len(recent) * 0.95)], 2) if recent else 0.0,
+        "queue_ms_max": round(stats["queue_ms_max"], 2),
+        "run_ms_avg": round(stats["run_ms_total"] / completed, 2) if completed else 0.0,
+    }
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
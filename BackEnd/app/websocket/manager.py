@@ -3,7 +3,7 @@ from fastapi import WebSocket
 from typing import Dict, List
 import json
 import logging
-from ..redis_client import redis_client
+from ..redis_client import async_redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +13,19 @@ class ConnectionManager:
     Manages WebSocket connections for real-time updates
     """
     
-    def __init__(self):
+    def __init__(self, channel_prefix: str = "match_channel_"):
+        # Redis channel per group: f"{channel_prefix}{match_id}"
+        self.channel_prefix = channel_prefix
+
         # Store active connections per match
         # {match_id: [websocket1, websocket2, ...]}
         self.active_connections: Dict[int, List[WebSocket]] = {}
         
         # Store pending match updates
         self.match_updates: Dict[int, dict] = {}
+
+        # One Redis listener task per match in this process
+        self.listeners: Dict[int, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket, match_id: int):
         """Accept new WebSocket connection and subscribe to match updates"""
@@ -28,8 +34,10 @@ class ConnectionManager:
         if match_id not in self.active_connections:
             self.active_connections[match_id] = []
         # Start a background task to listen to Redis for THIS specific match
-            # only if we aren't already listening.
-        asyncio.create_task(self.redis_listener(match_id))
+        # only if we aren't already listening.
+        listener = self.listeners.get(match_id)
+        if async_redis_client is not None and (listener is None or listener.done()):
+            self.listeners[match_id] = asyncio.create_task(self.redis_listener(match_id))
         self.active_connections[match_id].append(websocket)
         logger.info(f"WebSocket connected to match {match_id}. Total: {len(self.active_connections[match_id])}")
     
@@ -49,26 +57,26 @@ class ConnectionManager:
         A background task that runs for each match.
         It listens to Redis and forwards messages to local WebSockets.
         """
-        pubsub = redis_client.pubsub()
-        channel = f"match_channel_{match_id}"
+        pubsub = async_redis_client.pubsub()
+        channel = f"{self.channel_prefix}{match_id}"
         await pubsub.subscribe(channel)
         
         logger.info(f"Redis Listener started for channel: {channel}")
 
         try:
             while match_id in self.active_connections:
-                # Check for messages every 0.1 seconds
+                # Waits up to 1s for a message without blocking the event loop
                 message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
                 if message:
                     data = json.loads(message['data'])
                     # Forward to all local sockets for this match
                     await self.broadcast_locally(match_id, data)
-                
-                await asyncio.sleep(0.1) 
         except Exception as e:
             logger.error(f"Redis Listener Error for match {match_id}: {e}")
         finally:
+            self.listeners.pop(match_id, None)
             await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
 
     async def broadcast_locally(self, match_id: int, message: dict):
         """Send message to sockets held in THIS process only"""
@@ -141,4 +149,10 @@ class ConnectionManager:
 
 
 # Global connection manager instance
-manager = ConnectionManager()
\ No newline at end of file
+manager = ConnectionManager()
+
+# Live jackpot ticker: groups are tenant ids, fed by workers/jackpot_ticker.py
+jackpot_manager = ConnectionManager(channel_prefix="jackpot_channel_")
+
+# Shared-wheel roulette tables: groups are tenant ids, fed by services/roulette_table.py
+roulette_manager = ConnectionManager(channel_prefix="roulette_channel_")
\ No newline at end of file
@@ -0,0 +1,54 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from ..services.analytics_service import AnalyticsService
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.workers.analytics_rollup.refresh_analytics_rollups_task')
+def refresh_analytics_rollups_task():
+    """
+    Keep the dashboard rollups current.
+    Rebuilds the trailing ANALYTICS_SWEEP_HOURS plus any hours marked dirty by late settlements.
+    """
+    db = SessionLocal()
+    try:
+        result = AnalyticsService.sweep(db)
+        logger.info(f"Analytics rollups refreshed: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error in analytics rollup task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@celery_app.task(name='app.workers.analytics_rollup.backfill_analytics_rollups_task')
+def backfill_analytics_rollups_task(days: int = 90):
+    """One-off: build rollups for history that predates the rollup tables"""
+    db = SessionLocal()
+    try:
+        return AnalyticsService.backfill(db, days)
+    except Exception as e:
+        logger.error(f"Error in analytics backfill task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # python -m app.workers.analytics_rollup --backfill-days 365
+    parser = argparse.ArgumentParser(description="Build or refresh the analytics rollup tables")
+    parser.add_argument("--backfill-days", type=int, default=0, help="Rebuild this many past days (0 = sweep only)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.backfill_days:
+            for day in AnalyticsService.backfill(db, args.backfill_days):
+                print(day)
+        print(AnalyticsService.sweep(db))
+    finally:
+        db.close()
@@ -0,0 +1,72 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from sqlalchemy import text
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+# user/game come from the session, tenant from the wallet the bet was paid from.
+# Batches are bounded by bet_id so each transaction stays short and locks few rows.
+BACKFILL_BATCH_SQL = text("""
+    WITH batch AS (
+        SELECT b.bet_id, b.started_at, gs.user_id, gs.game_id, w.tenant_id
+        FROM bet b
+        JOIN game_round gr ON gr.round_id = b.round_id AND gr.started_at = b.started_at
+        JOIN game_session gs ON gs.session_id = gr.session_id AND gs.started_at = gr.started_at
+        LEFT JOIN wallet w ON w.wallet_id = b.wallet_id
+        WHERE b.user_id IS NULL AND b.bet_id > :after_id
+        ORDER BY b.bet_id
+        LIMIT :batch_size
+    )
+    UPDATE bet
+    SET user_id = batch.user_id,
+        game_id = batch.game_id,
+        tenant_id = batch.tenant_id,
+        placed_at = COALESCE(bet.placed_at, bet.started_at)
+    FROM batch
+    WHERE bet.bet_id = batch.bet_id AND bet.started_at = batch.started_at
+    RETURNING bet.bet_id
+""")
+
+
+def backfill_bet_columns(batch_size: int = 5000, max_batches: int = None) -> dict:
+    """Fill bet.user_id/tenant_id/game_id/placed_at for rows written before the columns existed"""
+    db = SessionLocal()
+    updated, batches, last_id = 0, 0, 0
+    try:
+        while max_batches is None or batches < max_batches:
+            ids = [row[0] for row in db.execute(
+                BACKFILL_BATCH_SQL, {"after_id": last_id, "batch_size": batch_size}
+            )]
+            db.commit()
+            if not ids:
+                break
+            updated += len(ids)
+            batches += 1
+            last_id = max(ids)
+            logger.info(f"Backfilled {updated} bets (up to bet_id {last_id})")
+        return {"updated": updated, "batches": batches, "last_bet_id": last_id}
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name='app.workers.bet_backfill.backfill_bet_columns_task')
+def backfill_bet_columns_task(batch_size: int = 5000, max_batches: int = None):
+    """One-off: populate the denormalized bet columns (see sql/migrations/003_bet_denormalized_columns.sql)"""
+    try:
+        return backfill_bet_columns(batch_size, max_batches)
+    except Exception as e:
+        logger.error(f"Error in bet backfill task: {str(e)}")
+
+
+if __name__ == "__main__":
+    # python -m app.workers.bet_backfill --batch-size 5000
+    parser = argparse.ArgumentParser(description="Backfill bet.user_id/tenant_id/game_id")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--max-batches", type=int, default=None)
+    args = parser.parse_args()
+    print(backfill_bet_columns(args.batch_size, args.max_batches))
@@ -6,7 +6,16 @@ from ..config import settings
 celery_app = Celery(
     "fantasy_cricket_workers",
     broker=settings.CELERY_BROKER_URL,
-    backend=settings.CELERY_RESULT_BACKEND
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=[
+        "app.workers.score_updater",
+        "app.workers.analytics_rollup",
+        "app.workers.partition_maintenance",
+        "app.workers.bet_backfill",
+        "app.workers.wallet_ledger",
+        "app.workers.jackpot_fold",
+        "app.workers.jackpot_ticker",
+    ]
 )
 
 # Celery configuration
@@ -34,4 +43,34 @@ celery_app.conf.beat_schedule = {
         'task': 'app.workers.score_updater.update_live_scores_task',
         'schedule': 900.0,
     },
+    # Keep dashboard rollups current
+    'refresh-analytics-rollups': {
+        'task': 'app.workers.analytics_rollup.refresh_analytics_rollups_task',
+        'schedule': float(settings.ANALYTICS_REFRESH_INTERVAL),
+    },
+    # Create next months' bet/session partitions and archive expired ones
+    'maintain-partitions': {
+        'task': 'app.workers.partition_maintenance.maintain_partitions_task',
+        'schedule': crontab(minute=30, hour=0),
+    },
+    # Fold pending wallet ledger credits into balances
+    'project-wallet-ledger': {
+        'task': 'app.workers.wallet_ledger.project_wallet_ledger_task',
+        'schedule': float(settings.WALLET_PROJECTION_INTERVAL),
+    },
+    # Fold sharded jackpot contributions into the pools
+    'fold-jackpot-contributions': {
+        'task': 'app.workers.jackpot_fold.fold_jackpot_contributions_task',
+        'schedule': float(settings.JACKPOT_FOLD_INTERVAL),
+    },
+    # Publish live jackpot amounts to the ticker channels
+    'publish-jackpot-ticker': {
+        'task': 'app.workers.jackpot_ticker.publish_jackpot_ticker_task',
+        'schedule': float(settings.JACKPOT_TICKER_INTERVAL),
+    },
+    # Check every balance against its ledger
+    'reconcile-wallets': {
+        'task': 'app.workers.wallet_ledger.reconcile_wallets_task',
+        'schedule': crontab(minute=15),
+    },
 }
\ No newline at end of file
@@ -0,0 +1,31 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from ..services.jackpot_service import JackpotService
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.workers.jackpot_fold.fold_jackpot_contributions_task')
+def fold_jackpot_contributions_task():
+    """Move sharded jackpot contributions into jackpots.current_amount"""
+    db = SessionLocal()
+    try:
+        folded = JackpotService.fold_contributions(db)
+        if folded:
+            logger.info(f"Folded jackpot contributions: {folded}")
+        return {str(jackpot_id): str(amount) for jackpot_id, amount in folded.items()}
+    except Exception as e:
+        logger.error(f"Error in jackpot fold task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # python -m app.workers.jackpot_fold
+    db = SessionLocal()
+    try:
+        print(JackpotService.fold_contributions(db))
+    finally:
+        db.close()
@@ -0,0 +1,48 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from ..services.jackpot_service import JackpotService
+from ..schemas.jackpot import JackpotResponse
+from ..redis_client import CacheManager
+from ..config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Same key GET /jackpot/current reads, so polls are served from the ticker's snapshot
+CACHE_KEY = "jackpots:{tenant_id}"
+CHANNEL = "jackpot_channel_{tenant_id}"
+
+
+@celery_app.task(name='app.workers.jackpot_ticker.publish_jackpot_ticker_task')
+def publish_jackpot_ticker_task():
+    """
+    One DB read per tick for every tenant's jackpots, published once per tenant and only when the
+    amounts changed. WebSocket subscribers and /jackpot/current never query the database themselves.
+    """
+    db = SessionLocal()
+    try:
+        snapshot = JackpotService.live_snapshot(db)
+    except Exception as e:
+        logger.error(f"Error in jackpot ticker task: {str(e)}")
+        return
+    finally:
+        db.close()
+
+    ttl = max(5, settings.JACKPOT_TICKER_INTERVAL * 3)
+    keys = {tenant_id: CACHE_KEY.format(tenant_id=tenant_id) for tenant_id in snapshot}
+    previous = CacheManager.mget(list(keys.values()))
+    cache_items, messages = {}, []
+    for tenant_id, pools in snapshot.items():
+        payload = [JackpotResponse.model_validate(pool).model_dump(mode="json") for pool in pools]
+        cache_items[keys[tenant_id]] = payload
+        if previous.get(keys[tenant_id]) != payload:
+            messages.append((CHANNEL.format(tenant_id=tenant_id), {
+                "type": "jackpot_update",
+                "tenant_id": tenant_id,
+                "jackpots": payload
+            }))
+
+    # Refresh every tenant's snapshot (keeps the TTL alive), publish only what moved
+    CacheManager.set_many(cache_items, ttl=ttl)
+    CacheManager.publish_many(messages)
+    return {"tenants": len(snapshot), "published": len(messages)}
@@ -0,0 +1,40 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from ..services.partition_service import PartitionService
+import argparse
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.workers.partition_maintenance.maintain_partitions_task')
+def maintain_partitions_task():
+    """
+    Daily partition upkeep for game_session, game_round and bet:
+    create upcoming months ahead of time, archive months past the retention window.
+    """
+    db = SessionLocal()
+    try:
+        PartitionService.ensure_partitions(db)
+        return PartitionService.archive_old_partitions(db)
+    except Exception as e:
+        logger.error(f"Error in partition maintenance task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # python -m app.workers.partition_maintenance --retention-months 13
+    parser = argparse.ArgumentParser(description="Create upcoming and archive old monthly partitions")
+    parser.add_argument("--months-ahead", type=int, default=None)
+    parser.add_argument("--retention-months", type=int, default=None)
+    parser.add_argument("--drop", action="store_true", help="Drop old partitions instead of moving them to the archive schema")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        PartitionService.ensure_partitions(db, args.months_ahead)
+        print(PartitionService.archive_old_partitions(db, args.retention_months, drop=args.drop))
+    finally:
+        db.close()
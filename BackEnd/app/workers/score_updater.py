@@ -3,6 +3,7 @@ from ..models.match import Match, MatchStatuses
 from ..models.player import PlayerPerformance
 from ..services.cricket_api import CricketAPIService
 from ..services.points_calculator import PointsCalculator
+from ..services.leaderboard_service import LeaderboardService
 from decimal import Decimal, InvalidOperation
 from sqlalchemy.orm import Session
 from ..database import SessionLocal
@@ -142,6 +143,9 @@ def update_match_scores(db: Session, match: Match):
     
     # Recalculate all team points
     PointsCalculator.recalculate_all_teams(db, match.match_id)
+    db.commit()
+    # Ranks and the shared leaderboard cache are only written here, from the primary
+    LeaderboardService.get_leaderboard(db, match.match_id, use_cache=False)
     
     update_payload = {
         "type": "score_update",
@@ -188,6 +192,8 @@ def finalize_match_task(match_id: int):
         
         match.teams_locked = True
         db.commit()
+        # The cached match list carries teams_locked
+        CacheManager.invalidate_match_list()
         
         logger.info(f"Finalized match {match_id} with {len(teams)} teams")
         
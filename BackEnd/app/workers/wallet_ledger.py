@@ -0,0 +1,67 @@
+from ..workers.celery_app import celery_app
+from ..database import SessionLocal
+from ..services.ledger_service import LedgerService
+from ..config import settings
+import argparse
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name='app.workers.wallet_ledger.project_wallet_ledger_task')
+def project_wallet_ledger_task():
+    """Fold pending ledger credits (payouts, jackpots, deposits, points) into wallet.balance"""
+    db = SessionLocal()
+    try:
+        total = 0
+        while True:
+            projected = LedgerService.project(db)
+            total += projected
+            if projected < settings.WALLET_PROJECTION_BATCH:
+                break
+        if total:
+            logger.info(f"Projected {total} wallet ledger entries")
+        return total
+    except Exception as e:
+        logger.error(f"Error in wallet ledger projection task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@celery_app.task(name='app.workers.wallet_ledger.reconcile_wallets_task')
+def reconcile_wallets_task():
+    """Report wallets whose balance no longer matches their projected ledger entries"""
+    db = SessionLocal()
+    try:
+        mismatches = LedgerService.reconcile(db)
+        return {"mismatched_wallets": len(mismatches), "wallet_ids": [m["wallet_id"] for m in mismatches]}
+    except Exception as e:
+        logger.error(f"Error in wallet reconciliation task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # python -m app.workers.wallet_ledger --reconcile
+    # python -m app.workers.wallet_ledger --replay --wallet-id 12 --wallet-id 13 --dry-run
+    parser = argparse.ArgumentParser(description="Project, reconcile or replay the wallet ledger")
+    parser.add_argument("--reconcile", action="store_true", help="List wallets whose balance drifted from the ledger")
+    parser.add_argument("--replay", action="store_true", help="Rebuild balances from the ledger")
+    parser.add_argument("--wallet-id", type=int, action="append", dest="wallet_ids", help="Limit to these wallets (repeatable)")
+    parser.add_argument("--dry-run", action="store_true", help="With --replay: only report what would change")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.replay:
+            result = LedgerService.replay(db, args.wallet_ids, dry_run=args.dry_run)
+        elif args.reconcile:
+            result = LedgerService.reconcile(db, args.wallet_ids)
+        else:
+            result = {"projected": LedgerService.project(db, args.wallet_ids)}
+        print(json.dumps(result, indent=2, default=str))
+    finally:
+        db.close()
@@ -0,0 +1,107 @@
+"""
+Load benchmark: bet hot-path queries on the sync engine vs the async engine.
+
+Each simulated bet runs the queries process_game_bet issues before it
+mutates anything: responsible-gaming limits, today's and this month's
+wager totals, and the tenant's wallets. All of them are read-only.
+
+"before" runs them through a sync Session inside the event loop, as the
+async routers did before AsyncSession existed. "after" runs them through
+AsyncSession. While the bets run, a 10 ms ticker measures event-loop lag,
+which stands in for every other request served by the same worker.
+
+Usage (from BackEnd/, with the usual .env):
+    python -m benchmarks.bet_path_benchmark --user-id 1 --tenant-id 1 --bets 500 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from sqlalchemy import select
+from app.database import SessionLocal, AsyncSessionLocal, engine, async_engine
+from app.models.user import ResponsibleLimit
+from app.models.wallet import Wallet
+from app.services.limit_service import LimitService
+
+
+def _statements(user_id: int, tenant_id: int):
+    today_start, month_start = LimitService._periods()
+    return [
+        select(ResponsibleLimit).where(ResponsibleLimit.user_id == user_id),
+        LimitService._wager_stmt(user_id, today_start),
+        LimitService._wager_stmt(user_id, month_start),
+        select(Wallet).where(Wallet.user_id == user_id, Wallet.tenant_id == tenant_id),
+    ]
+
+
+async def _sync_bet(user_id: int, tenant_id: int):
+    db = SessionLocal()
+    try:
+        for stmt in _statements(user_id, tenant_id):
+            db.execute(stmt).all()  # blocks the event loop
+    finally:
+        db.close()
+
+
+async def _async_bet(user_id: int, tenant_id: int):
+    async with AsyncSessionLocal() as db:
+        for stmt in _statements(user_id, tenant_id):
+            (await db.execute(stmt)).all()
+
+
+async def _ticker(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def _run(bet_fn, bets: int, concurrency: int, user_id: int, tenant_id: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await bet_fn(user_id, tenant_id)
+
+    # Warm the connection pool so both modes start from the same state
+    await asyncio.gather(*(bet_fn(user_id, tenant_id) for _ in range(min(concurrency, 10))))
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(bets)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    lags.sort()
+    return {
+        "bets": bets,
+        "seconds": round(elapsed, 3),
+        "bets_per_sec": round(bets / elapsed, 1),
+        "loop_lag_p50_ms": round(lags[len(lags) // 2] * 1000, 2) if lags else None,
+        "loop_lag_p99_ms": round(lags[int(len(lags) * 0.99)] * 1000, 2) if lags else None,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 2) if lags else None,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--tenant-id", type=int, required=True)
+    parser.add_argument("--bets", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    before = await _run(_sync_bet, args.bets, args.concurrency, args.user_id, args.tenant_id)
+    after = await _run(_async_bet, args.bets, args.concurrency, args.user_id, args.tenant_id)
+
+    print(f"{'':>18} {'before (sync)':>15} {'after (async)':>15}")
+    for key in before:
+        print(f"{key:>18} {str(before[key]):>15} {str(after[key]):>15}")
+
+    engine.dispose()
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
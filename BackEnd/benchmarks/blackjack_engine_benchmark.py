@@ -0,0 +1,146 @@
+"""
+CPU benchmark: blackjack with Card objects vs int cards and lookup tables.
+
+"before" is the previous engine, reimplemented here because the engine no longer has it:
+a 312-object shoe built and random.shuffle'd on every start_game, and hand totals via
+Card.value() and an ace-adjusting loop. "after" is BlackjackEngine: a copied bytearray
+shoe dealt by partial Fisher-Yates, and totals from the CARD_POINTS table.
+Timed separately: start_game (shuffle + deal), hand evaluation, get_game_state, and a
+full hand played to the end. Also checks that both hand totals agree on every evaluated hand,
+and that to_bytes/from_bytes restores a game that then plays out identically.
+
+Usage (from BackEnd/, no database or Redis needed):
+    python -m benchmarks.blackjack_engine_benchmark --games 20000
+"""
+import argparse
+import pickle
+import random
+import time
+from app.services.game_engines.blackjack_engine import BlackjackEngine, RANKS, SUITS
+
+
+class _Card:
+    """Card as it was before the int encoding"""
+    def __init__(self, suit: str, rank: str):
+        self.suit = suit
+        self.rank = rank
+
+    def value(self) -> int:
+        if self.rank in ['J', 'Q', 'K']:
+            return 10
+        elif self.rank == 'A':
+            return 11
+        else:
+            return int(self.rank)
+
+    def __repr__(self):
+        return f"{self.rank}{self.suit}"
+
+
+class _ObjectEngine:
+    """The parts of the previous BlackjackEngine this benchmark times"""
+    def create_deck(self, num_decks: int = 6):
+        deck = []
+        for _ in range(num_decks):
+            for suit in SUITS:
+                for rank in RANKS:
+                    deck.append(_Card(suit, rank))
+        random.shuffle(deck)
+        return deck
+
+    def calculate_hand_value(self, hand) -> int:
+        value = sum(card.value() for card in hand)
+        num_aces = sum(1 for card in hand if card.rank == 'A')
+        while value > 21 and num_aces > 0:
+            value -= 10
+            num_aces -= 1
+        return value
+
+    def start_game(self):
+        self.deck = self.create_deck()
+        self.player_hand = [self.deck.pop(), self.deck.pop()]
+        self.dealer_hand = [self.deck.pop(), self.deck.pop()]
+        return self.get_game_state(hide_dealer_card=True)
+
+    def hit(self):
+        self.player_hand.append(self.deck.pop())
+
+    def stand(self):
+        while self.calculate_hand_value(self.dealer_hand) < 17:
+            self.dealer_hand.append(self.deck.pop())
+
+    def get_game_state(self, hide_dealer_card: bool = False) -> dict:
+        dealer = self.dealer_hand[:1] if hide_dealer_card else self.dealer_hand
+        return {
+            "player_hand": [str(card) for card in self.player_hand],
+            "player_value": self.calculate_hand_value(self.player_hand),
+            "dealer_hand": [str(card) for card in dealer],
+            "dealer_value": None if hide_dealer_card else self.calculate_hand_value(dealer),
+        }
+
+
+def _play(engine) -> None:
+    """Hit to 17, then stand"""
+    engine.start_game()
+    while engine.calculate_hand_value(engine.player_hand) < 17:
+        engine.hit()
+    if engine.calculate_hand_value(engine.player_hand) <= 21 and not getattr(engine, "game_over", False):
+        engine.stand()
+
+
+def _timed(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    n = args.games
+
+    before, after = _ObjectEngine(), BlackjackEngine()
+    rows = [("start_game", _timed(before.start_game, n), _timed(after.start_game, n))]
+
+    # Random 2-5 card hands, evaluated by both
+    ints = [bytes(random.choices(range(52), k=random.randint(2, 5))) for _ in range(n)]
+    objects = [[_Card(SUITS[c % 4], RANKS[c // 4]) for c in hand] for hand in ints]
+    start = time.perf_counter()
+    totals_before = [before.calculate_hand_value(hand) for hand in objects]
+    eval_before = time.perf_counter() - start
+    start = time.perf_counter()
+    totals_after = [after.calculate_hand_value(hand) for hand in ints]
+    eval_after = time.perf_counter() - start
+    rows.append(("hand value", eval_before, eval_after))
+
+    rows.append(("get_game_state", _timed(before.get_game_state, n), _timed(after.get_game_state, n)))
+    rows.append(("full hand", _timed(lambda: _play(before), n), _timed(lambda: _play(after), n)))
+
+    print(f"{'ops/sec':>16} {'before (Card)':>16} {'after (int)':>16} {'speedup':>8}")
+    for name, t_before, t_after in rows:
+        print(f"{name:>16} {n / t_before:>16,.0f} {n / t_after:>16,.0f} {t_before / t_after:>7.1f}x")
+
+    # State size for external storage: the old engine could only be pickled whole
+    before.start_game()
+    after.start_game()
+    state = after.to_bytes()
+    print(f"{'state bytes':>16} {len(pickle.dumps(before)):>16,} {len(state):>16,}")
+    print(f"identical hand totals: {totals_before == totals_after}")
+
+    restored = BlackjackEngine.from_bytes(state)
+    restored_matches = restored.get_game_state() == after.get_game_state()
+    for engine in (after, restored):
+        while not engine.game_over and engine.calculate_hand_value(engine.player_hand) < 17:
+            engine.hit()
+        if not engine.game_over:
+            engine.stand()
+    restored_matches &= restored.get_game_state() == after.get_game_state()
+    print(f"restored game plays out identically: {restored_matches}")
+
+
+if __name__ == "__main__":
+    main()
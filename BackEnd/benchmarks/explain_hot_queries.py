@@ -0,0 +1,141 @@
+"""
+EXPLAIN the hot queries and fail if any of them sequentially scans a large table.
+
+The statements come from the same builders the app uses (limit checks, bet wallets,
+jackpot cash wallet) plus the history, active-session, dashboard and leaderboard queries.
+A table counts as large once pg_class.reltuples reaches --min-rows, so small lookup
+tables (game, tenants, ...) may still be seq-scanned without failing the check.
+
+Usage (from BackEnd/, with the usual .env):
+    python -m benchmarks.explain_hot_queries --user-id 1 --tenant-id 1 --match-id 1
+    python -m benchmarks.explain_hot_queries --workload pg_stat_statements --top 25
+
+The pg_stat_statements mode EXPLAINs the captured top statements by total execution
+time (needs the extension and PostgreSQL 16+ for GENERIC_PLAN). Exit status is 1 when
+any plan has a sequential scan on a large table.
+"""
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func, desc, text
+from app.database import engine
+from app.models.game import GameSession, GameRound, Bet, Game
+from app.models.wallet import Wallet
+from app.models.team import FantasyTeam
+from app.models.fantasy import FantasyUserTeam
+from app.services.limit_service import LimitService
+from app.services.jackpot_service import JackpotService
+
+
+def hot_queries(user_id: int, tenant_id: int, match_id: int) -> dict:
+    today_start, month_start = LimitService._periods()
+    now = datetime.now(timezone.utc)
+    return {
+        "limit_check_daily": LimitService._wager_stmt(user_id, today_start),
+        "limit_check_monthly": LimitService._wager_stmt(user_id, month_start),
+        "bet_wallets": select(Wallet).where(Wallet.user_id == user_id, Wallet.tenant_id == tenant_id),
+        "jackpot_cash_wallet": JackpotService._cash_wallet_stmt(user_id, tenant_id),
+        "user_history": select(
+            GameSession.session_id, GameSession.started_at, GameSession.ended_at, Game.game_name,
+            func.sum(Bet.bet_amount), func.sum(Bet.payout_amount)
+        ).join(Game, Game.game_id == GameSession.game_id).join(GameRound).join(Bet).where(
+            GameSession.user_id == user_id,
+            Bet.tenant_id == tenant_id,
+            GameSession.ended_at.isnot(None)
+        ).group_by(GameSession.session_id, GameSession.started_at, GameSession.ended_at, Game.game_name)
+            .order_by(desc(GameSession.started_at), desc(GameSession.session_id)).limit(51),
+        "active_sessions": select(GameSession).join(GameRound).join(Bet).where(
+            GameSession.user_id == user_id,
+            Bet.tenant_id == tenant_id,
+            GameSession.ended_at.is_(None)
+        ).order_by(desc(GameSession.started_at)).distinct(),
+        "dashboard_active_users_24h": select(func.count(func.distinct(GameSession.user_id))).where(
+            GameSession.started_at >= now - timedelta(days=1)
+        ),
+        "leaderboard": select(FantasyTeam).where(FantasyTeam.match_id == match_id)
+            .order_by(desc(FantasyTeam.total_points)),
+        "fantasy_leaderboard": select(FantasyUserTeam).where(FantasyUserTeam.match_id == match_id)
+            .order_by(FantasyUserTeam.total_points.desc()),
+    }
+
+
+def captured_queries(conn, top: int) -> dict:
+    """Top statements by total time from pg_stat_statements (normalized, with $n placeholders)"""
+    rows = conn.execute(text("""
+        SELECT queryid, query FROM pg_stat_statements
+        WHERE query ILIKE 'select%' AND query NOT ILIKE '%pg_stat_statements%'
+        ORDER BY total_exec_time DESC
+        LIMIT :top
+    """), {"top": top}).all()
+    return {f"pgss_{row.queryid}": row.query for row in rows}
+
+
+def _table_sizes(conn) -> dict:
+    rows = conn.execute(text("SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p')")).all()
+    return {row.relname: row.reltuples for row in rows}
+
+
+def _seq_scans(plan: dict):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def explain(conn, stmt) -> dict:
+    if isinstance(stmt, str):
+        # Captured statements keep their $n placeholders
+        result = conn.exec_driver_sql(f"EXPLAIN (GENERIC_PLAN, FORMAT JSON) {stmt}")
+    else:
+        compiled = stmt.compile(dialect=engine.dialect)
+        result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled.string}", compiled.params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", choices=["builtin", "pg_stat_statements"], default="builtin")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--tenant-id", type=int, default=1)
+    parser.add_argument("--match-id", type=int, default=1)
+    parser.add_argument("--top", type=int, default=25, help="Captured statements to check (pg_stat_statements mode)")
+    parser.add_argument("--min-rows", type=float, default=10000, help="Tables at least this large must not be seq-scanned")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    failures = []
+    with engine.connect() as conn:
+        sizes = _table_sizes(conn)
+        if args.workload == "builtin":
+            queries = hot_queries(args.user_id, args.tenant_id, args.match_id)
+        else:
+            queries = captured_queries(conn, args.top)
+
+        for name, stmt in queries.items():
+            try:
+                plan = explain(conn, stmt)
+            except Exception as e:
+                conn.rollback()
+                print(f"SKIP {name}: {e}")
+                continue
+
+            large = sorted({t for t in _seq_scans(plan) if t and sizes.get(t, 0) >= args.min_rows})
+            status = "FAIL" if large else "ok"
+            print(f"{status:>4} {name}" + (f"  seq scan on {', '.join(large)}" if large else ""))
+            if args.verbose:
+                print(json.dumps(plan, indent=2))
+            if large:
+                failures.append(name)
+
+    engine.dispose()
+    if failures:
+        print(f"\n{len(failures)} hot quer{'y' if len(failures) == 1 else 'ies'} seq-scan a large table")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
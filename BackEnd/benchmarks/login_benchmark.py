@@ -0,0 +1,109 @@
+"""
+Load benchmark: login bursts next to game traffic, inline Argon2 vs the bounded hash pool.
+
+A burst of logins verifies a password while a stream of simulated game requests keeps running on the
+same event loop. "before" calls verify_password inline, as the async login handler did. "after" awaits
+verify_password_async (utils/security.py). Each game request is a short chain of awaits, the shape of
+a bet handler doing cache and DB round trips. Its latency stands in for gameplay on the same worker,
+and a 10 ms ticker measures event-loop lag. No database is needed: the hash is computed locally.
+
+Usage (from BackEnd/, with the usual .env):
+    python -m benchmarks.login_benchmark --logins 200 --concurrency 50 --game-rps 200
+"""
+import argparse
+import asyncio
+import time
+from app.config import settings
+from app.utils.security import get_password_hash, verify_password, verify_password_async, password_hash_stats
+
+PASSWORD = "correct horse battery staple"
+
+
+async def _inline_login(hashed: str):
+    return verify_password(PASSWORD, hashed)  # blocks the event loop
+
+
+async def _pooled_login(hashed: str):
+    return await verify_password_async(PASSWORD, hashed)
+
+
+async def _game_request(latencies: list):
+    start = time.perf_counter()
+    for _ in range(3):
+        await asyncio.sleep(0.001)  # stands in for a cache/DB round trip
+    latencies.append(time.perf_counter() - start)
+
+
+async def _game_traffic(stop: asyncio.Event, rps: int, latencies: list):
+    tasks = []
+    while not stop.is_set():
+        tasks.append(asyncio.create_task(_game_request(latencies)))
+        await asyncio.sleep(1 / rps)
+    await asyncio.gather(*tasks)
+
+
+async def _ticker(stop: asyncio.Event, lags: list, interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+def _pct(values: list, q: float):
+    values = sorted(values)
+    return round(values[min(int(len(values) * q), len(values) - 1)] * 1000, 2) if values else None
+
+
+async def _run(login_fn, hashed: str, logins: int, concurrency: int, game_rps: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    rejected = 0
+
+    async def one():
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await login_fn(hashed)
+            except Exception:
+                rejected += 1  # 503 from the bounded pool
+
+    stop, lags, game_latencies = asyncio.Event(), [], []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    traffic = asyncio.create_task(_game_traffic(stop, game_rps, game_latencies))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(ticker, traffic)
+
+    return {
+        "logins": logins,
+        "rejected": rejected,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round((logins - rejected) / elapsed, 1),
+        "game_p50_ms": _pct(game_latencies, 0.5),
+        "game_p99_ms": _pct(game_latencies, 0.99),
+        "loop_lag_p99_ms": _pct(lags, 0.99),
+        "loop_lag_max_ms": _pct(lags, 1.0),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--game-rps", type=int, default=200, help="Simulated game requests per second")
+    args = parser.parse_args()
+
+    hashed = get_password_hash(PASSWORD)
+    before = await _run(_inline_login, hashed, args.logins, args.concurrency, args.game_rps)
+    after = await _run(_pooled_login, hashed, args.logins, args.concurrency, args.game_rps)
+
+    print(f"hash pool: {settings.PASSWORD_HASH_WORKERS} workers, {settings.PASSWORD_HASH_MAX_PENDING} pending")
+    print(f"{'':>16} {'before (inline)':>16} {'after (pool)':>16}")
+    for key in before:
+        print(f"{key:>16} {str(before[key]):>16} {str(after[key]):>16}")
+    print(password_hash_stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
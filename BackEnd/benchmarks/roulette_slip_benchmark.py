@@ -0,0 +1,115 @@
+"""
+CPU benchmark: resolving a roulette slip with the old if/elif chain vs precomputed masks.
+
+The slip mixes every bet type. "before" settles each spin the way play_round used
+to: the previous check_bet (an if/elif chain with list membership tests,
+reimplemented here because the engine no longer has it), then the payout. "after"
+compiles the slip once with compile_slip. Then each spin is settled by
+resolve_slip, which does one bit test per bet. Both paths must produce the same
+results on every spin. The bare win tests are timed separately as well.
+
+Usage (from BackEnd/, no database or Redis needed):
+    python -m benchmarks.roulette_slip_benchmark --spins 20000 --bets 40
+"""
+import argparse
+import random
+import time
+from decimal import Decimal
+from app.services.game_engines.roulette_engine import RouletteEngine
+
+SAMPLE_BETS = [
+    ("straight", 17), ("split", [8, 11]), ("street", [13, 14, 15]), ("corner", [1, 2, 4, 5]),
+    ("line", [31, 32, 33, 34, 35, 36]), ("dozen2", None), ("column3", None), ("red", None),
+    ("black", None), ("even", None), ("odd", None), ("low", None), ("high", None),
+]
+
+
+def _chain_check(engine: RouletteEngine, bet_type: str, bet_value, n: int) -> bool:
+    """check_bet as it was before the lookup tables"""
+    if bet_type == "straight":
+        return int(bet_value) == n
+    elif bet_type == "red":
+        return n in engine.RED_NUMBERS
+    elif bet_type == "black":
+        return n in engine.BLACK_NUMBERS
+    elif bet_type == "even":
+        return n != 0 and n % 2 == 0
+    elif bet_type == "odd":
+        return n != 0 and n % 2 == 1
+    elif bet_type == "low":
+        return 1 <= n <= 18
+    elif bet_type == "high":
+        return 19 <= n <= 36
+    elif bet_type == "dozen1":
+        return 1 <= n <= 12
+    elif bet_type == "dozen2":
+        return 13 <= n <= 24
+    elif bet_type == "dozen3":
+        return 25 <= n <= 36
+    elif bet_type == "column1":
+        return n > 0 and (n - 1) % 3 == 0
+    elif bet_type == "column2":
+        return n > 0 and (n - 2) % 3 == 0
+    elif bet_type == "column3":
+        return n > 0 and n % 3 == 0
+    elif bet_type in ("split", "street", "corner", "line"):
+        return n in bet_value
+    return False
+
+
+def _chain_settle(engine: RouletteEngine, slip: list, n: int) -> dict:
+    """The settlement loop of the previous play_round"""
+    results = []
+    total_payout = Decimal("0")
+    for bet in slip:
+        bet_amount = Decimal(str(bet["bet_amount"]))
+        is_winner = _chain_check(engine, bet["bet_type"], bet["bet_value"], n)
+        payout = bet_amount * (engine.get_payout_multiplier(bet["bet_type"]) + 1) if is_winner else Decimal("0")
+        total_payout += payout
+        results.append({"bet_type": bet["bet_type"], "bet_value": bet["bet_value"],
+                        "bet_amount": bet_amount, "won": is_winner, "payout": payout})
+    return {"bet_results": results, "total_payout": total_payout}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spins", type=int, default=20000)
+    parser.add_argument("--bets", type=int, default=40, help="Bets per slip")
+    args = parser.parse_args()
+
+    engine = RouletteEngine()
+    slip = [
+        {"bet_type": t, "bet_value": v, "bet_amount": 1}
+        for t, v in (SAMPLE_BETS[i % len(SAMPLE_BETS)] for i in range(args.bets))
+    ]
+    spins = [random.randint(0, 36) for _ in range(args.spins)]
+
+    start = time.perf_counter()
+    before = [_chain_settle(engine, slip, n) for n in spins]
+    settle_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = engine.compile_slip(slip)
+    after = [engine.resolve_slip(slip, compiled, n) for n in spins]
+    settle_after = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for n in spins:
+        [_chain_check(engine, b["bet_type"], b["bet_value"], n) for b in slip]
+    test_before = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = [mask for _, mask, _ in compiled]
+    for n in spins:
+        [mask >> n & 1 for mask in masks]
+    test_after = time.perf_counter() - start
+
+    resolved = args.spins * args.bets
+    print(f"{'bets/sec':>16} {'before (chain)':>16} {'after (masks)':>16}")
+    print(f"{'settlement':>16} {resolved / settle_before:>16,.0f} {resolved / settle_after:>16,.0f}")
+    print(f"{'win test only':>16} {resolved / test_before:>16,.0f} {resolved / test_after:>16,.0f}")
+    print(f"identical results on all spins: {before == after}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+CPU benchmark: SlotsEngine scalar spins vs spin_batch.
+
+"before" plays every round the way play_round does: spin() draws nine symbols,
+then check_winning_lines scores the grid. "after" draws and scores all rounds
+at once with spin_batch. The benchmark then scores the first --verify batch grids
+with check_winning_lines and fails if any total differs. Both mean multipliers
+are printed next to the exact RTP from slots_math.
+
+Usage (from BackEnd/, no database or Redis needed):
+    python -m benchmarks.slots_batch_benchmark --rounds 200000 --batch 100000
+"""
+import argparse
+import sys
+import time
+from app.services.game_engines.slots_engine import SlotsEngine
+from app.services.game_engines.slots_math import exact_rtp
+
+
+def _scalar(engine: SlotsEngine, rounds: int) -> float:
+    total = 0.0
+    for _ in range(rounds):
+        total += sum(win["multiplier"] for win in engine.check_winning_lines(engine.spin()))
+    return total
+
+
+def _batched(engine: SlotsEngine, rounds: int, batch: int, seed: int) -> float:
+    total, done = 0.0, 0
+    while done < rounds:
+        size = min(batch, rounds - done)
+        total += float(engine.spin_batch(size, seed=seed + done)["multipliers"].sum())
+        done += size
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=100000, help="Rounds per spin_batch call")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--verify", type=int, default=10000, help="Batch grids re-scored with check_winning_lines")
+    args = parser.parse_args()
+
+    engine = SlotsEngine()
+
+    start = time.perf_counter()
+    scalar_total = _scalar(engine, args.rounds)
+    scalar_seconds = time.perf_counter() - start
+
+    engine.spin_batch(1, seed=0)  # build the payout tables outside the timing
+    start = time.perf_counter()
+    batch_total = _batched(engine, args.rounds, args.batch, args.seed)
+    batch_seconds = time.perf_counter() - start
+
+    sample = engine.spin_batch(args.verify, seed=args.seed)
+    mismatches = sum(
+        sum(win["multiplier"] for win in engine.check_winning_lines(engine.grid_symbols(grid))) != multiplier
+        for grid, multiplier in zip(sample["grids"], sample["multipliers"])
+    )
+
+    print(f"{'':>18} {'before (scalar)':>16} {'after (batch)':>16}")
+    print(f"{'rounds/sec':>18} {args.rounds / scalar_seconds:>16,.0f} {args.rounds / batch_seconds:>16,.0f}")
+    print(f"{'seconds':>18} {scalar_seconds:>16.3f} {batch_seconds:>16.3f}")
+    print(f"{'mean multiplier':>18} {scalar_total / args.rounds:>16.4f} {batch_total / args.rounds:>16.4f}")
+    print(f"speedup x{scalar_seconds / batch_seconds:.1f}, exact RTP {exact_rtp()['rtp']:.4f}, "
+          f"{mismatches} mismatches in {args.verify} re-scored grids")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
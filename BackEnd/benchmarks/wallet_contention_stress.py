@@ -0,0 +1,195 @@
+"""
+Concurrency stress check: many simultaneous bets for ONE player, then verify nothing was lost.
+
+Every bet goes through WalletService.process_game_bet_async on its own AsyncSession, so the
+wallet locks, the projection of pending credits, the debits and the jackpot contribution all
+race for real. With --seed-points the player's points wallet is topped up first, so bets debit
+points while every accepted bet leaves a pending points_earned credit on that same wallet (the
+projection/debit ordering that used to deadlock). Afterwards pending credits are projected and the
+check fails (exit 1) if
+
+  * any bet failed with a database error (a deadlock reaches the client as a 500, not a 409),
+  * --seed-points was given but no accepted bet debited the points wallet,
+
+  * any wallet balance differs from its balance before the run plus the ledger entries written
+    during the run (a lost or doubled update),
+  * any wallet went negative, or LedgerService.reconcile reports drift,
+  * a jackpot pool differs from its starting amount plus the contributions of the accepted bets
+    (net of wins, which pay out the pool and reset it to start_amount), counting the
+    contribution shards that have not been folded yet.
+
+It places real bets: run it against a test database, for a player without responsible-gaming
+limits, whose cash wallet covers only part of the bets so rejections are exercised too.
+
+Points are only spent once the bonus wallet no longer covers the 20% promo share, so use a
+player whose bonus is (nearly) used up.
+
+Usage (from BackEnd/, with the usual .env):
+    python -m benchmarks.wallet_contention_stress --user-id 1 --tenant-id 1 --bets 500 --concurrency 50 --amount 150
+    python -m benchmarks.wallet_contention_stress --user-id 1 --tenant-id 1 --seed-points 50000
+"""
+import argparse
+import asyncio
+import sys
+import time
+from decimal import Decimal
+from fastapi import HTTPException
+from sqlalchemy import select, func
+from sqlalchemy.exc import DBAPIError
+from app.database import SessionLocal, AsyncSessionLocal, engine, async_engine
+from app.models.jackpot import Jackpot, JackpotWin, JackpotContributionShard
+from app.models.wallet import Wallet, WalletLedger, WalletType, LedgerEntryType
+from app.services.ledger_service import LedgerService
+from app.services.wallet_service import WalletService
+
+
+def _snapshot(db, user_id: int, tenant_id: int) -> dict:
+    wallet_ids = [w for (w,) in db.execute(
+        select(Wallet.wallet_id).where(Wallet.user_id == user_id, Wallet.tenant_id == tenant_id)
+    )]
+    LedgerService.project(db, wallet_ids)
+    return {
+        "wallets": {w.wallet_id: w.balance for w in db.execute(
+            select(Wallet).where(Wallet.wallet_id.in_(wallet_ids)).execution_options(populate_existing=True)
+        ).scalars()},
+        "jackpots": {j.jackpot_id: j for j in db.execute(
+            select(Jackpot).where(Jackpot.tenant_id == tenant_id, Jackpot.is_active == True)
+            .execution_options(populate_existing=True)
+        ).scalars()},
+        # Live pool: folded amount plus unrounded shard contributions
+        "pools": dict(db.execute(
+            select(Jackpot.jackpot_id, Jackpot.current_amount + func.coalesce(func.sum(JackpotContributionShard.pending_amount), 0))
+            .outerjoin(JackpotContributionShard, JackpotContributionShard.jackpot_id == Jackpot.jackpot_id)
+            .where(Jackpot.tenant_id == tenant_id, Jackpot.is_active == True)
+            .group_by(Jackpot.jackpot_id, Jackpot.current_amount)
+        ).all()),
+        "max_ledger_id": db.execute(select(func.coalesce(func.max(WalletLedger.ledger_id), 0))).scalar(),
+        "max_win_id": db.execute(select(func.coalesce(func.max(JackpotWin.jackpot_win_id), 0))).scalar(),
+    }
+
+
+async def _bet(user_id: int, tenant_id: int, amount: Decimal, outcomes: list):
+    async with AsyncSessionLocal() as db:
+        try:
+            split = await WalletService.process_game_bet_async(db, user_id, tenant_id, amount)
+            outcomes.append(("accepted", split))
+        except HTTPException as e:
+            await db.rollback()
+            outcomes.append((f"rejected {e.status_code}", None))
+        except DBAPIError as e:
+            await db.rollback()
+            outcomes.append((f"error {getattr(e.orig, 'sqlstate', None) or type(e.orig).__name__}", None))
+
+
+def _seed_points(db, user_id: int, tenant_id: int, points: Decimal):
+    """Top up the points wallet through the ledger so bets can spend points"""
+    wallet_id = db.execute(select(Wallet.wallet_id).where(
+        Wallet.user_id == user_id, Wallet.tenant_id == tenant_id, Wallet.type_of_wallet == WalletType.points
+    )).scalar_one_or_none()
+    if wallet_id is None:
+        sys.exit(f"user {user_id} has no points wallet in tenant {tenant_id}")
+    LedgerService.credit(db, wallet_id, points, LedgerEntryType.points_earned)
+    LedgerService.project(db, [wallet_id])
+
+
+async def _run(args, outcomes: list) -> float:
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one():
+        async with semaphore:
+            await _bet(args.user_id, args.tenant_id, Decimal(str(args.amount)), outcomes)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.bets)))
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+    return elapsed
+
+
+def _verify(db, before: dict, outcomes: list) -> list:
+    after = _snapshot(db, *before["key"])
+    problems = []
+
+    for outcome, _ in outcomes:
+        if outcome.startswith("error"):
+            problems.append(f"bets failed with a database error: {outcome}")
+            break
+    if before["seeded_points"] and not any(split and split["deducted_points"] > 0 for _, split in outcomes):
+        problems.append("no accepted bet debited the points wallet (is the bonus wallet still covering the promo share?)")
+
+    written = dict(db.execute(
+        select(WalletLedger.wallet_id, func.sum(WalletLedger.amount))
+        .where(WalletLedger.ledger_id > before["max_ledger_id"], WalletLedger.wallet_id.in_(list(before["wallets"])))
+        .group_by(WalletLedger.wallet_id)
+    ).all())
+    for wallet_id, start_balance in before["wallets"].items():
+        expected = start_balance + written.get(wallet_id, Decimal("0"))
+        actual = after["wallets"][wallet_id]
+        if actual != expected:
+            problems.append(f"wallet {wallet_id}: balance {actual}, ledger says {expected}")
+        if actual < 0:
+            problems.append(f"wallet {wallet_id}: negative balance {actual}")
+
+    for drift in LedgerService.reconcile(db, list(before["wallets"])):
+        problems.append(f"wallet {drift['wallet_id']}: reconcile drift {drift['drift']}")
+
+    # Each accepted bet over 100 cash contributed to every active pool of the tenant
+    contributing = [split["deducted_cash"] for outcome, split in outcomes if split and split["deducted_cash"] > 100]
+    wins = db.execute(
+        select(JackpotWin.jackpot_id, func.count(), func.sum(JackpotWin.amount_won))
+        .where(JackpotWin.jackpot_win_id > before["max_win_id"])
+        .group_by(JackpotWin.jackpot_id)
+    ).all()
+    wins = {jackpot_id: (count, total) for jackpot_id, count, total in wins}
+    for jackpot_id, pool in before["jackpots"].items():
+        contributions = sum((amount * pool.contribution_percent for amount in contributing), Decimal("0"))
+        win_count, won = wins.get(jackpot_id, (0, Decimal("0")))
+        expected = before["pools"][jackpot_id] + contributions - won + win_count * pool.start_amount
+        actual = after["pools"][jackpot_id]
+        if abs(actual - expected) > Decimal("0.000001") * max(len(contributing), 1):
+            problems.append(f"jackpot {jackpot_id}: pool {actual}, expected {expected}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--tenant-id", type=int, required=True)
+    parser.add_argument("--bets", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--amount", type=float, default=150, help="Stake per bet (over 100 to exercise the jackpot)")
+    parser.add_argument("--seed-points", type=float, default=0,
+                        help="Credit this many points first so bets also debit the points wallet")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed_points:
+            _seed_points(db, args.user_id, args.tenant_id, Decimal(str(args.seed_points)))
+        before = _snapshot(db, args.user_id, args.tenant_id)
+        before["key"] = (args.user_id, args.tenant_id)
+        before["seeded_points"] = bool(args.seed_points)
+        db.commit()
+
+        outcomes = []
+        elapsed = asyncio.run(_run(args, outcomes))
+
+        counts = {}
+        for outcome, _ in outcomes:
+            counts[outcome] = counts.get(outcome, 0) + 1
+        print(f"{args.bets} bets in {elapsed:.2f}s ({args.bets / elapsed:.0f}/s): {counts}")
+
+        problems = _verify(db, before, outcomes)
+    finally:
+        db.close()
+        engine.dispose()
+
+    if problems:
+        print("\n".join(problems))
+        print(f"\n{len(problems)} lost or inconsistent update(s)")
+        sys.exit(1)
+    print("ok: wallet balances, ledger and jackpot pools agree")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Archiving a populated month of game_session, game_round and bet.
+
+Needs a PostgreSQL database with the casino schema, configured through the usual DB_* settings;
+the detach and archive run inside a transaction that is rolled back.
+
+    cd BackEnd && python -m pytest tests/test_partition_archive.py
+"""
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+if not os.getenv("DB_HOST"):
+    pytest.skip("needs a PostgreSQL database with the casino schema (DB_* settings)", allow_module_level=True)
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import engine
+from app.services.partition_service import PARTITIONED_TABLES, PartitionService, _months_before
+
+
+@pytest.fixture
+def db():
+    """Session inside a transaction that is rolled back after the test"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def test_archive_moves_a_populated_month(db):
+    # Two months back, archived with a one-month retention window
+    month = _months_before(datetime.now(timezone.utc).date().replace(day=1), 2)
+    started_at = datetime(month.year, month.month, 15, 12, tzinfo=timezone.utc)
+    for table in reversed(PARTITIONED_TABLES):
+        db.execute(text("SELECT ensure_monthly_partitions(:parent, 2, 0)"), {"parent": table})
+
+    session_id = db.execute(
+        text("INSERT INTO game_session (started_at) VALUES (:t) RETURNING session_id"), {"t": started_at}
+    ).scalar_one()
+    round_id = db.execute(
+        text("INSERT INTO game_round (session_id, round_number, started_at) VALUES (:s, 1, :t) RETURNING round_id"),
+        {"s": session_id, "t": started_at}
+    ).scalar_one()
+    db.execute(
+        text("INSERT INTO bet (round_id, bet_amount, payout_amount, started_at) VALUES (:r, 10, 0, :t)"),
+        {"r": round_id, "t": started_at}
+    )
+
+    archived = PartitionService.archive_old_partitions(db, retention_months=1)
+
+    suffix = month.strftime("%Y_%m")
+    schema = settings.PARTITION_ARCHIVE_SCHEMA
+    for table in PARTITIONED_TABLES:
+        name = f"{table}_{suffix}"
+        assert name in archived
+        assert name not in PartitionService.list_partitions(db, table)
+        assert db.execute(text(f'SELECT count(*) FROM "{schema}"."{name}"')).scalar_one() == 1
+    assert db.execute(
+        text("SELECT count(*) FROM bet WHERE round_id = :r AND started_at = :t"), {"r": round_id, "t": started_at}
+    ).scalar_one() == 0
@@ -0,0 +1,108 @@
+"""
+Query-count regression test for /stats/tenant-profile.
+
+The dashboard must issue the same number of statements however many players a tenant has
+(no per-player name lookups). Needs a PostgreSQL database with the casino schema, configured
+through the usual DB_* settings; everything it writes is rolled back.
+
+    cd BackEnd && python -m pytest tests/test_stats_query_count.py
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+if not os.getenv("DB_HOST"):
+    pytest.skip("needs a PostgreSQL database with the casino schema (DB_* settings)", allow_module_level=True)
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.database import engine
+from app.models.analytics import AnalyticsDaily, AnalyticsHourly, AnalyticsUserDaily
+from app.models.game import Game
+from app.models.tenant import Tenant
+from app.models.user import User, UserType
+from app.routers.stats import get_tenant_profile
+
+# KPIs, top players, game popularity, revenue for closed days, revenue for today
+TENANT_PROFILE_QUERIES = 5
+
+
+@pytest.fixture
+def db():
+    """Session inside a transaction that is rolled back after the test"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+def _seed_tenant(db: Session, game: Game, players: int) -> User:
+    """A tenant with its admin and `players` players, each with a week of rollup rows"""
+    now = datetime.now(timezone.utc)
+    today = now.date()
+    tenant = Tenant(tenant_name=f"query-count-{players}")
+    db.add(tenant)
+    db.flush()
+
+    admin = User(first_name="Admin", email=f"admin-{tenant.tenant_id}@example.com", password="x",
+                 role=UserType.admin, tenant_id=tenant.tenant_id, is_active=True)
+    users = [
+        User(first_name=f"Player {i}", email=f"player-{tenant.tenant_id}-{i}@example.com", password="x",
+             role=UserType.player, tenant_id=tenant.tenant_id, is_active=True)
+        for i in range(players)
+    ]
+    db.add_all([admin, *users])
+    db.flush()
+
+    for offset in range(1, 8):
+        day = today - timedelta(days=offset)
+        db.add(AnalyticsDaily(tenant_id=tenant.tenant_id, game_id=game.game_id, day=day,
+                              total_wagered=Decimal(100 * players), total_payout=Decimal(90 * players),
+                              bet_count=players, session_count=players))
+        db.add_all([
+            AnalyticsUserDaily(tenant_id=tenant.tenant_id, user_id=user.user_id, day=day,
+                               total_wagered=Decimal(100 + i), total_payout=Decimal(90))
+            for i, user in enumerate(users)
+        ])
+    db.add(AnalyticsHourly(tenant_id=tenant.tenant_id, game_id=game.game_id,
+                           bucket_start=now.replace(minute=0, second=0, microsecond=0),
+                           total_wagered=Decimal(10), total_payout=Decimal(5), bet_count=1, session_count=1))
+    db.flush()
+    return admin
+
+
+def _count_statements(db: Session, admin: User):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        profile = asyncio.run(get_tenant_profile(db=db, admin=admin))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return profile, statements
+
+
+@pytest.mark.parametrize("players", [1, 25, 200])
+def test_tenant_profile_query_count_is_flat(db, players):
+    game = Game(game_name="Query Count Slots", rtp_percent=Decimal("96.00"))
+    db.add(game)
+    db.flush()
+    admin = _seed_tenant(db, game, players)
+
+    profile, statements = _count_statements(db, admin)
+
+    assert len(statements) == TENANT_PROFILE_QUERIES, statements
+    assert len(profile["top_5_users_weekly"]) == min(players, 5)
+    assert all(user["name"] for user in profile["top_5_users_weekly"])
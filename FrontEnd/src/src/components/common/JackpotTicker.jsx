@@ -1,16 +1,47 @@
 import React, { useState, useEffect } from "react";
 import { jackpotAPI } from "../../api/jackpot";
 import { formatCurrency } from "../../utils/helpers";
+import { storage } from "../../utils/storage";
 import { useAuth } from "../../hooks/useAuth";
 
+const WS_URL = import.meta.env.VITE_WS_URL || "ws://localhost:8000";
+
 const JackpotTicker = () => {
   const [jackpots, setJackpots] = useState([]);
   const { currency } = useAuth();
 
   useEffect(() => {
+    // Initial amounts over HTTP, then live updates pushed by the server
     fetchJackpots();
-    const interval = setInterval(fetchJackpots, 60000); // Update every 1hr
-    return () => clearInterval(interval);
+
+    let ws;
+    let reconnectTimer;
+    let closed = false;
+
+    const connect = () => {
+      const token = storage.getToken();
+      if (!token) return;
+      ws = new WebSocket(`${WS_URL}/jackpot/ws?token=${encodeURIComponent(token)}`);
+
+      ws.onmessage = (event) => {
+        const data = JSON.parse(event.data);
+        if (data.type === "jackpot_update") {
+          setJackpots(data.jackpots);
+        }
+      };
+
+      ws.onclose = () => {
+        // Reconnect after 3 seconds unless the ticker was unmounted
+        if (!closed) reconnectTimer = setTimeout(connect, 3000);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(reconnectTimer);
+      if (ws) ws.close();
+    };
   }, []);
 
   const fetchJackpots = async () => {